@@ -0,0 +1,148 @@
+# cli.py - запуск транслятора из командной строки:
+#   python -m backend.src.cli program.py [-o program.js] [--analysis fused] [--optimize] [--minify] [--source-map] [--dump-analysis]
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+from .lexer.lexer import Lexer
+from .parser.parser import Parser
+from .semantic.purity import PurityAnalyzer
+from .semantic.call_graph import CallGraph
+from .transpiler import Transpiler, ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from .codegen.runtime import RUNTIME_MODULE, write_runtime_module
+from .exceptions import TranspilerError
+
+
+def format_analysis(program) -> str:
+    """Текстовый отчёт анализов программы (для --dump-analysis)"""
+    PurityAnalyzer().analyze(program)
+    graph = CallGraph.of(program)
+    lines = ["== purity =="]
+    for node in graph.functions:
+        line = f"{node.name} (line {node.line}): {node.purity.value}"
+        if node.purity_reasons:
+            line += " -- " + "; ".join(node.purity_reasons)
+        lines.append(line)
+
+    lines.append("")
+    lines.append("== call graph ==")
+    for node in [None] + graph.functions:
+        name = CallGraph.MODULE if node is None else node.name
+        callees = ", ".join(c.name for c in graph.callees(node)) or "-"
+        flags = []
+        if node is not None and graph.is_recursive(node):
+            flags.append("recursive")
+        if node is not None and graph.is_leaf(node):
+            flags.append("leaf")
+        lines.append(f"{name} -> {callees}" + (f" [{', '.join(flags)}]" if flags else ""))
+    cycles = [scc for scc in graph.sccs if len(scc) > 1]
+    for scc in cycles:
+        lines.append("cycle: " + " <-> ".join(f.name for f in scc))
+    return "\n".join(lines) + "\n"
+
+
+def format_optimizations(transpiler: Transpiler) -> str:
+    """Что сделали оптимизации последней транспиляции (для --dump-analysis)"""
+    lines = ["== optimizations =="]
+    if transpiler.optimize:
+        line = f"inlined call sites: {transpiler.inlined_calls}"
+        if transpiler.inlined_functions:
+            line += f" ({', '.join(transpiler.inlined_functions)})"
+        lines.append(line)
+        lines.append(f"hoisted loop invariants: {transpiler.hoisted_invariants} "
+                     f"({transpiler.guarded_loops} guarded loops)")
+    if transpiler.typed_arrays:
+        lines.append(f"typed arrays: {transpiler.typed_array_literals}")
+        for name, reason in transpiler.plain_arrays.items():
+            lines.append(f"plain array '{name}': {reason}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Python -> JavaScript transpiler")
+    arg_parser.add_argument("source", help="Python source file")
+    arg_parser.add_argument("-o", "--output", help="write JavaScript to this file")
+    arg_parser.add_argument("--analysis", choices=[ANALYSIS_SEPARATE, ANALYSIS_FUSED],
+                            help="run semantic analysis and report errors")
+    arg_parser.add_argument("--optimize", action="store_true",
+                            help="fold constants, drop dead code and unused functions, "
+                                 "turn self tail calls into loops, inline small functions, "
+                                 "hoist loop invariants, emit const and drop dead stores")
+    arg_parser.add_argument("--minify", action="store_true",
+                            help="emit compact JavaScript with short local names")
+    arg_parser.add_argument("--memoize", action="store_true",
+                            help="cache results of pure recursive functions "
+                                 "(single functions: '# pyjs: memoize' comment)")
+    arg_parser.add_argument("--memoize-size", type=int, metavar="N",
+                            help="keep at most N cached results per function (LRU)")
+    arg_parser.add_argument("--typed-arrays", action="store_true",
+                            help="emit Float64Array/Int32Array for numeric list literals "
+                                 "that are only iterated or measured (others stay plain arrays)")
+    arg_parser.add_argument("--runtime-module", action="store_true",
+                            help=f"import runtime helpers from a shared ES module {RUNTIME_MODULE}, "
+                                 "written next to --output once (unchanged file is not rewritten)")
+    arg_parser.add_argument("--source-map", action="store_true",
+                            help="write a Source Map v3 next to --output (OUTPUT.map)")
+    arg_parser.add_argument("--dump-call-graph", choices=["dot", "json"],
+                            help="print the call graph in DOT or JSON format")
+    arg_parser.add_argument("--dump-analysis", action="store_true",
+                            help="print analysis results instead of JavaScript "
+                                 "(JavaScript still goes to --output)")
+    args = arg_parser.parse_args(argv)
+    if args.source_map and not args.output:
+        arg_parser.error("--source-map requires --output")
+    if args.runtime_module and not args.output:
+        arg_parser.error("--runtime-module requires --output")
+    if args.source_map and args.minify:
+        arg_parser.error("--source-map cannot be combined with --minify")
+    if args.memoize_size is not None and args.memoize_size < 1:
+        arg_parser.error("--memoize-size must be positive")
+
+    with open(args.source, encoding="utf-8") as source_file:
+        source = source_file.read()
+
+    # Отладочный вывод конвейера не должен смешиваться с результатом
+    debug = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(debug):
+            transpiler = Transpiler(analysis=args.analysis, optimize=args.optimize,
+                                    source_map=args.source_map, minify=args.minify,
+                                    memoize=args.memoize, memoize_size=args.memoize_size,
+                                    typed_arrays=args.typed_arrays,
+                                    runtime_module=f"./{RUNTIME_MODULE}" if args.runtime_module else None)
+            if args.output:
+                # Код пишется в файл потоково, без сборки одной строкой
+                result = transpiler.transpile_file(args.source, args.output)
+            else:
+                result = transpiler.compile(source)
+            report = None
+            if args.dump_analysis or args.dump_call_graph:
+                program = Parser(Lexer(source)).parse()
+                report = format_analysis(program) if args.dump_analysis else ""
+                if args.dump_analysis and (args.optimize or args.typed_arrays):
+                    report += "\n" + format_optimizations(transpiler)
+                if args.dump_call_graph == "dot":
+                    report += CallGraph.of(program).to_dot() + "\n"
+                elif args.dump_call_graph == "json":
+                    report += CallGraph.of(program).to_json() + "\n"
+    except TranspilerError as error:
+        print(error, file=sys.stderr)
+        return 1
+
+    if args.runtime_module:
+        write_runtime_module(os.path.dirname(os.path.abspath(args.output)), minify=args.minify)
+
+    for error in result.errors:
+        print(error, file=sys.stderr)
+
+    if report is not None:
+        sys.stdout.write(report)
+    elif not args.output:
+        print(result.code)
+    return 1 if result.errors else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
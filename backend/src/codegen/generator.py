@@ -1,43 +1,96 @@
-from typing import List
+import io
+import math
+from typing import List, TextIO
 from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk
+from backend.src.semantic.analyzer import SemanticAnalyzer
+from backend.src.semantic.symbol_table import FlatSymbolTable
+from backend.src.semantic.purity import BUILTIN_PURITY
+from backend.src.codegen.writer import CodeWriter
+from backend.src.codegen.source_map import SourceMapBuilder, MARK
+from backend.src.codegen.minify import LocalRenamer
+from backend.src.codegen.runtime import emit_helpers, helper_for_builtin, import_statement
+from backend.src.optimizer.dead_code import terminates
 
 
 class CodeGenerator:
-    def __init__(self):
-        self.output = []
+    def __init__(self, fused_analysis: bool = False, optimize: bool = False,
+                 source_map: bool = False, minify: bool = False, runtime_module: str = None):
+        # fused_analysis: семантический анализ выполняется в том же обходе, что и
+        # генерация; ошибки собираются в self.errors
+        # optimize: учитывать разметку LivenessAnalyzer (const, мёртвые присваивания)
+        # source_map: строить Source Map v3 (self.source_map после генерации)
+        # minify: компактный вывод с короткими именами локальных переменных
+        # runtime_module: импортировать хелперы рантайма из этого ES-модуля
+        # (например "./pyjs_runtime.js", см. codegen.runtime), а не выводить в файл
+        if source_map and minify:
+            raise ValueError("source_map and minify cannot be combined")
+        self.fused_analysis = fused_analysis
+        self.optimize = optimize
+        self.emit_source_map = source_map
+        self.minify = minify
+        self.runtime_module = runtime_module
+        self.source_map = None
+        self._statement = None  # оператор, строки которого сейчас выводятся
+        self._marked = []       # вызовы, отмеченные маркерами в ещё не выведенных строках
+        self._call_starts = []  # фрагменты начала вызовов, ждущие маркера
+        self._operand_types = []  # типы левых операндов (в режиме fused)
+        self._user_functions = set()  # имена функций модуля (перекрывают встроенные)
+        self._tail_function = None  # функция, тело которой генерируется, если в ней есть хвостовые вызовы
+        self.analyzer = None
+        self.errors = []
+        self._expr_type = DataType.ANY  # тип последнего выражения (в режиме fused)
+        self.writer = None  # CodeWriter текущей генерации
         self.indent_level = 0
-        self.declared_variables = set()  # Отслеживаем объявленные переменные
+        self.declared_variables = set()  # Переменные, объявленные в текущей области
+        self._declared_scopes = [self.declared_variables]
         self.should_call_main = False
 
 
     def generate(self, node: Node) -> str:
         """Генерирует JavaScript код из AST"""
+        output = io.StringIO()
+        self.generate_to(node, output)
+        return output.getvalue()
+
+    def generate_to(self, node: Node, stream: TextIO):
+        """Генерирует JavaScript код из AST прямо в поток (текстовый или бинарный)"""
         print(f"DEBUG GENERATOR: Starting code generation for {type(node).__name__}")
         if hasattr(node, 'statements'):
             print(f"DEBUG GENERATOR: Number of statements: {len(node.statements)}")
             for i, stmt in enumerate(node.statements):
                 print(f"DEBUG GENERATOR: Statement {i}: {type(stmt).__name__}")
 
-        self.output = []
+        self.writer = CodeWriter(stream, minify=self.minify)
+        if self.minify:
+            # Короткие имена выбираются по разрешённым именам до генерации
+            LocalRenamer().analyze(node)
+        self.source_map = SourceMapBuilder(source_content=getattr(node, 'source', None)) \
+            if self.emit_source_map else None
+        self._statement = None
+        self._marked = []
+        self._call_starts = []
+        self._operand_types = []
+        self._tail_function = None
         self.indent_level = 0
         self.declared_variables = set()
+        self._declared_scopes = [self.declared_variables]
+        self.analyzer = SemanticAnalyzer(FlatSymbolTable) if self.fused_analysis else None
+        self.errors = self.analyzer.errors if self.analyzer is not None else []
 
         # Добавляем строгий режим
         self.add_line('"use strict";')
         self.add_line()
 
-        # Вспомогательные функции рантайма для Python-подмножества (range, str, ...)
-        needs_range, needs_str = self._scan_runtime_needs(node)
-        if needs_range:
-            self._emit_range_helper()
-            self.add_line()
-        if needs_str:
-            self.add_line('function str(value) {')
-            self.indent()
-            self.add_line('return String(value);')
-            self.dedent()
-            self.add_line('}')
+        # Вспомогательные функции рантайма для Python-подмножества (range, str, ...):
+        # свои копии в файле или импорт из общего модуля
+        self._user_functions = {n.name for n in walk(node) if isinstance(n, FunctionDeclaration)}
+        helpers = self._scan_runtime_needs(node)
+        if helpers and self.runtime_module is not None:
+            self.add_line(import_statement(helpers, self.runtime_module))
             self.add_line()
+        else:
+            emit_helpers(helpers, self._add_line_at)
 
         # Обрабатываем программу
         self.visit_program(node)
@@ -47,70 +100,28 @@ class CodeGenerator:
             self.add_line()
             self.add_line("main();")
 
+        self.writer.close()
 
-        return '\n'.join(self.output)
+    def _scan_runtime_needs(self, node: Node) -> set:
+        """Проходит по AST и возвращает имена нужных рантайм-хелперов."""
+        helpers = set()
+        counted = set()  # range(...) в циклах, которые станут счётными
 
-    def _scan_runtime_needs(self, node: Node):
-        """Проходит по AST и определяет, нужны ли рантайм-хелперы."""
-        needs_range = False
-        needs_str = False
-
-        def walk(n: Node):
-            nonlocal needs_range, needs_str
-            if n is None:
-                return
+        for n in walk(node):
+            if isinstance(n, ForLoop) and self._counted_range(n) is not None:
+                counted.add(id(n.iterable))
+            if isinstance(n, FunctionDeclaration) and n.memoize is not None:
+                helpers.add('memoize')
             # FunctionCall name хранится как Identifier
-            if isinstance(n, FunctionCall):
-                name = self.visit(n.name)
-                if name == 'range':
-                    needs_range = True
-                elif name == 'str':
-                    needs_str = True
-            # Рекурсивно обходим все поля узла
-            for v in getattr(n, '__dict__', {}).values():
-                if isinstance(v, list):
-                    for item in v:
-                        if isinstance(item, Node):
-                            walk(item)
-                elif isinstance(v, Node):
-                    walk(v)
-
-        walk(node)
-        return needs_range, needs_str
-
-    def _emit_range_helper(self):
-        """Эмуляция Python range(...) в JS как массива чисел."""
-        self.add_line('function range() {')
-        self.indent()
-        self.add_line('const args = Array.from(arguments);')
-        self.add_line('let start = 0, stop = 0, step = 1;')
-        self.add_line('if (args.length === 1) {')
-        self.indent()
-        self.add_line('stop = args[0];')
-        self.dedent()
-        self.add_line('} else if (args.length === 2) {')
-        self.indent()
-        self.add_line('start = args[0]; stop = args[1];')
-        self.dedent()
-        self.add_line('} else if (args.length >= 3) {')
-        self.indent()
-        self.add_line('start = args[0]; stop = args[1]; step = args[2];')
-        self.dedent()
-        self.add_line('}')
-        self.add_line('if (step === 0) { throw new Error("range() step argument must not be zero"); }')
-        self.add_line('const out = [];')
-        self.add_line('if (step > 0) {')
-        self.indent()
-        self.add_line('for (let i = start; i < stop; i += step) out.push(i);')
-        self.dedent()
-        self.add_line('} else {')
-        self.indent()
-        self.add_line('for (let i = start; i > stop; i += step) out.push(i);')
-        self.dedent()
-        self.add_line('}')
-        self.add_line('return out;')
-        self.dedent()
-        self.add_line('}')
+            if isinstance(n, FunctionCall) and isinstance(n.name, Identifier):
+                name = n.name.name
+                if name in self._user_functions:
+                    continue
+                helper = helper_for_builtin(name)
+                if helper is not None and (name != 'range' or id(n) not in counted):
+                    helpers.add(helper.name)
+
+        return helpers
 
     def indent(self):
         self.indent_level += 1
@@ -118,22 +129,57 @@ class CodeGenerator:
     def dedent(self):
         self.indent_level -= 1
 
+    def _add_line_at(self, line: str, level: int):
+        """Строка с заданным отступом (код хелперов рантайма)"""
+        indent_level, self.indent_level = self.indent_level, level
+        self.add_line(line)
+        self.indent_level = indent_level
+
     def add_line(self, line: str = ""):
-        indent = '    ' * self.indent_level
-        self.output.append(indent + line)
-
-    # ---- НОВЫЕ/ИСПРАВЛЕННЫЕ ВСПОМОГАТЕЛЬНЫЕ МЕТОДЫ ----
-    def _strip_parentheses_if_simple(self, expr: str) -> str:
-        """Удаляет внешние скобки, если выражение простое"""
-        if expr.startswith('(') and expr.endswith(')'):
-            inner = expr[1:-1]
-            if all(op not in inner for op in ['&&','||','+','-','*','/','>','<','=','!']):
-                return inner
-        return expr
+        if self.source_map is not None:
+            # Строка сопоставляется выводящему её оператору, вызовы внутри
+            # неё -- по маркерам перед их кодом. Отмечаются только вызовы: это
+            # кадры стека и места исключений, а строку оператора Python-трассировка
+            # и так указывает
+            line = self.source_map.map_line(self.indent_level * len(CodeWriter.INDENT),
+                                            self._statement, line, self._marked)
+            self._marked.clear()
+        self.writer.write_line(line, self.indent_level)
+
+    def _name(self, node: Identifier) -> str:
+        """Имя переменной в JS (короткое в режиме minify)"""
+        if self.minify and node.js_name is not None:
+            return node.js_name
+        return node.name
+
+    # ---- ОБЛАСТИ ВИДИМОСТИ (если AST не размечен анализатором) ----
+    def _enter_scope(self, names=()):
+        self.declared_variables = set(names)
+        self._declared_scopes.append(self.declared_variables)
+
+    def _exit_scope(self):
+        self._declared_scopes.pop()
+        self.declared_variables = self._declared_scopes[-1]
+
+    def _is_declared(self, name: str) -> bool:
+        return any(name in scope for scope in reversed(self._declared_scopes))
+
+    def _is_definition(self, target: Identifier) -> bool:
+        """Нужно ли объявлять переменную (let) при присваивании"""
+        binding = target.binding
+        if binding is not None:
+            # Разметка SemanticAnalyzer: решение принято при разрешении имён
+            return binding.is_definition
+        if self._is_declared(target.name):
+            return False
+        self.declared_variables.add(target.name)
+        return True
 
     # ---- ПОСЕЩЕНИЕ УЗЛОВ ----
     def visit_program(self, node: Program):
+        self._declare_temporaries(node)
         for stmt in node.statements:
+            self._statement = stmt
             self.visit(stmt)
 
     def visit(self, node):
@@ -158,19 +204,28 @@ class CodeGenerator:
 
     # ---- ПРИСВАИВАНИЕ ----
     def visit_assignment(self, node: Assignment):
-        target_name = self.visit(node.target)
+        target_name = self._name(node.target)
         value = self.visit(node.value)
-        if value.startswith('(') and value.endswith(')'):
-            inner = value[1:-1]
-            if '&&' not in inner and '||' not in inner:
-                value = inner
-        if target_name not in self.declared_variables:
-            self.declared_variables.add(target_name)
-            self.add_line(f"let {target_name} = {value};")
+        if self.analyzer is not None:
+            self.analyzer.check_assignment(node, self._expr_type)
+        if self.optimize and node.dead_store:
+            return
+        if self._is_definition(node.target):
+            keyword = "const" if self.optimize and node.single_assignment else "let"
+            self.add_line(f"{keyword} {target_name} = {value};")
         else:
             self.add_line(f"{target_name} = {value};")
 
-    # ---- БИНАРНЫЕ ОПЕРАЦИИ ----
+    # ---- ВЫРАЖЕНИЯ ----
+    # Код выражения собирается списком фрагментов и склеивается один раз для
+    # оператора: строки подвыражений не копируются заново на каждом уровне
+    # дерева, поэтому цепочка a + b + ... + z из n слагаемых строится за O(n),
+    # а не за O(n^2). Обход -- явным стеком, без рекурсии; скобки выбираются
+    # по дереву (приоритеты операторов), а не по уже построенной строке.
+    OPERATOR_MAP = {'and': '&&', 'or': '||', 'is': '===', 'is not': '!=='}
+    UNARY_OPERATOR_MAP = {'not': '!', '+': '+', '-': '-'}
+    COMPARISONS = ('==', '!=', '>', '<', '>=', '<=')
+
     def _get_operator_precedence(self, operator):
         precedence = {
             '**': 4,
@@ -181,41 +236,158 @@ class CodeGenerator:
         }
         return precedence.get(operator, 0)
 
+    def _expression(self, node: Node) -> str:
+        """Код выражения одной строкой"""
+        fragments: List[str] = []
+        self._emit_expression(node, fragments)
+        return ''.join(fragments)
+
+    def _emit_expression(self, root: Node, out: List[str]):
+        """Дописывает фрагменты кода выражения в out. В стеке -- узлы,
+        готовые фрагменты и действия (метод, узел), которые выполняются после
+        кода операндов: проверки типов режима fused и маркеры карты исходников
+        идут в том же порядке, что при рекурсивном обходе"""
+        expanders = {BinaryOperation: self._binary_parts, UnaryOperation: self._unary_parts,
+                     FunctionCall: self._call_parts, InlineExpansion: self._expansion_parts}
+        stack = [root]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, str):
+                out.append(item)
+            elif isinstance(item, tuple):
+                action, node = item
+                action(node, out)
+            elif type(item) in expanders:
+                stack.extend(reversed(expanders[type(item)](item)))
+            else:
+                out.append(self.visit(item))  # лист: имя, литерал, временная переменная
+
+    def _binary_parts(self, node: BinaryOperation) -> list:
+        operator = self.OPERATOR_MAP.get(node.operator, node.operator)
+        if operator in ('&&', '||'):
+            left_needs_paren = isinstance(node.left, BinaryOperation) and node.left.operator in self.COMPARISONS
+            right_needs_paren = isinstance(node.right, BinaryOperation) and node.right.operator in self.COMPARISONS
+        else:
+            current_prec = self._get_operator_precedence(operator)
+            left_needs_paren = isinstance(node.left, BinaryOperation) and self._get_operator_precedence(node.left.operator) < current_prec
+            right_needs_paren = isinstance(node.right, BinaryOperation) and self._get_operator_precedence(node.right.operator) <= current_prec
+            if operator == '**' and isinstance(node.right, BinaryOperation):
+                right_needs_paren = self._get_operator_precedence(node.right.operator) < current_prec
+            if operator == '**' and (isinstance(node.left, UnaryOperation) or self._is_negative_number(node.left)):
+                # В JS унарный минус слева от ** -- синтаксическая ошибка: (-2) ** 2
+                left_needs_paren = True
+        parts = self._wrap(node.left, left_needs_paren)
+        if self.analyzer is not None:
+            parts.append((self._save_operand_type, node))
+        parts.append(f" {operator} ")
+        parts.extend(self._wrap(node.right, right_needs_paren))
+        if self.analyzer is not None:
+            parts.append((self._check_binary_operation, node))
+        return parts
+
+    @staticmethod
+    def _wrap(node: Node, parenthesized: bool) -> list:
+        return ["(", node, ")"] if parenthesized else [node]
+
+    @staticmethod
+    def _is_negative_number(node: Node) -> bool:
+        """Свёрнутая константа вроде -5 или -0.0: её код начинается с минуса"""
+        return (isinstance(node, Literal) and type(node.value) in (int, float)
+                and math.copysign(1, node.value) < 0)
+
+    def _save_operand_type(self, node: BinaryOperation, out: List[str]):
+        self._operand_types.append(self._expr_type)
+
+    def _check_binary_operation(self, node: BinaryOperation, out: List[str]):
+        left_type = self._operand_types.pop()
+        self._expr_type = self.analyzer.check_binary_operation(node, left_type, self._expr_type)
+
+    def _unary_parts(self, node: UnaryOperation) -> list:
+        operator = self.UNARY_OPERATOR_MAP.get(node.operator, node.operator)
+        operand = node.operand
+        # !(a > b), -(a + b); -(-x) и +(-5), а не декремент --x / ++x
+        signed = (isinstance(operand, UnaryOperation) and operand.operator in ('-', '+')
+                  or self._is_negative_number(operand))
+        parts = [operator] + self._wrap(operand, isinstance(operand, BinaryOperation)
+                                        or operator != '!' and signed)
+        parts.append((self._any_type, node))
+        return parts
+
+    def _any_type(self, node: Node, out: List[str]):
+        self._expr_type = DataType.ANY
+
+    def _call_parts(self, node: FunctionCall) -> list:
+        # Имя вызываемой функции не разрешаем (см. SemanticAnalyzer.visit_functioncall)
+        parts = [(self._start_call, node)]
+        for i, argument in enumerate(node.arguments):
+            if i:
+                parts.append(", ")
+            parts.append(argument)
+        parts.append(")")
+        parts.append((self._end_call, node))
+        return parts
+
+    def _start_call(self, node: FunctionCall, out: List[str]):
+        name = node.name.name
+        # Встроенная функция print
+        out.append("console.log(" if name == "print" else f"{name}(")
+        if self.source_map is not None:
+            self._call_starts.append(len(out) - 1)
+
+    def _end_call(self, node: FunctionCall, out: List[str]):
+        self._expr_type = DataType.ANY
+        if self.source_map is not None:
+            # Позицию вызова в строке найдёт карта исходников (см. add_line);
+            # номер известен только после вызовов в аргументах
+            self._marked.append(node)
+            start = self._call_starts.pop()
+            out[start] = MARK + chr(len(self._marked)) + out[start]
+
+    def _expansion_parts(self, node: InlineExpansion) -> list:
+        """(a$1 = аргумент, ..., тело) -- аргументы вычисляются по порядку;
+        скобки нужны всегда: без них запятая разделила бы объявления"""
+        parts = ["("]
+        for temporary, argument in zip(node.temporaries, node.arguments):
+            parts.extend((f"{temporary.name} = ", argument, ", "))
+        parts.extend((node.value, ")"))
+        return parts
+
     def visit_binaryoperation(self, node: BinaryOperation):
-        left = self.visit(node.left)
-        right = self.visit(node.right)
-        operator_map = {'and': '&&', 'or': '||', 'is': '===', 'is not': '!=='}
-        operator = operator_map.get(node.operator, node.operator)
-
-        if operator in ['&&', '||']:
-            left_is_cmp = isinstance(node.left, BinaryOperation) and node.left.operator in ['==','!=','>','<','>=','<=']
-            right_is_cmp = isinstance(node.right, BinaryOperation) and node.right.operator in ['==','!=','>','<','>=','<=']
-            left_str = f"({left})" if left_is_cmp else left
-            right_str = f"({right})" if right_is_cmp else right
-            return f"{left_str} {operator} {right_str}"
-
-        current_prec = self._get_operator_precedence(operator)
-        left_needs_paren = isinstance(node.left, BinaryOperation) and self._get_operator_precedence(node.left.operator) < current_prec
-        right_needs_paren = isinstance(node.right, BinaryOperation) and self._get_operator_precedence(node.right.operator) <= current_prec
-        if operator == '**' and isinstance(node.right, BinaryOperation):
-            right_needs_paren = self._get_operator_precedence(node.right.operator) < current_prec
-        left_str = f"({left})" if left_needs_paren else left
-        right_str = f"({right})" if right_needs_paren else right
-        return f"{left_str} {operator} {right_str}"
-
-    # ---- УНАРНЫЕ ОПЕРАЦИИ ----
+        return self._expression(node)
+
     def visit_unaryoperation(self, node: UnaryOperation):
-        operand = self.visit(node.operand)
-        op_map = {'not': '!', '+': '+', '-': '-'}
-        operator = op_map.get(node.operator, node.operator)
-        if operator == '-' and isinstance(node.operand, (BinaryOperation, UnaryOperation)):
-            return f"{operator}({operand})"
-        return f"{operator}{operand}"
+        return self._expression(node)
+
+    def visit_functioncall(self, node: FunctionCall):
+        return self._expression(node)
+
+    def visit_inlineexpansion(self, node: InlineExpansion):
+        return self._expression(node)
 
     def visit_identifier(self, node: Identifier):
+        if self.analyzer is not None:
+            self._expr_type = self.analyzer.resolve_identifier(node)
+        return self._name(node)
+
+    def visit_temporary(self, node: Temporary):
+        self._expr_type = DataType.ANY
         return node.name
 
+    def visit_temporarydeclaration(self, node: TemporaryDeclaration):
+        value = self.visit(node.value)
+        self.add_line(f"const {node.temporary.name} = {value};")
+
+    def _declare_temporaries(self, root: Node):
+        """let для временных переменных подстановок в теле функции или модуля"""
+        names = {}
+        for n in walk(root, prune=lambda n: isinstance(n, FunctionDeclaration)):
+            if isinstance(n, InlineExpansion):
+                names.update(dict.fromkeys(t.name for t in n.temporaries))
+        if names:
+            self.add_line(f"let {', '.join(names)};")
+
     def visit_literal(self, node: Literal):
+        self._expr_type = node.literal_type
         if node.value is None: return "null"
         elif node.value is True: return "true"
         elif node.value is False: return "false"
@@ -232,6 +404,11 @@ class CodeGenerator:
             return '"' + raw.replace('"', '\\"') + '"'
 
         elif isinstance(node.value, list):
+            if node.typed_array is not None:
+                # Только числа (TypedArrayMarker): константы или свёрнутые -5
+                elems = [self.visit(e) if isinstance(e, Node) else str(e) for e in node.value]
+                self._expr_type = node.literal_type
+                return f"new {node.typed_array}([{', '.join(elems)}])"
             elems = [self.visit_literal(Literal(e, DataType.ANY, node.line, node.column)) if isinstance(e, (int,float,str,bool)) or e is None else str(e) for e in node.value]
             return f"[{', '.join(elems)}]"
         else:
@@ -263,75 +440,239 @@ class CodeGenerator:
 
     # ---- ФУНКЦИИ ----
     def visit_functiondeclaration(self, node: FunctionDeclaration):
-        params = ', '.join([p.name for p in node.parameters])
+        analyzer = self.analyzer
+        analyze_body = analyzer is not None and analyzer.enter_function(node)
+        if analyzer is not None and not analyze_body:
+            # Повторное объявление: отдельный проход тоже не анализирует тело
+            self.analyzer = None
+        params = ', '.join([self._name(p) for p in node.parameters])
         self.add_line(f"function {node.name}({params}) {{")
         self.indent()
-        for p in node.parameters: self.declared_variables.add(p.name)
-        self.visit(node.body)
+        self._enter_scope(p.name for p in node.parameters)
+        self._declare_temporaries(node.body)
+        tail_function, self._tail_function = self._tail_function, node
+        if node.tail_recursive:
+            self._emit_tail_loop(node)
+        else:
+            self.visit(node.body)
+        self._tail_function = tail_function
+        self._exit_scope()
+        self.analyzer = analyzer
+        if analyze_body:
+            analyzer.exit_function(node)
         self.dedent()
         self.add_line("}")
+        if node.memoize is not None:
+            # Рекурсивные вызовы идут по имени, поэтому тоже попадают в кэш
+            limit = f", {node.memoize}" if node.memoize else ""
+            self.add_line(f"{node.name} = pyMemoize({node.name}{limit});")
         self.add_line()
 
+    def _emit_tail_loop(self, node: FunctionDeclaration):
+        """Тело функции с хвостовой саморекурсией (см. TailCallEliminator)"""
+        self.add_line("tail: while (true) {")
+        self.indent()
+        self.visit(node.body)
+        statements = node.body.statements
+        if not statements or not terminates(statements[-1]):
+            # Выход из тела без return: иначе цикл начался бы заново
+            self.add_line("return;")
+        self.dedent()
+        self.add_line("}")
+
+    def _emit_tail_call(self, call: FunctionCall):
+        """Хвостовой самовызов: новые значения параметров и переход в начало"""
+        pairs = list(zip(self._tail_function.parameters, call.arguments))
+        # f(n - 1, acc): acc = acc не нужно
+        changed = [parameter for parameter, argument in pairs
+                   if not (isinstance(argument, Identifier) and argument.name == parameter.name)]
+        changed_ids = {id(parameter) for parameter in changed}
+        for parameter, argument in pairs:
+            # Строка выводится сразу после своего аргумента: маркеры карты
+            # исходников относятся к ближайшей выведенной строке
+            code = self.visit(argument)
+            if id(parameter) not in changed_ids:
+                continue
+            if len(changed) == 1:
+                self.add_line(f"{self._name(parameter)} = {code};")
+            else:
+                # Аргументы вычисляются до вызова, поэтому сначала все значения, затем
+                # присваивания: иначе аргумент (в том числе подстановка f-строки)
+                # прочитал бы уже изменённый параметр. '$' не встречается в именах Python
+                self.add_line(f"const {self._name(parameter)}$next = {code};")
+        self._expr_type = DataType.ANY
+        if len(changed) > 1:
+            for parameter in changed:
+                name = self._name(parameter)
+                self.add_line(f"{name} = {name}$next;")
+        self.add_line("continue tail;")
+
     def visit_block(self, node: Block):
         for stmt in node.statements:
+            self._statement = stmt
             self.visit(stmt)
 
     def visit_ifstatement(self, node: IfStatement):
         condition = self.visit(node.condition)
-        is_main_check = isinstance(node.condition, BinaryOperation) and self.visit(node.condition.left) == '__name__' and self.visit(node.condition.right) == '"__main__"'
-        if is_main_check:
+        if self.analyzer is not None:
+            self.analyzer.check_condition(node.condition, self._expr_type)
+        if self._is_main_check(node.condition):
             # Не вставляем вызов main() внутрь функции!
             self.should_call_main = True
+            if self.analyzer is not None:
+                # Ветки не генерируются, но анализируются как в отдельном проходе
+                self.analyzer.visit(node.then_branch)
+                if node.else_branch:
+                    self.analyzer.visit(node.else_branch)
             return
-        condition_clean = self._strip_parentheses_if_simple(condition)
-        self.add_line(f"if ({condition_clean}) {{")
+        self.add_line(f"if ({condition}) {{")
         self.indent()
         self.visit(node.then_branch)
         self.dedent()
-        if node.else_branch:
-            if isinstance(node.else_branch, IfStatement):
-                self.add_line(f"}} else ", end="")
-                else_code = self.visit(node.else_branch)
-                if else_code.startswith("if "): self.output[-1] += else_code
-                else: self.add_line(else_code)
-            else:
-                self.add_line("} else {")
-                self.indent()
-                self.visit(node.else_branch)
-                self.dedent()
-                self.add_line("}")
-        else:
-            self.add_line("}")
+        # Цепочка elif: else_branch -- вложенный IfStatement
+        else_branch = node.else_branch
+        while isinstance(else_branch, IfStatement):
+            condition = self.visit(else_branch.condition)
+            if self.analyzer is not None:
+                self.analyzer.check_condition(else_branch.condition, self._expr_type)
+            self.add_line(f"}} else if ({condition}) {{")
+            self.indent()
+            self.visit(else_branch.then_branch)
+            self.dedent()
+            else_branch = else_branch.else_branch
+        if else_branch:
+            self.add_line("} else {")
+            self.indent()
+            self.visit(else_branch)
+            self.dedent()
+        self.add_line("}")
+
+    def _is_main_check(self, condition: Node) -> bool:
+        """Условие вида __name__ == "__main__" """
+        return (isinstance(condition, BinaryOperation) and condition.operator == '==' and
+                isinstance(condition.left, Identifier) and condition.left.name == '__name__' and
+                isinstance(condition.right, Literal) and condition.right.value == '__main__')
 
     def visit_whileloop(self, node: WhileLoop):
-        condition = self._strip_parentheses_if_simple(self.visit(node.condition))
+        condition = self.visit(node.condition)
+        if self.analyzer is not None:
+            self.analyzer.check_condition(node.condition, self._expr_type)
         self.add_line(f"while ({condition}) {{")
         self.indent()
         self.visit(node.body)
         self.dedent()
         self.add_line("}")
 
-    def visit_forloop(self, node: ForLoop):
+    @staticmethod
+    def _int_constant(node: Node):
+        """Значение целочисленной константы (в том числе -5), иначе None"""
+        sign = 1
+        if isinstance(node, UnaryOperation) and node.operator in ('-', '+'):
+            sign = -1 if node.operator == '-' else 1
+            node = node.operand
+        if isinstance(node, Literal) and type(node.value) is int:
+            return sign * node.value
+        return None
+
+    def _counted_range(self, node: ForLoop):
+        """Аргументы (start, stop, step) цикла for по range(...), который можно
+        записать счётным циклом JS; None -- оставить for...of по массиву.
+
+        Шаг должен быть ненулевой целой константой (от его знака зависит
+        условие), а тело не должно присваивать переменной цикла: в Python это
+        не влияет на следующие итерации, а в счётном цикле повлияло бы.
+        """
+        iterable = node.iterable
+        if not (isinstance(iterable, FunctionCall) and iterable.name.name == 'range'
+                and 1 <= len(iterable.arguments) <= 3
+                and 'range' not in self._user_functions):
+            return None
+        arguments = iterable.arguments
+        if len(arguments) == 1:
+            start, stop, step = None, arguments[0], 1
+        else:
+            start, stop = arguments[0], arguments[1]
+            step = self._int_constant(arguments[2]) if len(arguments) == 3 else 1
+        if not step:
+            return None
         variable = node.variable.name
-        self.declared_variables.add(variable)
-        iter_code = self.visit(node.iterable)
-        self.add_line(f"for (let {variable} of {iter_code}) {{")
+        for n in walk(node.body):
+            if isinstance(n, Assignment) and n.target.name == variable:
+                return None
+            if isinstance(n, ForLoop) and n.variable.name == variable:
+                return None
+        return start, stop, step
+
+    def _is_loop_invariant(self, expression: Node, body: Node) -> bool:
+        """Границу можно не сохранять во временной переменной: константа или
+        имя, которому тело цикла не присваивает и не может присвоить через
+        вызов функции модуля"""
+        if self._int_constant(expression) is not None:
+            return True
+        if not isinstance(expression, Identifier):
+            return False
+        for n in walk(body):
+            if isinstance(n, Assignment) and n.target.name == expression.name:
+                return False
+            if isinstance(n, FunctionCall) and (n.name.name in self._user_functions
+                                                or n.name.name not in BUILTIN_PURITY):
+                return False
+        return True
+
+    def _emit_counted_for(self, node: ForLoop, start: Node, stop: Node, step: int):
+        """for (let i = start, i$stop = stop; i < i$stop; i += step)"""
+        variable = self._name(node.variable)
+        start_code = self.visit(start) if start is not None else "0"
+        stop_code = self.visit(stop)
+        if len(node.iterable.arguments) == 3:
+            self.visit(node.iterable.arguments[2])  # шаг -- константа, но имена размечаются по порядку
+        self._expr_type = DataType.ANY
+        init = f"let {variable} = {start_code}"
+        if not self._is_loop_invariant(stop, node.body):
+            # range() вычисляет границу один раз; '$' не встречается в именах Python
+            init += f", {variable}$stop = {stop_code}"
+            stop_code = f"{variable}$stop"
+        comparison = '<' if step > 0 else '>'
+        if step == 1:
+            update = f"{variable}++"
+        elif step == -1:
+            update = f"{variable}--"
+        elif step > 0:
+            update = f"{variable} += {step}"
+        else:
+            update = f"{variable} -= {-step}"
+        self.add_line(f"for ({init}; {variable} {comparison} {stop_code}; {update}) {{")
+
+    def visit_forloop(self, node: ForLoop):
+        variable = self._name(node.variable)
+        counted = self._counted_range(node)
+        if counted is not None:
+            self._emit_counted_for(node, *counted)
+            if self.analyzer is not None:
+                self.analyzer.enter_for_loop(node)
+        else:
+            iter_code = self.visit(node.iterable)
+            if self.analyzer is not None:
+                self.analyzer.enter_for_loop(node)
+            self.add_line(f"for (let {variable} of {iter_code}) {{")
         self.indent()
+        self._enter_scope([node.variable.name])
         self.visit(node.body)
+        self._exit_scope()
+        if self.analyzer is not None:
+            self.analyzer.exit_for_loop(node)
         self.dedent()
         self.add_line("}")
 
-    def visit_functioncall(self, node: FunctionCall):
-        name = self.visit(node.name)
-        args = ', '.join([self.visit(a) for a in node.arguments])
-        # Встроенная функция print
-        if name == "print":
-            return f"console.log({args})"
-        return f"{name}({args})"
-
     def visit_returnstatement(self, node: ReturnStatement):
-        if node.value:
-            value = self._strip_parentheses_if_simple(self.visit(node.value))
+        if node.tail_call and self._tail_function is not None:
+            self._emit_tail_call(node.value)
+            if self.analyzer is not None:
+                self.analyzer.check_return(node, self._expr_type)
+        elif node.value:
+            value = self.visit(node.value)
+            if self.analyzer is not None:
+                self.analyzer.check_return(node, self._expr_type)
             self.add_line(f"return {value};")
         else: self.add_line("return;")
 
@@ -342,7 +683,8 @@ class CodeGenerator:
         self.add_line("continue;")
 
     def visit_import(self, node: Import):
-        self.add_line(f"// import {node.module_name}")
+        if not self.minify:
+            self.add_line(f"// import {node.module_name}")
 
     def visit_variabledeclaration(self, node: VariableDeclaration):
         if node.value:
@@ -0,0 +1,133 @@
+import re
+from typing import Dict, Iterator, Set
+
+from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk, iter_child_nodes
+from backend.src.parser.fstrings import is_fstring, fstring_expressions
+from backend.src.semantic.symbol_table import SymbolType
+
+# Строки и шаблоны остаются как есть, пробелы между остальными лексемами
+# сжимаются (см. compact)
+_TOKENS = re.compile(r'"(?:\\.|[^"\\])*"|`(?:\\.|[^`\\])*`|\s+')
+_WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_$')
+
+# Зарезервированные слова JS и имена, которые использует сгенерированный код
+JS_RESERVED = frozenset({
+    'do', 'if', 'in', 'for', 'let', 'new', 'try', 'var', 'case', 'else', 'enum',
+    'eval', 'null', 'this', 'true', 'void', 'with', 'await', 'break', 'catch',
+    'class', 'const', 'false', 'super', 'throw', 'while', 'yield', 'delete',
+    'export', 'import', 'public', 'return', 'static', 'switch', 'typeof',
+    'default', 'extends', 'finally', 'package', 'private', 'continue', 'debugger',
+    'function', 'arguments', 'interface', 'protected', 'implements', 'instanceof',
+    'of', 'NaN', 'Infinity', 'undefined',
+    'console', 'range', 'str', 'len', 'list', 'main', 'PyRange',
+    'Math', 'String', 'Array', 'Symbol', 'Error',
+})
+
+
+def _squeeze(match) -> str:
+    text = match.group(0)
+    if not text[0].isspace():
+        return text
+    line, start, end = match.string, match.start(), match.end()
+    if start == 0 or end == len(line):
+        return ''
+    before, after = line[start - 1], line[end]
+    # Пробел нужен между словами (let x, return y) и в a - -b, a + +b
+    if before in _WORD_CHARS and after in _WORD_CHARS or before == after and before in '+-':
+        return ' '
+    return ''
+
+
+def compact(line: str) -> str:
+    """Строка кода без лишних пробелов: 'if (a > 1) {' -> 'if(a>1){'"""
+    return _TOKENS.sub(_squeeze, line)
+
+
+def short_names(skip: Set[str]) -> Iterator[str]:
+    """a, b, ..., Z, aa, ab, ... без имён из skip и зарезервированных слов"""
+    letters = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'
+    length = 1
+    while True:
+        for index in range(len(letters) ** length):
+            name = ''
+            for _ in range(length):
+                index, digit = divmod(index, len(letters))
+                name = letters[digit] + name
+            if name not in skip and name not in JS_RESERVED:
+                yield name
+        length += 1
+
+
+class LocalRenamer:
+    """Короткие имена локальных переменных и параметров для минификации.
+
+    Переменные различаются по Binding.key, поэтому все вхождения одной
+    переменной получают одно имя (Identifier.js_name). Имена выбираются
+    заново в каждой функции верхнего уровня; вложенная функция продолжает
+    нумерацию объемлющей, чтобы не перекрыть её переменные. Короткие имена
+    не совпадают ни с одним именем программы, поэтому не перекрывают
+    глобальные переменные и функции. Не переименовываются глобальные
+    переменные, имена из f-строк (они не разрешены анализатором) и имена,
+    которые где-то вызываются как функции.
+    """
+
+    def __init__(self):
+        self.names: Dict[tuple, str] = {}
+
+    def analyze(self, program: Program, resolve_names: bool = True) -> Program:
+        if resolve_names:
+            from backend.src.semantic.analyzer import SemanticAnalyzer
+            SemanticAnalyzer().analyze(program)
+
+        taken = set()  # все имена программы
+        keep = set()   # имена, которые нельзя менять
+        for node in walk(program):
+            if isinstance(node, Identifier):
+                taken.add(node.name)
+            elif isinstance(node, FunctionDeclaration):
+                taken.add(node.name)
+            elif isinstance(node, FunctionCall):
+                keep.add(node.name.name)
+            elif is_fstring(node):
+                for expression in fstring_expressions(node):
+                    for inner in walk(expression):
+                        if isinstance(inner, Identifier):
+                            keep.add(inner.name)
+        taken |= keep
+
+        self.names = {}
+        self._rename(program, 0, taken, keep)
+        for node in walk(program):
+            if isinstance(node, Identifier):
+                binding = node.binding
+                node.js_name = self.names.get(binding.key) if binding is not None else None
+        return program
+
+    def _rename(self, owner: Node, start: int, taken: Set[str], keep: Set[str]):
+        """Имена для параметров и переменных, объявленных в owner (не во
+        вложенных функциях), начиная с start-го короткого имени; затем --
+        для вложенных функций"""
+        generator = short_names(taken)
+        for _ in range(start):
+            next(generator)
+        count = start
+        nested = []
+        stack = list(reversed(list(iter_child_nodes(owner))))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, FunctionDeclaration):
+                nested.append(node)
+                continue
+            if isinstance(node, Identifier) and self._renamable(node, keep):
+                self.names[node.binding.key] = next(generator)
+                count += 1
+            stack.extend(reversed(list(iter_child_nodes(node))))
+        for function in nested:
+            self._rename(function, count, taken, keep)
+
+    def _renamable(self, node: Identifier, keep: Set[str]) -> bool:
+        binding = node.binding
+        return (binding is not None and binding.is_definition and binding.scope_id != 0
+                and binding.symbol.symbol_type == SymbolType.VARIABLE
+                and node.name not in keep and binding.key not in self.names)
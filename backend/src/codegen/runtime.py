@@ -0,0 +1,180 @@
+import io
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+from backend.src.codegen.writer import CodeWriter
+
+# Имя общего модуля рантайма рядом со сгенерированными файлами
+RUNTIME_MODULE = "pyjs_runtime.js"
+
+
+class RuntimeHelper:
+    """Вспомогательная функция рантайма Python-подмножества.
+
+    name     -- ключ в реестре (его возвращает CodeGenerator._scan_runtime_needs)
+    source   -- код JS; отступ -- по четыре пробела на уровень
+    exports  -- имена, которые код вызывает (и которые экспортирует модуль)
+    builtins -- встроенные функции Python, вызов которых требует хелпера
+    """
+
+    def __init__(self, name: str, source: str, exports: Iterable[str] = None,
+                 builtins: Iterable[str] = ()):
+        self.name = name
+        self.exports = tuple(exports) if exports is not None else (name,)
+        self.builtins = tuple(builtins)
+        self.lines: List[Tuple[int, str]] = []  # (уровень отступа, строка)
+        for line in source.strip('\n').split('\n'):
+            text = line.lstrip(' ')
+            self.lines.append(((len(line) - len(text)) // len(CodeWriter.INDENT), text))
+
+
+# Реестр в порядке вывода: имя -> хелпер
+RUNTIME_HELPERS: Dict[str, RuntimeHelper] = {}
+
+
+def register_helper(helper: RuntimeHelper) -> RuntimeHelper:
+    """Добавляет (или заменяет) хелпер; новые встроенные функции
+    подключаются здесь, без изменений генератора"""
+    RUNTIME_HELPERS[helper.name] = helper
+    return helper
+
+
+def helper_for_builtin(name: str) -> Optional[RuntimeHelper]:
+    for helper in RUNTIME_HELPERS.values():
+        if name in helper.builtins:
+            return helper
+    return None
+
+
+def emit_helpers(names: Iterable[str], write_line) -> None:
+    """Выводит код хелперов (в порядке реестра) через write_line(строка, уровень);
+    после каждого -- пустая строка"""
+    names = set(names)
+    for helper in RUNTIME_HELPERS.values():
+        if helper.name in names:
+            for level, text in helper.lines:
+                write_line(text, level)
+            write_line("", 0)
+
+
+def import_statement(names: Iterable[str], specifier: str) -> str:
+    """import { ... } from "specifier" для нужных хелперов"""
+    names = set(names)
+    exports = [e for h in RUNTIME_HELPERS.values() if h.name in names for e in h.exports]
+    return f'import {{ {", ".join(exports)} }} from "{specifier}";'
+
+
+def runtime_module_source(minify: bool = False) -> str:
+    """ES-модуль со всеми хелперами реестра"""
+    output = io.StringIO()
+    writer = CodeWriter(output, minify=minify)
+    if not minify:
+        writer.write_line("// Python -> JavaScript transpiler runtime, shared by generated modules")
+        writer.write_line("")
+    emit_helpers(RUNTIME_HELPERS, writer.write_line)
+    exports = [e for h in RUNTIME_HELPERS.values() for e in h.exports]
+    writer.write_line(f"export {{ {', '.join(exports)} }};")
+    writer.write("\n")
+    writer.close()
+    return output.getvalue()
+
+
+def write_runtime_module(directory: str, minify: bool = False) -> str:
+    """Записывает RUNTIME_MODULE в directory и возвращает путь. Файл с тем
+    же содержимым не перезаписывается: при сборке многих файлов модуль
+    пишется один раз, а время изменения не сбивает кэши."""
+    path = os.path.join(directory or '.', RUNTIME_MODULE)
+    source = runtime_module_source(minify=minify)
+    try:
+        with open(path, encoding='utf-8') as existing:
+            if existing.read() == source:
+                return path
+    except OSError:
+        pass
+    with open(path, 'w', encoding='utf-8', newline='\n') as output:
+        output.write(source)
+    return path
+
+
+# Эмуляция Python range(...) ленивым объектом. Память O(1): длина и элементы
+# вычисляются из start/stop/step. Поддерживаются for...of, length (для len())
+# и at(i) с отрицательными индексами; массив строит только list(...).
+# Остальные места, где нужен массив, принимают любой итерируемый объект;
+# print/str/f-строки выводят range(...) как Python.
+register_helper(RuntimeHelper('range', '''
+class PyRange {
+    constructor(start, stop, step) {
+        if (step === 0) { throw new Error("range() step argument must not be zero"); }
+        this.start = start; this.stop = stop; this.step = step;
+        const span = step > 0 ? stop - start : start - stop;
+        this.length = span > 0 ? Math.ceil(span / Math.abs(step)) : 0;
+    }
+    at(index) {
+        if (index < 0) { index += this.length; }
+        if (index < 0 || index >= this.length) { throw new Error("range object index out of range"); }
+        return this.start + index * this.step;
+    }
+    *[Symbol.iterator]() {
+        for (let i = 0, value = this.start; i < this.length; i++, value += this.step) { yield value; }
+    }
+    toString() {
+        return `range(${this.start}, ${this.stop}${this.step === 1 ? "" : ", " + this.step})`;
+    }
+    [Symbol.for("nodejs.util.inspect.custom")]() { return this.toString(); }
+}
+
+function range(start, stop, step = 1) {
+    if (stop === undefined) { stop = start; start = 0; }
+    return new PyRange(start, stop, step);
+}
+''', builtins=('range',)))
+
+# Кэш результатов чистой функции (см. optimizer.Memoizer). Ключ Map для
+# одного аргумента-числа или строки -- сам аргумент, без сериализации;
+# остальные аргументы сравниваются по JSON с префиксом \0 (строки,
+# начинающиеся с \0, тоже идут через JSON, поэтому ключи разных видов не
+# совпадают). При limit Map работает как LRU: порядок обхода -- порядок
+# вставки, использованный ключ переносится в конец, вытесняется первый.
+register_helper(RuntimeHelper('memoize', r'''
+function pyMemoize(fn, limit = 0) {
+    const cache = new Map();
+    const hit = (key) => {
+        const value = cache.get(key);
+        if (limit) { cache.delete(key); cache.set(key, value); }
+        return value;
+    };
+    const remember = (key, value) => {
+        if (limit && cache.size >= limit) { cache.delete(cache.keys().next().value); }
+        cache.set(key, value);
+        return value;
+    };
+    if (fn.length === 1) {
+        return (x) => {
+            const key = typeof x === "number" || (typeof x === "string" && x.charCodeAt(0) !== 0) ? x : "\0" + JSON.stringify(x);
+            return cache.has(key) ? hit(key) : remember(key, fn(x));
+        };
+    }
+    return (...args) => {
+        const key = "\0" + JSON.stringify(args);
+        return cache.has(key) ? hit(key) : remember(key, fn(...args));
+    };
+}
+''', exports=('pyMemoize',)))
+
+register_helper(RuntimeHelper('str', '''
+function str(value) {
+    return String(value);
+}
+''', builtins=('str',)))
+
+register_helper(RuntimeHelper('len', '''
+function len(value) {
+    return value.length;
+}
+''', builtins=('len',)))
+
+# Материализация итерируемого (в том числе ленивого range) в массив
+register_helper(RuntimeHelper('list', '''
+function list(value) {
+    return Array.from(value);
+}
+''', builtins=('list',)))
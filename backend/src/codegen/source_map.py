@@ -0,0 +1,176 @@
+import json
+from typing import List, Optional
+
+_BASE64 = 'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+_VLQ_SHIFT = 5
+_VLQ_CONTINUATION = 1 << _VLQ_SHIFT
+_VLQ_MASK = _VLQ_CONTINUATION - 1
+
+# Маркер позиции выражения внутри строки кода: MARK и символ chr(номер + 1)
+# (см. CodeGenerator.visit_functioncall); в сгенерированном коде '\x00' не встречается
+MARK = '\x00'
+
+
+def _encode_vlq(value: int) -> str:
+    # Знак -- младший бит, дальше группы по 5 бит от младших к старшим
+    value = (-value << 1) | 1 if value < 0 else value << 1
+    chars = []
+    while True:
+        digit = value & _VLQ_MASK
+        value >>= _VLQ_SHIFT
+        if value:
+            digit |= _VLQ_CONTINUATION
+        chars.append(_BASE64[digit])
+        if not value:
+            return ''.join(chars)
+
+
+# Разности позиций почти всегда небольшие: их кодировки считаются один раз
+_VLQ_CACHE_LIMIT = 4096
+_VLQ_CACHE = [_encode_vlq(v) for v in range(-_VLQ_CACHE_LIMIT, _VLQ_CACHE_LIMIT)]
+
+
+def encode_vlq(value: int) -> str:
+    """Base64 VLQ одного числа (формат Source Map v3)"""
+    if -_VLQ_CACHE_LIMIT <= value < _VLQ_CACHE_LIMIT:
+        return _VLQ_CACHE[value + _VLQ_CACHE_LIMIT]
+    return _encode_vlq(value)
+
+
+def decode_vlq(text: str) -> List[int]:
+    """Последовательность чисел из строки Base64 VLQ (для проверки карт)"""
+    values = []
+    value = shift = 0
+    for char in text:
+        digit = _BASE64.index(char)
+        value += (digit & _VLQ_MASK) << shift
+        if digit & _VLQ_CONTINUATION:
+            shift += _VLQ_SHIFT
+            continue
+        values.append(-(value >> 1) if value & 1 else value >> 1)
+        value = shift = 0
+    return values
+
+
+class SourceMapBuilder:
+    """Инкрементальное построение Source Map v3.
+
+    Сегменты кодируются сразу при добавлении: генератор вызывает new_line()
+    для каждой выведенной строки и add() для позиций в ней. Все позиции
+    0-based; разности считаются от предыдущего сегмента, как требует формат
+    (столбец в сгенерированном коде -- в пределах строки).
+    """
+
+    def __init__(self, file: Optional[str] = None, source: str = '<input>',
+                 source_content: Optional[str] = None):
+        self.file = file
+        self.source = source
+        self.source_content = source_content
+        self._lines: List[List[str]] = []  # закодированные сегменты по строкам
+        self._segments: List[str] = []
+        self._generated_column = 0
+        self._source_line = 0
+        self._source_column = 0
+        self.segment_count = 0
+
+    def new_line(self):
+        self._segments = []
+        self._lines.append(self._segments)
+        self._generated_column = 0
+
+    def add(self, generated_column: int, source_line: int, source_column: int):
+        if (self._segments and generated_column == self._generated_column
+                and source_line == self._source_line and source_column == self._source_column):
+            return  # выражение начинается там же, где оператор
+        # Второе поле -- индекс исходного файла: он один, разность всегда 0 ('A')
+        self._segments.append(
+            encode_vlq(generated_column - self._generated_column) + 'A'
+            + encode_vlq(source_line - self._source_line)
+            + encode_vlq(source_column - self._source_column))
+        self._generated_column = generated_column
+        self._source_line = source_line
+        self._source_column = source_column
+        self.segment_count += 1
+
+    def map_line(self, column: int, statement, line: str, marked: list) -> str:
+        """Начинает новую строку и добавляет её сегменты: оператор statement
+        с позиции column (после отступа) и выражения из marked по маркерам в
+        line. Возвращает строку без маркеров. Это горячий путь генерации,
+        поэтому new_line() и add() здесь встроены."""
+        segments = self._segments = []
+        self._lines.append(segments)
+        # Пустые строки и закрывающие скобки ('}', '} else {') не сопоставляются
+        if not line or line[0] == '}' and MARK not in line:
+            self._generated_column = 0
+            return line
+        last_column = 0
+        last_line = self._source_line
+        last_source_column = self._source_column
+        cache = _VLQ_CACHE
+        offset = _VLQ_CACHE_LIMIT
+
+        if statement is not None and statement.line and line[0] != '}':
+            source_line = statement.line - 1
+            source_column = statement.column - 1
+            delta_line = source_line - last_line
+            delta_source_column = source_column - last_source_column
+            if -offset <= delta_line < offset and -offset <= delta_source_column < offset and column < offset:
+                segments.append(cache[column + offset] + 'A' + cache[delta_line + offset]
+                                + cache[delta_source_column + offset])
+            else:
+                segments.append(encode_vlq(column) + 'A' + encode_vlq(delta_line)
+                                + encode_vlq(delta_source_column))
+            last_column, last_line, last_source_column = column, source_line, source_column
+        if MARK not in line:
+            self._generated_column = last_column
+            self._source_line = last_line
+            self._source_column = last_source_column
+            self.segment_count += len(segments)
+            return line
+
+        parts = line.split(MARK)
+        column += len(parts[0])
+        clean = [parts[0]]
+        for part in parts[1:]:
+            node = marked[ord(part[0]) - 1]
+            if node.line:
+                source_line = node.line - 1
+                source_column = node.column - 1
+                if not (column == last_column and source_line == last_line
+                        and source_column == last_source_column and segments):
+                    delta_line = source_line - last_line
+                    delta_source_column = source_column - last_source_column
+                    if -offset <= delta_line < offset and -offset <= delta_source_column < offset \
+                            and column - last_column < offset:
+                        segments.append(cache[column - last_column + offset] + 'A'
+                                        + cache[delta_line + offset] + cache[delta_source_column + offset])
+                    else:
+                        segments.append(encode_vlq(column - last_column) + 'A' + encode_vlq(delta_line)
+                                        + encode_vlq(delta_source_column))
+                    last_column, last_line, last_source_column = column, source_line, source_column
+            text = part[1:]
+            clean.append(text)
+            column += len(text)
+        self._generated_column = last_column
+        self._source_line = last_line
+        self._source_column = last_source_column
+        self.segment_count += len(segments)
+        return ''.join(clean)
+
+    @property
+    def mappings(self) -> str:
+        return ';'.join([','.join(segments) for segments in self._lines])
+
+    def to_dict(self) -> dict:
+        result = {'version': 3}
+        if self.file is not None:
+            result['file'] = self.file
+        result['sources'] = [self.source]
+        if self.source_content is not None:
+            result['sourcesContent'] = [self.source_content]
+        result['names'] = []
+        result['mappings'] = self.mappings
+        return result
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
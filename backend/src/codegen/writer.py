@@ -0,0 +1,86 @@
+import io
+from typing import List, TextIO
+from backend.src.codegen.minify import compact
+
+
+class CodeWriter:
+    """Буферизованный вывод строк кода с отступами.
+
+    Строки собираются в небольшой буфер и сбрасываются в поток порциями по
+    chunk_size символов, поэтому весь код не хранится одной строкой Python.
+    Поток может быть текстовым или бинарным (тогда пишется UTF-8). Префиксы
+    отступов кэшируются по уровню. Строки разделяются '\n', после последней
+    строки перевод строки не пишется (как '\n'.join).
+
+    С minify отступы и пустые строки не выводятся, пробелы сжимаются
+    (minify.compact), а строки разделяются '\n' только там, где без него
+    изменится разбор: после строки, которая не кончается на ';', '{' или '}'.
+    """
+
+    INDENT = '    '
+
+    def __init__(self, stream: TextIO, chunk_size: int = 64 * 1024, minify: bool = False):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.minify = minify
+        self._last_char = ''
+        self.binary = self._is_binary(stream)
+        self.line_count = 0
+        self._indents = ['']
+        self._buffer: List[str] = []
+        self._buffered = 0
+
+    @staticmethod
+    def _is_binary(stream) -> bool:
+        if isinstance(stream, io.TextIOBase):
+            return False
+        if isinstance(stream, (io.BufferedIOBase, io.RawIOBase)):
+            return True
+        return 'b' in getattr(stream, 'mode', '')
+
+    def prefix(self, level: int) -> str:
+        while len(self._indents) <= level:
+            self._indents.append(self._indents[-1] + self.INDENT)
+        return self._indents[level]
+
+    def write_line(self, line: str, level: int = 0):
+        if self.minify:
+            line = compact(line)
+            if not line:
+                return
+            level = 0
+            separate = self.line_count and self._last_char not in ';{}'
+            self._last_char = line[-1]
+        else:
+            separate = self.line_count
+        if separate:
+            self._buffer.append('\n')
+        self.line_count += 1
+        prefix = self.prefix(level)
+        self._buffer.append(prefix)
+        self._buffer.append(line)
+        self._buffered += len(prefix) + len(line) + 1
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def write(self, text: str):
+        """Дописывает текст без перевода строки (например, завершающий '\n')"""
+        self._buffer.append(text)
+        self._buffered += len(text)
+        if self._buffered >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            chunk = ''.join(self._buffer)
+            self.stream.write(chunk.encode('utf-8') if self.binary else chunk)
+            self._buffer = []
+            self._buffered = 0
+
+    def close(self):
+        """Сбрасывает буфер и поток (сам поток не закрывается)"""
+        self.flush()
+        flush = getattr(self.stream, 'flush', None)
+        if flush is not None:
+            flush()
+
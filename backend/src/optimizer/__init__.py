@@ -0,0 +1,12 @@
+from .transform import transform, replace_children, clone
+from .constant_folding import ConstantFolder
+from .dead_code import DeadCodeEliminator
+from .tail_calls import TailCallEliminator
+from .memoize import Memoizer
+from .inliner import Inliner
+from .licm import LoopInvariantMotion
+from .typed_arrays import TypedArrayMarker
+
+__all__ = ['transform', 'replace_children', 'clone', 'ConstantFolder', 'DeadCodeEliminator',
+           'TailCallEliminator', 'Memoizer', 'Inliner',
+           'LoopInvariantMotion', 'TypedArrayMarker']
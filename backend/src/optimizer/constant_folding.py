@@ -0,0 +1,190 @@
+import math
+from ..parser.ast_nodes import *
+from .transform import transform
+
+# Целые больше этого значения JS представляет неточно
+MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+_UNKNOWN = object()
+
+_COMPARISONS = {
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '>': lambda a, b: a > b,
+    '<=': lambda a, b: a <= b,
+    '>=': lambda a, b: a >= b,
+}
+
+# x op c, которые в JS в точности равны +x (ToNumber): x * 1, x / 1, x - 0, x ** 1.
+# x + 0 сюда не входит: для строк это конкатенация, а -0 + 0 == +0.
+# Константа сравнивается по ==, поэтому -0.0 (равная 0) исключается отдельно:
+# x - -0.0 -- это x + 0, а не x
+_NUMERIC_IDENTITIES = {('*', 1), ('/', 1), ('-', 0), ('**', 1)}
+
+
+def _is_identity(operator: str, constant) -> bool:
+    return (operator, constant) in _NUMERIC_IDENTITIES and math.copysign(1, constant) > 0
+
+
+class ConstantFolder:
+    """Свёртка констант и алгебраические упрощения перед генерацией кода.
+
+    Константные поддеревья BinaryOperation/UnaryOperation вычисляются по
+    правилам Python: int и float различаются, % берёт знак делителя, **
+    правоассоциативно (это обеспечивает парсер). Свёртка выполняется, только
+    если результат точный и в JS получится то же значение: целые не выходят
+    за 2**53, float конечен; деление на ноль, 0 ** -1 и комплексные
+    результаты остаются исключениями времени выполнения.
+
+    Тождества не меняют поведения сгенерированного JS ни для каких значений
+    x: x * 1, x / 1, x - 0 и x ** 1 становятся +x (или x, если это заведомо
+    число), -(-x) -- +x, not not not x -- not x; and/or с константой слева
+    сводятся к одному операнду. Строки и списки не сворачиваются.
+
+    В режиме fused семантический анализ проходит уже по свёрнутому дереву.
+    """
+
+    def __init__(self):
+        self.folded = 0  # число выполненных упрощений
+
+    def fold(self, program: Program) -> Program:
+        return transform(program, self._rewrite)
+
+    def _rewrite(self, node: Node):
+        if isinstance(node, BinaryOperation):
+            result = self._fold_binary(node)
+        elif isinstance(node, UnaryOperation):
+            result = self._fold_unary(node)
+        else:
+            return None
+        if result is not None:
+            self.folded += 1
+        return result
+
+    # ---- КОНСТАНТЫ ----
+    @staticmethod
+    def _number(node: Node):
+        """Значение числового литерала (bool не считается числом)"""
+        if isinstance(node, Literal) and type(node.value) in (int, float):
+            if type(node.value) is int and abs(node.value) > MAX_SAFE_INTEGER:
+                return _UNKNOWN
+            return node.value
+        return _UNKNOWN
+
+    @staticmethod
+    def _truth_constant(node: Node):
+        """Значение литерала, истинность которого одинакова в Python и JS"""
+        if isinstance(node, Literal) and (node.value is None or type(node.value) in (int, float, bool)):
+            return node.value
+        return _UNKNOWN
+
+    @staticmethod
+    def _literal(value, like: Node) -> Literal:
+        if type(value) is bool:
+            literal_type = DataType.BOOLEAN
+        elif type(value) is int:
+            literal_type = DataType.INT
+        else:
+            literal_type = DataType.FLOAT
+        return Literal(value, literal_type, like.line, like.column)
+
+    @classmethod
+    def _is_number(cls, node: Node) -> bool:
+        """Выражение в JS заведомо даёт число"""
+        if cls._number(node) is not _UNKNOWN:
+            return True
+        if isinstance(node, UnaryOperation):
+            return node.operator in ('-', '+')
+        if isinstance(node, BinaryOperation):
+            if node.operator in ('-', '*', '/', '%', '**'):
+                return True
+            if node.operator == '+':
+                return cls._is_number(node.left) and cls._is_number(node.right)
+        return False
+
+    @staticmethod
+    def _evaluate(operator: str, a, b):
+        """a operator b по правилам Python или _UNKNOWN, если результат
+        нельзя записать точной константой JS"""
+        try:
+            if operator in _COMPARISONS:
+                return _COMPARISONS[operator](a, b)
+            if operator == '+':
+                value = a + b
+            elif operator == '-':
+                value = a - b
+            elif operator == '*':
+                value = a * b
+            elif operator == '/':
+                value = a / b
+            elif operator == '%':
+                value = a % b
+            elif operator == '**':
+                if abs(a) > 1 and type(b) is int and b > 53:
+                    return _UNKNOWN  # заведомо больше 2**53 (или огромное вычисление)
+                value = a ** b
+            else:
+                return _UNKNOWN
+        except (ZeroDivisionError, OverflowError, ValueError):
+            return _UNKNOWN
+        if type(value) is int:
+            return value if abs(value) <= MAX_SAFE_INTEGER else _UNKNOWN
+        if type(value) is float and math.isfinite(value):
+            return value
+        return _UNKNOWN  # inf, nan, complex
+
+    # ---- БИНАРНЫЕ ОПЕРАЦИИ ----
+    def _fold_binary(self, node: BinaryOperation):
+        operator = node.operator
+        if operator in ('and', 'or'):
+            value = self._truth_constant(node.left)
+            if value is _UNKNOWN:
+                return None
+            # Python и JS возвращают сам операнд: 0 and x -> 0, None or x -> x
+            if operator == 'and':
+                return node.right if value else node.left
+            return node.left if value else node.right
+
+        left, right = self._number(node.left), self._number(node.right)
+        if left is not _UNKNOWN and right is not _UNKNOWN:
+            value = self._evaluate(operator, left, right)
+            return self._literal(value, node) if value is not _UNKNOWN else None
+        if right is not _UNKNOWN and _is_identity(operator, right):
+            return self._to_number(node.left, node)
+        if left is not _UNKNOWN and left == 1 and operator == '*':
+            return self._to_number(node.right, node)
+        return None
+
+    def _to_number(self, operand: Node, like: Node) -> Node:
+        if self._is_number(operand):
+            return operand
+        if isinstance(operand, UnaryOperation) and operand.operator == '+':
+            return operand
+        return UnaryOperation('+', operand, like.line, like.column)
+
+    # ---- УНАРНЫЕ ОПЕРАЦИИ ----
+    def _fold_unary(self, node: UnaryOperation):
+        operator, operand = node.operator, node.operand
+        if operator == 'not':
+            value = self._truth_constant(operand)
+            if value is not _UNKNOWN:
+                return self._literal(not value, node)
+            # not not not x -> not x (not not x даёт bool и остаётся)
+            if (isinstance(operand, UnaryOperation) and operand.operator == 'not'
+                    and isinstance(operand.operand, UnaryOperation) and operand.operand.operator == 'not'):
+                return operand.operand
+            return None
+
+        value = self._number(operand)
+        if value is not _UNKNOWN:
+            return self._literal(-value if operator == '-' else value, node)
+        if isinstance(operand, UnaryOperation) and operand.operator in ('-', '+'):
+            # -(-x) -> +x, -(+x) -> -x, +(-x) -> -x, +(+x) -> +x
+            negative = (operator == '-') != (operand.operator == '-')
+            if negative:
+                return UnaryOperation('-', operand.operand, node.line, node.column)
+            return self._to_number(operand.operand, node)
+        if operator == '+' and self._is_number(operand):
+            return operand
+        return None
@@ -0,0 +1,155 @@
+from typing import List, Optional, Set
+from ..parser.ast_nodes import *
+from ..parser.walker import walk
+from ..parser.fstrings import is_fstring, fstring_expressions
+from ..semantic.call_graph import CallGraph
+
+_UNKNOWN = object()
+
+
+def is_main_check(condition: Node) -> bool:
+    """Условие вида __name__ == "__main__" (см. CodeGenerator._is_main_check)"""
+    return (isinstance(condition, BinaryOperation) and condition.operator == '==' and
+            isinstance(condition.left, Identifier) and condition.left.name == '__name__' and
+            isinstance(condition.right, Literal) and condition.right.value == '__main__')
+
+
+def terminates(statement: Node) -> bool:
+    """Оператор никогда не передаёт управление следующему: return/break/continue
+    или if/else, все ветви которого так завершаются"""
+    if isinstance(statement, (ReturnStatement, BreakStatement, ContinueStatement)):
+        return True
+    if isinstance(statement, IfStatement) and statement.else_branch is not None:
+        return _branch_terminates(statement.then_branch) and \
+            _branch_terminates(statement.else_branch)
+    return False
+
+
+def _branch_terminates(branch: Node) -> bool:
+    if isinstance(branch, Block):
+        return bool(branch.statements) and terminates(branch.statements[-1])
+    return terminates(branch)
+
+
+class DeadCodeEliminator:
+    """Удаление недостижимого кода и неиспользуемых функций.
+
+    1. В каждом Block удаляются операторы после return/break/continue и
+       после if/else, все ветви которого так завершаются.
+    2. if с константным условием (литерал числа, bool или None -- обычно
+       результат ConstantFolder) заменяется операторами выбранной ветви,
+       while с ложным условием удаляется.
+    3. Tree shaking: функции верхнего уровня, недостижимые по графу вызовов
+       из кода модуля и точки входа __main__ (вызов main()), удаляются.
+       Функция, имя которой используется как значение, считается
+       достижимой. Модуль без исполняемого кода верхнего уровня -- это
+       библиотека, его функции не удаляются.
+    """
+
+    def __init__(self):
+        self.removed_statements = 0
+        self.pruned_branches = 0
+        self.removed_functions: List[str] = []
+
+    def eliminate(self, program: Program) -> Program:
+        for node in walk(program):
+            if isinstance(node, (Program, Block)):
+                node.statements = self._clean(node.statements)
+        self._shake(program)
+        CallGraph.invalidate(program)
+        return program
+
+    # ---- НЕДОСТИЖИМЫЕ ОПЕРАТОРЫ ----
+    def _clean(self, statements: List[Node]) -> List[Node]:
+        result = []
+        pending = list(reversed(statements))
+        while pending:
+            statement = pending.pop()
+            replacement = self._prune(statement)
+            if replacement is not None:
+                # Операторы выбранной ветви проверяются так же, как свои
+                pending.extend(reversed(replacement))
+                continue
+            result.append(statement)
+            if terminates(statement):
+                self.removed_statements += len(pending)
+                break
+        return result
+
+    @staticmethod
+    def _truth(condition: Node):
+        if isinstance(condition, Literal) and (condition.value is None
+                                               or type(condition.value) in (int, float, bool)):
+            return bool(condition.value)
+        return _UNKNOWN
+
+    def _prune(self, statement: Node) -> Optional[List[Node]]:
+        """Операторы, которыми заменяется константный if/while, иначе None"""
+        if isinstance(statement, IfStatement):
+            truth = self._truth(statement.condition)
+            if truth is _UNKNOWN:
+                return None
+            self.pruned_branches += 1
+            branch = statement.then_branch if truth else statement.else_branch
+            if branch is None:
+                return []
+            if isinstance(branch, IfStatement):  # elif
+                return [branch]
+            return branch.statements
+        if isinstance(statement, WhileLoop) and self._truth(statement.condition) is False:
+            self.pruned_branches += 1
+            return []
+        return None
+
+    # ---- TREE SHAKING ----
+    def _shake(self, program: Program):
+        top_level = [s for s in program.statements if isinstance(s, FunctionDeclaration)]
+        if not top_level or all(isinstance(s, (FunctionDeclaration, Import)) for s in program.statements):
+            return
+
+        graph = CallGraph.of(program)
+        reachable: Set[int] = set()
+        pending = list(graph.callees(None))
+        if any(isinstance(s, IfStatement) and is_main_check(s.condition) for s in program.statements):
+            # Генератор вызывает main() сам, если встретил if __name__ == "__main__"
+            pending.extend(f for f in top_level if f.name == 'main')
+        referenced = self._referenced_names(program)
+        pending.extend(f for f in graph.functions if f.name in referenced)
+        while pending:
+            function = pending.pop()
+            if id(function) in reachable:
+                continue
+            reachable.add(id(function))
+            pending.extend(graph.callees(function))
+
+        # Повторные объявления одного имени остаются вместе
+        kept_names = {f.name for f in top_level if id(f) in reachable}
+        statements = []
+        for statement in program.statements:
+            if isinstance(statement, FunctionDeclaration) and statement.name not in kept_names:
+                self.removed_functions.append(statement.name)
+                continue
+            statements.append(statement)
+        program.statements = statements
+
+    @staticmethod
+    def _referenced_names(program: Program) -> Set[str]:
+        """Имена, используемые как значения (не как вызываемое имя)"""
+        call_names = set()
+        names = set()
+
+        def note(node):
+            if isinstance(node, FunctionCall):
+                call_names.add(id(node.name))
+            elif isinstance(node, Identifier) and id(node) not in call_names:
+                names.add(node.name)
+
+        # Обход в прямом порядке: вызов встречается раньше своего имени
+        for node in walk(program):
+            if is_fstring(node):
+                for expression in fstring_expressions(node):
+                    for inner in walk(expression):
+                        note(inner)
+            else:
+                note(node)
+        return names
@@ -0,0 +1,210 @@
+import copy
+from typing import Dict, List, Optional, Set
+from ..parser.ast_nodes import *
+from ..parser.walker import walk
+from ..parser.fstrings import is_fstring
+from ..semantic.call_graph import CallGraph
+from ..semantic.purity import PurityAnalyzer, Purity, BUILTIN_PURITY
+from .transform import transform
+
+# Наибольший размер подставляемого выражения (число узлов AST)
+MAX_SIZE = 12
+
+
+class Inliner:
+    """Подстановка маленьких функций в места вызова.
+
+    Подставляются функции верхнего уровня, тело которых -- один return
+    выражения не больше max_size узлов, читающего только свои параметры.
+    Рекурсивные (в том числе взаимно) и кэшируемые функции не
+    подставляются. Функции обрабатываются от вызываемых к вызывающим,
+    поэтому тело подставляется уже с развёрнутыми вызовами внутри.
+
+    Аргумент подставляется на место параметра как есть, если это литерал
+    или локальная переменная (вызовы её не меняют), либо если он без
+    побочных эффектов, используется в теле не больше раза, а ни тело, ни
+    следующие аргументы эффектов не имеют -- тогда порядок вычисления не
+    важен. Остальные аргументы по порядку сохраняются во временных
+    переменных (InlineExpansion). Неиспользуемый аргумент без эффектов не
+    вычисляется.
+    """
+
+    def __init__(self, max_size: int = MAX_SIZE):
+        self.max_size = max_size
+        self.inlined = 0  # подставленных вызовов
+        self.functions: List[str] = []  # функции, подставленные хотя бы раз
+        self._templates: Dict[int, FunctionDeclaration] = {}
+        self._by_name: Dict[str, FunctionDeclaration] = {}
+        self._graph: Optional[CallGraph] = None
+        self._counter = 0
+
+    def inline(self, program: Program, resolve_names: bool = True) -> Program:
+        PurityAnalyzer().analyze(program, resolve_names=resolve_names)
+        # Граф хранит исходные вызовы, поэтому их id не достанутся копиям
+        graph = self._graph = CallGraph.of(program)
+        self._by_name = {f.name: f for f in graph.functions if graph.parent(f) is None}
+        bound = self._bound_names(program)
+
+        # sccs -- от вызываемых к вызывающим
+        for scc in graph.sccs:
+            function = scc[0]
+            if len(scc) != 1 or not self._is_candidate(function, bound):
+                continue
+            statement = function.body.statements[0]
+            statement.value = transform(statement.value, self._expand)
+            if self._size(statement.value) <= self.max_size:
+                self._templates[id(function)] = function
+
+        if self._templates:
+            transform(program, self._expand)
+        CallGraph.invalidate(program)
+        return program
+
+    # ---- ВЫБОР ФУНКЦИЙ ----
+    def _is_candidate(self, function: FunctionDeclaration, bound: Set[str]) -> bool:
+        statements = function.body.statements
+        if len(statements) != 1 or not isinstance(statements[0], ReturnStatement) \
+                or statements[0].value is None:
+            return False
+        graph = self._graph
+        if graph.parent(function) is not None or graph.is_recursive(function) \
+                or function.memoize is not None:
+            return False
+        parameters = {p.name for p in function.parameters}
+        if len(parameters) != len(function.parameters):
+            return False
+        value = statements[0].value
+        call_names = set()
+        for node in walk(value):
+            if is_fstring(node):
+                return False
+            if isinstance(node, FunctionCall):
+                call_names.add(id(node.name))
+                # Вызываемое имя не должно оказаться переменной в месте подстановки
+                if node.name.name in parameters or node.name.name in bound:
+                    return False
+            elif isinstance(node, Identifier) and id(node) not in call_names \
+                    and node.name not in parameters:
+                return False
+        return self._size(value) <= self.max_size
+
+    def _bound_names(self, program: Program) -> Set[str]:
+        """Имена параметров, переменных и вложенных функций программы --
+        в месте подстановки они могут затенить функцию верхнего уровня"""
+        names = set()
+        for node in walk(program):
+            if isinstance(node, FunctionDeclaration):
+                if self._graph.parent(node) is not None:
+                    names.add(node.name)
+                names.update(p.name for p in node.parameters)
+            elif isinstance(node, Assignment):
+                names.add(node.target.name)
+            elif isinstance(node, ForLoop):
+                names.add(node.variable.name)
+        return names
+
+    @staticmethod
+    def _size(expression: Node) -> int:
+        return sum(1 for _ in walk(expression))
+
+    # ---- ПОДСТАНОВКА ----
+    def _expand(self, node: Node) -> Optional[Node]:
+        if not isinstance(node, FunctionCall):
+            return None
+        function = self._graph.target(node)
+        if function is None or id(function) not in self._templates \
+                or len(node.arguments) != len(function.parameters):
+            return None
+        self.inlined += 1
+        if function.name not in self.functions:
+            self.functions.append(function.name)
+        return self._substitute(function, node)
+
+    def _substitute(self, function: FunctionDeclaration, call: FunctionCall) -> Node:
+        template = function.body.statements[0].value
+        uses = {p.name: 0 for p in function.parameters}
+        call_names = set()
+        for node in walk(template):
+            if isinstance(node, FunctionCall):
+                call_names.add(id(node.name))
+            elif isinstance(node, Identifier) and id(node) not in call_names:
+                uses[node.name] += 1
+
+        pure_body = self._effect_free(template)
+        effects = [not self._effect_free(a) for a in call.arguments]
+        last_effect = max((i for i, e in enumerate(effects) if e), default=-1)
+        mapping: Dict[str, Node] = {}
+        temporaries: List[Temporary] = []
+        values: List[Node] = []
+        for i, (parameter, argument) in enumerate(zip(function.parameters, call.arguments)):
+            count = uses[parameter.name]
+            if self._is_stable(argument):
+                mapping[parameter.name] = argument
+            elif not effects[i] and count == 0:
+                continue
+            elif not effects[i] and count == 1 and pure_body and i > last_effect:
+                mapping[parameter.name] = argument
+            else:
+                temporary = self._temporary(parameter.name)
+                temporaries.append(temporary)
+                values.append(argument)
+                mapping[parameter.name] = temporary
+
+        value = self._clone(template, mapping, {})
+        if not temporaries:
+            return value
+        return InlineExpansion(temporaries, values, value, call.line, call.column)
+
+    def _clone(self, node: Node, mapping: Dict[str, Node], renames: Dict[str, str]) -> Node:
+        """Копия шаблона: параметры заменяются аргументами, временные
+        переменные вложенных подстановок получают новые имена"""
+        if isinstance(node, Identifier) and node.name in mapping:
+            argument = mapping[node.name]
+            if isinstance(argument, Temporary):
+                return Temporary(argument.name, argument.line, argument.column)
+            if isinstance(argument, (Identifier, Literal)):
+                return copy.copy(argument)
+            return argument  # используется в теле один раз
+        if isinstance(node, Temporary):
+            if node.name not in renames:
+                renames[node.name] = self._temporary(node.name.split('$')[0]).name
+            return Temporary(renames[node.name], node.line, node.column)
+        clone = copy.copy(node)
+        if isinstance(node, FunctionCall):
+            clone.name = copy.copy(node.name)
+            clone.arguments = [self._clone(a, mapping, renames) for a in node.arguments]
+            return clone
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, Node):
+                setattr(clone, field, self._clone(value, mapping, renames))
+            elif isinstance(value, list):
+                setattr(clone, field, [self._clone(v, mapping, renames) if isinstance(v, Node) else v
+                                       for v in value])
+        return clone
+
+    def _temporary(self, name: str) -> Temporary:
+        self._counter += 1
+        return Temporary(f"{name}${self._counter}")
+
+    @staticmethod
+    def _is_stable(argument: Node) -> bool:
+        """Литерал или локальная переменная: значение не изменится до подстановки"""
+        if isinstance(argument, Literal):
+            return not is_fstring(argument)
+        return (isinstance(argument, Identifier) and argument.binding is not None
+                and argument.binding.key[0] != 0)
+
+    def _effect_free(self, expression: Node) -> bool:
+        """Выражение не меняет состояния (временные переменные подстановок не в счёт)"""
+        for node in walk(expression):
+            if is_fstring(node):
+                return False
+            if isinstance(node, FunctionCall):
+                function = self._graph.target(node) or self._by_name.get(node.name.name)
+                if function is not None:
+                    if function.purity != Purity.PURE:
+                        return False
+                elif BUILTIN_PURITY.get(node.name.name) != Purity.PURE:
+                    return False
+        return True
@@ -0,0 +1,316 @@
+from typing import Dict, List, Optional, Set, Tuple
+from ..parser.ast_nodes import *
+from ..parser.walker import walk, POST_ORDER
+from ..parser.fstrings import is_fstring
+from ..semantic.call_graph import CallGraph
+from ..semantic.purity import PurityAnalyzer, Purity, BUILTIN_PURITY
+from .transform import transform, clone
+
+_LOOPS = (WhileLoop, ForLoop)
+_JUMPS = (BreakStatement, ContinueStatement, ReturnStatement)
+
+
+def _is_function(node: Node) -> bool:
+    return isinstance(node, FunctionDeclaration)
+
+
+class _LoopState:
+    """Что может меняться между итерациями цикла"""
+
+    def __init__(self, assigned: Set[str], temporaries: Set[str], changes_state: bool):
+        self.assigned = assigned          # имена, которым присваивают в цикле
+        self.temporaries = temporaries    # временные переменные, объявленные в цикле
+        self.changes_state = changes_state  # вызовы, которые могут менять переменные и списки
+
+
+class LoopInvariantMotion:
+    """Вынос инвариантов циклов while и for в const перед циклом.
+
+    Инвариант -- выражение без побочных эффектов, операнды которого цикл не
+    меняет: имена, которым в цикле не присваивают, литералы и вызовы
+    чистых функций (PurityAnalyzer) от инвариантов. Если цикл вызывает
+    функции, способные менять состояние, выносятся только выражения без
+    вызовов над локальными переменными. Выносятся наибольшие инварианты
+    с вызовом или хотя бы двумя операциями (a + b дешевле чтения const не
+    станет).
+
+    Выражение выносится, только если цикл вычислил бы его в первой
+    итерации: условие while, а в теле -- условия и значения операторов до
+    первого, содержащего break, continue или return (правый операнд
+    and/or и вложенные блоки не в счёт). Условие while вычисляется всегда,
+    его инварианты объявляются прямо перед циклом. Тело может не
+    выполниться ни разу, поэтому его инварианты объявляются под проверкой
+    того же условия: if (условие) { const ...; while ... } -- для while с
+    условием без эффектов, for по range с постоянным шагом (start < stop)
+    и for по переменной (len(x) > 0). Для остальных циклов тело не
+    трогается.
+
+    Внутренние циклы обрабатываются раньше внешних: объявления,
+    вынесенные из внутреннего цикла, могут затем покинуть и внешний.
+    """
+
+    def __init__(self):
+        self.hoisted = 0  # вынесенных выражений (объявление, покинувшее и внешний цикл, -- одно)
+        self.guarded = 0  # циклов, обёрнутых проверкой
+        self._graph: Optional[CallGraph] = None
+        self._bound: Set[str] = set()
+        self._captured: Set[Tuple[int, int]] = set()
+        self._counter = 0
+        self._guards: Set[int] = set()  # id проверок, уже добавленных перед циклами
+
+    def hoist(self, program: Program, resolve_names: bool = True) -> Program:
+        PurityAnalyzer().analyze(program, resolve_names=resolve_names)
+        self._graph = CallGraph.of(program)
+        self._bound = self._assigned_names(program)
+        for function in self._graph.functions:
+            self._bound.update(p.name for p in function.parameters)
+        # Локальные переменные, которым присваивают вложенные функции
+        self._captured = {n.target.binding.key
+                          for function in self._graph.functions
+                          if self._graph.parent(function) is not None
+                          for n in walk(function.body)
+                          if isinstance(n, Assignment) and n.target.binding is not None}
+
+        # Блок обходится после вложенных: внутренние циклы -- раньше внешних
+        for node in walk(program, POST_ORDER):
+            if isinstance(node, (Program, Block)) and any(isinstance(s, _LOOPS) for s in node.statements):
+                statements = []
+                for statement in node.statements:
+                    if isinstance(statement, _LOOPS):
+                        statements.extend(self._hoist_loop(statement))
+                    else:
+                        statements.append(statement)
+                node.statements = statements
+        CallGraph.invalidate(program)
+        return program
+
+    # ---- ОДИН ЦИКЛ ----
+    def _hoist_loop(self, loop: Node) -> List[Node]:
+        before: List[TemporaryDeclaration] = []  # вычисляются всегда
+        guarded: List[TemporaryDeclaration] = []  # только если тело выполнится
+        state = self._loop_state(loop)
+        replacements: Dict[int, Temporary] = {}
+
+        if isinstance(loop, WhileLoop):
+            info = self._invariants(loop, state)
+            for target in self._targets(loop.condition, info):
+                before.append(self._declare(target, replacements))
+            # Проверка перед циклом повторяет уже изменённое условие
+            loop.condition = transform(loop.condition, lambda n: replacements.get(id(n)))
+
+        guard = self._guard(loop)
+        if guard is not None:
+            body = loop.body.statements
+            prefix = self._certain_prefix(body)
+            # Объявления в теле (от внутренних циклов) с инвариантным значением
+            # выносятся целиком; их имена после этого тоже инвариантны
+            moved: List[TemporaryDeclaration] = []
+            while True:
+                info = self._invariants(loop, state)
+                movable = [s for s in prefix if isinstance(s, TemporaryDeclaration)
+                           and s not in moved and info[id(s.value)][0]]
+                if not movable:
+                    break
+                moved.extend(movable)
+                state.temporaries.difference_update(s.temporary.name for s in movable)
+            for statement in prefix:
+                if statement in moved:
+                    guarded.append(statement)
+                    continue
+                for root in self._certain_expressions(statement):
+                    for target in self._targets(root, info):
+                        guarded.append(self._declare(target, replacements))
+            if moved:
+                loop.body.statements = [s for s in body if s not in moved]
+
+        if replacements:
+            transform(loop, lambda n: replacements.get(id(n)))
+        if not guarded:
+            return before + [loop]
+        self.guarded += 1
+        self._guards.add(id(guard))
+        wrapper = IfStatement(guard, Block(guarded + [loop], loop.line, loop.column),
+                              None, loop.line, loop.column)
+        return before + [wrapper]
+
+    def _declare(self, expression: Node, replacements: Dict[int, Temporary]) -> TemporaryDeclaration:
+        self._counter += 1
+        self.hoisted += 1
+        temporary = Temporary(f"$inv{self._counter}", expression.line, expression.column)
+        replacements[id(expression)] = temporary
+        return TemporaryDeclaration(Temporary(temporary.name), expression,
+                                    expression.line, expression.column)
+
+    def _loop_state(self, loop: Node) -> _LoopState:
+        assigned, temporaries = set(), set()
+        changes_state = False
+        for node in walk(loop, prune=_is_function):
+            if isinstance(node, Assignment):
+                assigned.add(node.target.name)
+            elif isinstance(node, ForLoop):
+                assigned.add(node.variable.name)
+            elif isinstance(node, InlineExpansion):
+                temporaries.update(t.name for t in node.temporaries)
+            elif isinstance(node, TemporaryDeclaration):
+                temporaries.add(node.temporary.name)
+            elif isinstance(node, FunctionCall) and not changes_state:
+                function = self._graph.target(node)
+                if function is not None:
+                    changes_state = function.purity == Purity.IMPURE
+                else:
+                    # print и input только вводят и выводят
+                    changes_state = node.name.name not in BUILTIN_PURITY \
+                        or node.name.name in self._bound
+        return _LoopState(assigned, temporaries, changes_state)
+
+    # ---- ИНВАРИАНТЫ ----
+    def _invariants(self, loop: Node, state: _LoopState) -> Dict[int, Tuple[bool, bool, int]]:
+        """id узла -> (инвариант, содержит вызов, число операций), снизу вверх"""
+        info: Dict[int, Tuple[bool, bool, int]] = {}
+        for node in walk(loop, POST_ORDER, prune=_is_function):
+            if isinstance(node, Literal):
+                invariant = not is_fstring(node) and not isinstance(node.value, list)
+                info[id(node)] = (invariant, False, 0)
+            elif isinstance(node, Identifier):
+                info[id(node)] = (self._is_invariant_name(node, state), False, 0)
+            elif isinstance(node, Temporary):
+                info[id(node)] = (node.name not in state.temporaries, False, 0)
+            elif isinstance(node, (BinaryOperation, UnaryOperation)):
+                children = [info[id(c)] for c in (getattr(node, f) for f in node._fields)]
+                info[id(node)] = (all(c[0] for c in children), any(c[1] for c in children),
+                                  sum(c[2] for c in children) + 1)
+            elif isinstance(node, FunctionCall):
+                arguments = [info[id(a)] for a in node.arguments]
+                invariant = (not state.changes_state and self._is_pure_call(node)
+                             and all(a[0] for a in arguments))
+                info[id(node)] = (invariant, True, sum(a[2] for a in arguments) + 1)
+            else:
+                info[id(node)] = (False, False, 0)
+        return info
+
+    def _is_invariant_name(self, identifier: Identifier, state: _LoopState) -> bool:
+        if identifier.name in state.assigned:
+            return False
+        if not state.changes_state:
+            return True
+        # Вызываемые функции могут присвоить переменной модуля или замыкания
+        binding = identifier.binding
+        return binding is not None and binding.key[0] != 0 and binding.key not in self._captured
+
+    def _is_pure_call(self, call: FunctionCall) -> bool:
+        name = call.name.name
+        if name == 'range':
+            return False  # range(...) во вложенном for станет счётным циклом
+        function = self._graph.target(call)
+        if function is not None:
+            return function.purity == Purity.PURE
+        return name not in self._bound and BUILTIN_PURITY.get(name) == Purity.PURE
+
+    @staticmethod
+    def _targets(root: Node, info: Dict[int, Tuple[bool, bool, int]]) -> List[Node]:
+        """Наибольшие инварианты выражения, которые стоит выносить,
+        кроме вычисляемых не всегда (правый операнд and/or)"""
+        found = []
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            invariant, has_call, operations = info[id(node)]
+            if invariant and (has_call or operations >= 2):
+                found.append(node)
+            elif isinstance(node, BinaryOperation):
+                if node.operator not in ('and', 'or'):
+                    stack.append(node.right)
+                stack.append(node.left)
+            elif isinstance(node, UnaryOperation):
+                stack.append(node.operand)
+            elif isinstance(node, FunctionCall):
+                stack.extend(reversed(node.arguments))
+            elif isinstance(node, InlineExpansion):
+                stack.extend(reversed(node.arguments))
+        return found
+
+    # ---- ПЕРВАЯ ИТЕРАЦИЯ ----
+    @staticmethod
+    def _certain_prefix(statements: List[Node]) -> List[Node]:
+        """Операторы тела до первого, после которого итерация может прерваться"""
+        prefix = []
+        for statement in statements:
+            prefix.append(statement)
+            if any(isinstance(n, _JUMPS) for n in walk(statement, prune=_is_function)):
+                break
+        return prefix
+
+    def _certain_expressions(self, statement: Node) -> List[Node]:
+        """Выражения оператора, которые вычисляются при его выполнении
+        (значение мёртвого присваивания не генерируется вовсе)"""
+        if isinstance(statement, Assignment) and statement.dead_store:
+            return []
+        if isinstance(statement, IfStatement) and id(statement.condition) in self._guards:
+            return []  # проверка внутреннего цикла и так вычисляется один раз
+        if isinstance(statement, (Assignment, ReturnStatement, VariableDeclaration,
+                                  TemporaryDeclaration)):
+            return [statement.value] if statement.value is not None else []
+        if isinstance(statement, ExpressionStatement):
+            return [statement.expression]
+        if isinstance(statement, (IfStatement, WhileLoop)):
+            return [statement.condition]
+        if isinstance(statement, ForLoop):
+            return [statement.iterable]
+        return []
+
+    # ---- ПРОВЕРКА ПЕРЕД ЦИКЛОМ ----
+    def _guard(self, loop: Node) -> Optional[Node]:
+        """Условие, истинное, если тело выполнится хотя бы раз; None -- не выразить"""
+        if isinstance(loop, WhileLoop):
+            return clone(loop.condition) if self._effect_free(loop.condition) else None
+        iterable = loop.iterable
+        line, column = loop.line, loop.column
+        if isinstance(iterable, Identifier):
+            if 'len' in self._bound or any(f.name == 'len' for f in self._graph.functions):
+                return None
+            length = FunctionCall(Identifier('len', line, column), [clone(iterable)], line, column)
+            return BinaryOperation(length, '>', Literal(0, DataType.INT, line, column), line, column)
+        if not (isinstance(iterable, FunctionCall) and iterable.name.name == 'range'
+                and self._graph.target(iterable) is None and 'range' not in self._bound
+                and 1 <= len(iterable.arguments) <= 3
+                and all(self._effect_free(a) for a in iterable.arguments)):
+            return None
+        arguments = iterable.arguments
+        step = self._int_constant(arguments[2]) if len(arguments) == 3 else 1
+        if not step:
+            return None
+        if len(arguments) == 1:
+            start, stop = Literal(0, DataType.INT, line, column), clone(arguments[0])
+        else:
+            start, stop = clone(arguments[0]), clone(arguments[1])
+        return BinaryOperation(start, '<' if step > 0 else '>', stop, line, column)
+
+    @staticmethod
+    def _int_constant(node: Node) -> Optional[int]:
+        sign = 1
+        if isinstance(node, UnaryOperation) and node.operator in ('-', '+'):
+            sign = -1 if node.operator == '-' else 1
+            node = node.operand
+        if isinstance(node, Literal) and type(node.value) is int:
+            return sign * node.value
+        return None
+
+    def _effect_free(self, expression: Node) -> bool:
+        """Повторное вычисление ничего не меняет (временные переменные не в счёт)"""
+        for node in walk(expression):
+            if is_fstring(node):
+                return False
+            if isinstance(node, FunctionCall) and not self._is_pure_call(node):
+                if node.name.name != 'range' or self._graph.target(node) is not None:
+                    return False
+        return True
+
+    @staticmethod
+    def _assigned_names(program: Program) -> Set[str]:
+        names = set()
+        for node in walk(program):
+            if isinstance(node, Assignment):
+                names.add(node.target.name)
+            elif isinstance(node, ForLoop):
+                names.add(node.variable.name)
+        return names
@@ -0,0 +1,63 @@
+import re
+from typing import Dict, List, Optional
+from ..parser.ast_nodes import *
+from ..semantic.call_graph import CallGraph
+from ..semantic.purity import PurityAnalyzer, Purity
+
+# "# pyjs: memoize" или "# pyjs: memoize(1000)" -- с границей LRU
+MEMOIZE_DIRECTIVE = re.compile(r'#\s*pyjs:\s*memoize(?:\s*\(\s*(\d+)\s*\))?\s*$')
+
+
+class Memoizer:
+    """Выбор функций, результаты которых кэшируются (Map в pyMemoize).
+
+    Кэшировать можно только чистые функции (PurityAnalyzer): результат
+    зависит лишь от аргументов. С all_recursive кэшируются все чистые
+    рекурсивные функции (прямая или взаимная рекурсия -- там повторные
+    вызовы с теми же аргументами), без него -- только отмеченные
+    комментарием `# pyjs: memoize` в строке def или строкой выше.
+    max_size ограничивает кэш (LRU), 0 или None -- без ограничения;
+    граница в комментарии важнее общей.
+
+    Результат -- FunctionDeclaration.memoize: None (не кэшировать),
+    0 (без ограничения) или размер кэша.
+    """
+
+    def __init__(self, all_recursive: bool = False, max_size: Optional[int] = None):
+        self.all_recursive = all_recursive
+        self.max_size = max_size or 0
+        self.memoized: List[str] = []
+        self.rejected: Dict[str, List[str]] = {}  # отмеченные, но не чистые: имя -> причины
+
+    def mark(self, program: Program) -> Program:
+        directives = self._directives(getattr(program, 'source', None) or "")
+        graph = CallGraph.of(program)
+        candidates = [f for f in graph.functions
+                      if f.line in directives or (self.all_recursive and graph.is_recursive(f))]
+        if not candidates:
+            return program
+
+        PurityAnalyzer().analyze(program, resolve_names=True)
+        for function in candidates:
+            if function.purity != Purity.PURE:
+                if function.line in directives:
+                    self.rejected[function.name] = function.purity_reasons
+                continue
+            size = directives.get(function.line)
+            function.memoize = size if size is not None else self.max_size
+            self.memoized.append(function.name)
+        return program
+
+    @staticmethod
+    def _directives(source: str) -> Dict[int, Optional[int]]:
+        """Номер строки def -> размер кэша из директивы (None -- общий).
+        Директива в отдельной строке относится к следующей строке"""
+        directives = {}
+        for number, line in enumerate(source.splitlines(), 1):
+            if '#' not in line:
+                continue
+            match = MEMOIZE_DIRECTIVE.search(line)
+            if match:
+                target = number + 1 if line.lstrip().startswith('#') else number
+                directives[target] = int(match.group(1)) if match.group(1) else None
+        return directives
@@ -0,0 +1,52 @@
+from typing import List
+from ..parser.ast_nodes import *
+from ..parser.walker import walk
+from ..semantic.call_graph import CallGraph
+
+
+class TailCallEliminator:
+    """Замена хвостовой саморекурсии циклом.
+
+    return f(...) внутри f -- хвостовой вызов, где бы ни стоял return
+    (в том числе во вложенных if/else и циклах). Такие операторы
+    помечаются tail_call, а функция -- tail_recursive: генератор выводит
+    тело внутри `tail: while (true) { ... }`, а хвостовой вызов -- как
+    присваивание параметрам и `continue tail;`. Стек не растёт, поэтому
+    глубокая рекурсия с накопителем не переполняет его.
+
+    Остальные самовызовы (return n * f(n - 1)) остаются рекурсией.
+    Функции с вложенными функциями не преобразуются: замыкание могло
+    захватить параметр, а в цикле он меняется на месте.
+    """
+
+    def __init__(self):
+        self.functions: List[str] = []
+        self.tail_calls = 0
+
+    def eliminate(self, program: Program) -> Program:
+        graph = CallGraph.of(program)
+        for function in graph.functions:
+            if not graph.is_self_recursive(function):
+                continue
+            nested = False
+            returns = []
+            for node in walk(function.body, prune=lambda n: isinstance(n, FunctionDeclaration)):
+                if isinstance(node, FunctionDeclaration):
+                    nested = True
+                    break
+                if isinstance(node, ReturnStatement) and self._is_self_call(node.value, function, graph):
+                    returns.append(node)
+            if nested or not returns:
+                continue
+            for statement in returns:
+                statement.tail_call = True
+            function.tail_recursive = True
+            self.functions.append(function.name)
+            self.tail_calls += len(returns)
+        return program
+
+    @staticmethod
+    def _is_self_call(value: Node, function: FunctionDeclaration, graph: CallGraph) -> bool:
+        # При другом числе аргументов Python бросит TypeError -- оставляем вызов
+        return (isinstance(value, FunctionCall) and graph.target(value) is function
+                and len(value.arguments) == len(function.parameters))
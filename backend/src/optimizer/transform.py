@@ -0,0 +1,64 @@
+import copy
+from typing import Callable, Dict, Optional, Tuple
+from ..parser.ast_nodes import Node
+from ..parser.walker import walk, POST_ORDER
+
+
+def replace_children(node: Node, replacements: Dict[int, Tuple[Node, Node]]):
+    """Заменяет прямых потомков node: id(старый узел) -> (старый, новый).
+
+    Старый узел хранится в словаре, чтобы его id не достался новому объекту,
+    пока замена не выполнена. Вложенные списки (литералы списков)
+    обрабатываются без рекурсии.
+    """
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if isinstance(value, Node):
+            replacement = replacements.pop(id(value), None)
+            if replacement is not None:
+                setattr(node, field, replacement[1])
+        elif isinstance(value, list):
+            stack = [value]
+            while stack:
+                items = stack.pop()
+                for i, item in enumerate(items):
+                    if isinstance(item, Node):
+                        replacement = replacements.pop(id(item), None)
+                        if replacement is not None:
+                            items[i] = replacement[1]
+                    elif isinstance(item, list):
+                        stack.append(item)
+
+
+def transform(root: Node, rewrite: Callable[[Node], Optional[Node]]) -> Node:
+    """Переписывает дерево снизу вверх без рекурсии.
+
+    rewrite получает узел, потомки которого уже переписаны, и возвращает
+    узел-замену или None (оставить как есть). Возвращает новый корень.
+    """
+    replacements: Dict[int, Tuple[Node, Node]] = {}
+    for node in walk(root, POST_ORDER):
+        if replacements:
+            replace_children(node, replacements)
+        new = rewrite(node)
+        if new is not None and new is not node:
+            replacements[id(node)] = (node, new)
+    replacement = replacements.get(id(root))
+    return replacement[1] if replacement is not None else root
+
+
+def clone(root: Node) -> Node:
+    """Копия поддерева без рекурсии. Разметка анализаторов (binding и т.п.)
+    общая с оригиналом; значения литералов-списков не копируются."""
+    copies: Dict[int, Node] = {}
+    for node in walk(root, POST_ORDER):
+        new = copy.copy(node)
+        for field in node._fields:
+            value = getattr(node, field, None)
+            if isinstance(value, Node):
+                setattr(new, field, copies.pop(id(value)))
+            elif isinstance(value, list):
+                setattr(new, field, [copies.pop(id(item)) if isinstance(item, Node) else item
+                                     for item in value])
+        copies[id(node)] = new
+    return copies[id(root)]
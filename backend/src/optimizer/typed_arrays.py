@@ -0,0 +1,240 @@
+from typing import Dict, List, Optional, Set, Tuple
+from ..parser.ast_nodes import *
+from ..parser.walker import walk, iter_child_nodes
+from ..parser.fstrings import is_fstring, fstring_expressions
+from ..semantic.call_graph import CallGraph
+from ..semantic.purity import PurityAnalyzer
+from ..semantic.type_inference import TypeInferencer
+
+INT32_MIN, INT32_MAX = -2 ** 31, 2 ** 31 - 1
+MAX_SAFE_INTEGER = 2 ** 53  # больше -- Float64Array округлит
+
+
+def typed_array_kind(literal: Literal) -> Optional[str]:
+    """Int32Array для целых в пределах int32, Float64Array для чисел с
+    плавающей точкой (и целых до 2**53), иначе None -- обычный массив"""
+    if not isinstance(literal.value, list) or not literal.value:
+        return None
+    integers = True
+    for item in literal.value:
+        sign = 1
+        if isinstance(item, UnaryOperation) and item.operator in ('-', '+'):
+            sign = -1 if item.operator == '-' else 1
+            item = item.operand
+        if isinstance(item, Literal):
+            item = item.value
+        if type(item) is int:
+            if abs(item) > MAX_SAFE_INTEGER:
+                return None
+            if not INT32_MIN <= sign * item <= INT32_MAX:
+                integers = False
+        elif type(item) is float:
+            integers = False
+        else:
+            return None  # bool, строка, вложенный список, выражение
+    return 'Int32Array' if integers else 'Float64Array'
+
+
+class TypedArrayMarker:
+    """Выбор литералов списков, которые генерируются типизированными
+    массивами (new Float64Array([...]), new Int32Array([...])).
+
+    Литерал подходит, если все элементы -- числовые константы
+    (typed_array_kind), а сам список только читается: в этом подмножестве
+    Python список меняет лишь вызываемая функция, а типизированный массив
+    ведёт себя как обычный только при обходе for и в len(). Поэтому
+    литерал должен стоять в одном из мест:
+
+    - итерируемое цикла for, аргумент len();
+    - значение присваивания переменной или аргумент функции модуля.
+
+    Значения переходят из аргументов в параметры, поэтому переменные и
+    параметры, связанные вызовами, образуют группу, и решение принимается
+    для группы целиком: параметр не должен получать в одном месте вызова
+    типизированный массив, а в другом -- обычный. Группа подходит, если
+    каждое значение её переменных -- числовой литерал списка или другая
+    переменная группы, каждое чтение стоит в одном из мест выше, по выводу
+    типов (semantic.TypeInferencer) это всегда список чисел, а по анализу
+    чистоты (semantic.PurityAnalyzer) функции не изменяют свои параметры из
+    группы. Все литералы группы получают один конструктор: Float64Array,
+    если он нужен хоть одному из них.
+
+    Во всех остальных случаях (print, операции, возврат, f-строки,
+    передача неизвестной функции, смешение с другими типами) остаётся
+    обычный массив; для переменных причина записывается в fallbacks.
+
+    Результат -- Literal.typed_array: имя конструктора или None.
+    """
+
+    def __init__(self):
+        self.typed = 0  # литералов, ставших типизированными массивами
+        self.fallbacks: Dict[str, str] = {}  # числовой список -> почему обычный массив
+        self._graph: Optional[CallGraph] = None
+        self._parents: Dict[int, Node] = {}
+        self._names: Dict[Tuple[int, int], str] = {}
+        self._reads: Dict[Tuple[int, int], List[Identifier]] = {}
+        self._writes: Dict[Tuple[int, int], List[Node]] = {}  # присваивания, циклы, аргументы
+        self._fstring_names: Set[str] = set()
+        self._mutated: Set[Tuple[int, int]] = set()
+        self._groups: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def mark(self, program: Program, resolve_names: bool = True) -> Program:
+        if resolve_names:
+            from ..semantic.analyzer import SemanticAnalyzer
+            SemanticAnalyzer().analyze(program)
+        self._graph = CallGraph.of(program)
+        literals = self._index(program)
+        candidates = [l for l in literals if typed_array_kind(l) is not None]
+        if not candidates:
+            return program
+
+        TypeInferencer().infer(program, resolve_names=False)
+        purity = PurityAnalyzer()
+        purity.analyze(program, resolve_names=False)
+        for function in self._graph.functions:
+            for index in purity.mutated.get(id(function), ()):
+                if function.parameters[index].binding is not None:
+                    self._mutated.add(function.parameters[index].binding.key)
+
+        # Проблемы переменных и первая проблема каждой группы
+        problems: Dict[Tuple[int, int], str] = {}
+        failed: Dict[Tuple[int, int], Tuple[int, int]] = {}  # группа -> переменная с проблемой
+        for key in self._names:
+            problem = self._variable_problem(key)
+            if problem is not None:
+                problems[key] = problem
+                failed.setdefault(self._group(key), key)
+
+        targets = [(literal, self._position(literal)) for literal in candidates]
+        kinds: Dict[Tuple[int, int], str] = {}
+        for literal, (problem, key) in targets:
+            if problem is None and key is not None and typed_array_kind(literal) == 'Float64Array':
+                kinds[self._group(key)] = 'Float64Array'
+
+        for literal, (problem, key) in targets:
+            if problem is None and key is not None and self._group(key) in failed:
+                problem = problems.get(key) or self._group_problem(key, failed[self._group(key)])
+            if problem is None:
+                kind = typed_array_kind(literal)
+                literal.typed_array = kinds.get(self._group(key), kind) if key is not None else kind
+                self.typed += 1
+                continue
+            parent = self._parents.get(id(literal))
+            if isinstance(parent, Assignment) and parent.target.binding is not None:
+                self.fallbacks.setdefault(parent.target.name, problem)
+        return program
+
+    def _index(self, program: Program) -> List[Literal]:
+        literals = []
+        for node in walk(program):
+            for child in iter_child_nodes(node):
+                self._parents[id(child)] = node
+            if isinstance(node, Literal):
+                if isinstance(node.value, list):
+                    literals.append(node)
+                elif is_fstring(node):
+                    for expression in fstring_expressions(node):
+                        self._fstring_names.update(n.name for n in walk(expression)
+                                                   if isinstance(n, Identifier))
+            elif isinstance(node, Assignment):
+                self._write(node.target, node)
+            elif isinstance(node, ForLoop):
+                self._write(node.variable, node)
+            elif isinstance(node, FunctionDeclaration):
+                for parameter in node.parameters:
+                    if parameter.binding is not None:
+                        self._names.setdefault(parameter.binding.key, parameter.name)
+                        self._reads.setdefault(parameter.binding.key, [])
+            elif isinstance(node, FunctionCall):
+                # Аргумент -- значение параметра; имя-аргумент объединяет группы
+                function = self._graph.target(node)
+                if function is not None:
+                    for parameter, argument in zip(function.parameters, node.arguments):
+                        self._write(parameter, argument)
+                        if isinstance(argument, Identifier) and argument.binding is not None \
+                                and parameter.binding is not None:
+                            self._union(argument.binding.key, parameter.binding.key)
+            elif isinstance(node, Identifier) and node.binding is not None \
+                    and not node.binding.is_definition:
+                parent = self._parents.get(id(node))
+                if not (isinstance(parent, Assignment) and parent.target is node) \
+                        and not (isinstance(parent, FunctionCall) and parent.name is node):
+                    self._names.setdefault(node.binding.key, node.name)
+                    self._reads.setdefault(node.binding.key, []).append(node)
+        return literals
+
+    def _write(self, target: Identifier, value: Node):
+        if target.binding is not None:
+            self._names.setdefault(target.binding.key, target.name)
+            self._writes.setdefault(target.binding.key, []).append(value)
+
+    def _group(self, key: Tuple[int, int]) -> Tuple[int, int]:
+        root = key
+        while self._groups.get(root, root) != root:
+            root = self._groups[root]
+        while key != root:
+            key, self._groups[key] = self._groups[key], root
+        return root
+
+    def _union(self, a: Tuple[int, int], b: Tuple[int, int]):
+        a, b = self._group(a), self._group(b)
+        if a != b:
+            self._groups[b] = a
+
+    def _variable_problem(self, key: Tuple[int, int]) -> Optional[str]:
+        for write in self._writes.get(key, []):
+            if isinstance(write, ForLoop):
+                return "assigned a value that is not a numeric list"
+            if isinstance(write, Assignment):
+                write = write.value
+            elif isinstance(write, Identifier) and write.binding is not None:
+                continue  # аргумент-имя: переменная той же группы
+            if not (isinstance(write, Literal) and typed_array_kind(write) is not None):
+                return "assigned a value that is not a numeric list"
+        if key in self._mutated:
+            return "may be mutated by a called function"
+        for read in self._reads.get(key, []):
+            if read.name in self._fstring_names:
+                return "used in an f-string"
+            problem, _ = self._position(read)
+            if problem is not None:
+                return problem
+            if read.inferred_type != DataType.LIST \
+                    or read.inferred_element_type not in (DataType.INT, DataType.FLOAT):
+                return "mixed with values of other types"
+        return None
+
+    def _group_problem(self, key: Tuple[int, int], failed: Tuple[int, int]) -> str:
+        """Причина для переменной без своих проблем: её значения попадают в
+        ту же группу, что и значения другой, неподходящей переменной"""
+        for read in self._reads.get(key, []):
+            parent = self._parents.get(id(read))
+            if isinstance(parent, FunctionCall) and self._graph.target(parent) is not None:
+                return f"passed to '{parent.name.name}'"
+        return f"shares values with '{self._names[failed]}'"
+
+    def _position(self, node: Node) -> Tuple[Optional[str], Optional[Tuple[int, int]]]:
+        """(проблема, переменная или параметр, куда попадает значение):
+        проблема None, если значение в этом месте только обходится,
+        измеряется или передаётся дальше"""
+        parent = self._parents.get(id(node))
+        if isinstance(parent, ForLoop) and parent.iterable is node:
+            return None, None
+        if isinstance(parent, Assignment) and parent.value is node:
+            binding = parent.target.binding
+            if binding is None or isinstance(node, Identifier):
+                # Копию имени не отслеживаем: значение ушло бы в другую группу
+                return f"assigned to '{parent.target.name}'", None
+            return None, binding.key
+        if not isinstance(parent, FunctionCall):
+            return "used outside for loops and len()", None
+        function = self._graph.target(parent)
+        name = parent.name.name
+        if function is None:
+            if name == 'len' and not any(f.name == 'len' for f in self._graph.functions):
+                return None, None
+            return f"passed to '{name}'", None
+        index = next(i for i, a in enumerate(parent.arguments) if a is node)
+        if index >= len(function.parameters) or function.parameters[index].binding is None:
+            return f"passed to '{name}'", None
+        return None, function.parameters[index].binding.key
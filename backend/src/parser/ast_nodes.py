@@ -21,6 +21,9 @@ class NodeType(Enum):
     FUNCTION_CALL = "function_call"
     BREAK_STATEMENT = "break_statement"
     CONTINUE_STATEMENT = "continue_statement"
+    TEMPORARY = "temporary"
+    INLINE_EXPANSION = "inline_expansion"
+    TEMPORARY_DECLARATION = "temporary_declaration"
 
 
 class DataType(Enum):
@@ -36,6 +39,19 @@ class DataType(Enum):
 class Node:
     """Базовый класс для всех узлов AST"""
 
+    # Имена полей, в которых лежат дочерние узлы (или списки узлов), в порядке
+    # исходного кода. Используется обходчиком из walker.py вместо __dict__.
+    _fields = ()
+
+    # Смещение конца узла в исходном тексте; заполняется парсером для листьев,
+    # для составных узлов диапазон вычисляет SpanIndex по потомкам.
+    end_offset: Optional[int] = None
+
+    # Тип выражения, выведенный semantic.type_inference.TypeInferencer
+    inferred_type: Optional[DataType] = None
+    # Для списков (inferred_type == LIST) -- объединение типов элементов
+    inferred_element_type: Optional[DataType] = None
+
     def __init__(self, node_type: NodeType, line: int, column: int):
         self.node_type = node_type
         self.line = line
@@ -51,14 +67,51 @@ class Node:
 class Program(Node):
     """Корневой узел программы"""
 
+    _fields = ('statements',)
+
     def __init__(self, statements: List[Node], line: int, column: int):
         super().__init__(NodeType.PROGRAM, line, column)
         self.statements = statements
+        self.source = None  # исходный текст, заполняется парсером
+        self._span_index = None
+        self._call_graph = None  # кэш semantic.call_graph.CallGraph
+
+    def span_index(self):
+        """Индекс диапазонов (смещение -> узел), строится один раз по требованию"""
+        if self._span_index is None:
+            from .span_index import SpanIndex
+            if self.source is None:
+                raise ValueError("Program has no source text attached")
+            self._span_index = SpanIndex(self, self.source)
+        return self._span_index
+
+    def node_at(self, offset: int) -> Optional[Node]:
+        """Самый внутренний узел, покрывающий смещение offset"""
+        return self.span_index().node_at(offset)
+
+    def nodes_in_range(self, start: int, end: int) -> List[Node]:
+        """Все узлы, пересекающиеся с диапазоном [start, end)"""
+        return self.span_index().nodes_in_range(start, end)
+
+    def apply_edit(self, start: int, old_end: int, new_text: str) -> bool:
+        """Применяет правку текста к индексу без повторного обхода дерева.
+
+        Возвращает False, если правка затрагивает границы узлов: тогда индекс
+        сбрасывается и программу нужно разобрать заново.
+        """
+        self.source = self.source[:start] + new_text + self.source[old_end:]
+        index = self._span_index
+        if index is not None and index.apply_edit(start, old_end, start + len(new_text)):
+            return True
+        self._span_index = None
+        return False
 
 
 class FunctionDeclaration(Node):
     """Объявление функции"""
 
+    _fields = ('parameters', 'body')
+
     def __init__(self, name: str, parameters: List['Identifier'],
                  body: 'Block', return_type: DataType = DataType.NONE,
                  line: int = 0, column: int = 0):
@@ -67,11 +120,18 @@ class FunctionDeclaration(Node):
         self.parameters = parameters
         self.body = body
         self.return_type = return_type
+        self.inferred_return_type = None  # заполняет TypeInferencer
+        self.purity = None  # semantic.purity.Purity, заполняет PurityAnalyzer
+        self.purity_reasons = []
+        self.tail_recursive = False  # тело -- цикл вместо хвостовой рекурсии (TailCallEliminator)
+        self.memoize = None  # размер кэша результатов, 0 -- без ограничения (Memoizer)
 
 
 class VariableDeclaration(Node):
     """Объявление переменной"""
 
+    _fields = ('value',)
+
     def __init__(self, name: str, value: Optional[Node] = None,
                  var_type: DataType = DataType.ANY, line: int = 0, column: int = 0):
         super().__init__(NodeType.VARIABLE_DECLARATION, line, column)
@@ -83,15 +143,22 @@ class VariableDeclaration(Node):
 class Assignment(Node):
     """Присваивание значения переменной"""
 
+    _fields = ('target', 'value')
+
     def __init__(self, target: 'Identifier', value: Node, line: int, column: int):
         super().__init__(NodeType.ASSIGNMENT, line, column)
         self.target = target
         self.value = value
+        # Заполняются LivenessAnalyzer
+        self.single_assignment = False  # единственное присваивание переменной (const)
+        self.dead_store = False         # значение не читается, вычисление без эффектов
 
 
 class BinaryOperation(Node):
     """Бинарная операция"""
 
+    _fields = ('left', 'right')
+
     def __init__(self, left: Node, operator: str, right: Node, line: int, column: int):
         super().__init__(NodeType.BINARY_OPERATION, line, column)
         self.left = left
@@ -102,6 +169,8 @@ class BinaryOperation(Node):
 class UnaryOperation(Node):
     """Унарная операция"""
 
+    _fields = ('operand',)
+
     def __init__(self, operator: str, operand: Node, line: int, column: int):
         super().__init__(NodeType.UNARY_OPERATION, line, column)
         self.operator = operator
@@ -111,24 +180,36 @@ class UnaryOperation(Node):
 class Identifier(Node):
     """Идентификатор (имя переменной, функции и т.д.)"""
 
+    _fields = ()
+
     def __init__(self, name: str, line: int, column: int):
         super().__init__(NodeType.IDENTIFIER, line, column)
         self.name = name
+        # Разрешённое объявление (semantic.Binding); заполняет SemanticAnalyzer
+        self.binding = None
+        # Короткое имя в минифицированном коде; заполняет codegen.minify.LocalRenamer
+        self.js_name = None
 
 
 class Literal(Node):
     """Литерал (число, строка, булево значение и т.д.)"""
 
+    _fields = ('value',)
+
     def __init__(self, value: Union[int, float, str, bool, None, list],
                  literal_type: DataType, line: int, column: int):
         super().__init__(NodeType.LITERAL, line, column)
         self.value = value
         self.literal_type = literal_type
+        # Конструктор типизированного массива для списка (optimizer.TypedArrayMarker)
+        self.typed_array = None
 
 
 class IfStatement(Node):
     """Условный оператор if"""
 
+    _fields = ('condition', 'then_branch', 'else_branch')
+
     def __init__(self, condition: Node, then_branch: 'Block',
                  else_branch: Optional['Block'] = None, line: int = 0, column: int = 0):
         super().__init__(NodeType.IF_STATEMENT, line, column)
@@ -140,6 +221,8 @@ class IfStatement(Node):
 class WhileLoop(Node):
     """Цикл while"""
 
+    _fields = ('condition', 'body')
+
     def __init__(self, condition: Node, body: 'Block', line: int, column: int):
         super().__init__(NodeType.WHILE_LOOP, line, column)
         self.condition = condition
@@ -149,6 +232,8 @@ class WhileLoop(Node):
 class ForLoop(Node):
     """Цикл for"""
 
+    _fields = ('variable', 'iterable', 'body')
+
     def __init__(self, variable: Identifier, iterable: Node,
                  body: 'Block', line: int, column: int):
         super().__init__(NodeType.FOR_LOOP, line, column)
@@ -160,6 +245,8 @@ class ForLoop(Node):
 class Block(Node):
     """Блок кода"""
 
+    _fields = ('statements',)
+
     def __init__(self, statements: List[Node], line: int, column: int):
         super().__init__(NodeType.BLOCK, line, column)
         self.statements = statements
@@ -168,6 +255,8 @@ class Block(Node):
 class ExpressionStatement(Node):
     """Выражение как оператор"""
 
+    _fields = ('expression',)
+
     def __init__(self, expression: Node, line: int, column: int):
         super().__init__(NodeType.EXPRESSION_STATEMENT, line, column)
         self.expression = expression
@@ -176,14 +265,19 @@ class ExpressionStatement(Node):
 class ReturnStatement(Node):
     """Оператор return"""
 
+    _fields = ('value',)
+
     def __init__(self, value: Optional[Node] = None, line: int = 0, column: int = 0):
         super().__init__(NodeType.RETURN_STATEMENT, line, column)
         self.value = value
+        self.tail_call = False  # самовызов, заменяемый переходом в начало цикла
 
 
 class Import(Node):
     """Импорт модуля"""
 
+    _fields = ()
+
     def __init__(self, module_name: str, line: int, column: int):
         super().__init__(NodeType.IMPORT, line, column)
         self.module_name = module_name
@@ -192,6 +286,8 @@ class Import(Node):
 class FunctionCall(Node):
     """Вызов функции"""
 
+    _fields = ('name', 'arguments')
+
     def __init__(self, name: Identifier, arguments: List[Node], line: int, column: int):
         super().__init__(NodeType.FUNCTION_CALL, line, column)
         self.name = name
@@ -201,6 +297,8 @@ class FunctionCall(Node):
 class BreakStatement(Node):
     """Оператор break"""
 
+    _fields = ()
+
     def __init__(self, line: int, column: int):
         super().__init__(NodeType.BREAK_STATEMENT, line, column)
 
@@ -208,5 +306,44 @@ class BreakStatement(Node):
 class ContinueStatement(Node):
     """Оператор continue"""
 
+    _fields = ()
+
     def __init__(self, line: int, column: int):
-        super().__init__(NodeType.CONTINUE_STATEMENT, line, column)
\ No newline at end of file
+        super().__init__(NodeType.CONTINUE_STATEMENT, line, column)
+
+
+class Temporary(Node):
+    """Временная переменная, созданная оптимизатором (имя с '$' не совпадает
+    с именами Python)"""
+
+    _fields = ()
+
+    def __init__(self, name: str, line: int = 0, column: int = 0):
+        super().__init__(NodeType.TEMPORARY, line, column)
+        self.name = name
+
+
+class InlineExpansion(Node):
+    """Подставленное тело функции (optimizer.Inliner): аргументы по порядку
+    присваиваются временным переменным, затем вычисляется value"""
+
+    _fields = ('temporaries', 'arguments', 'value')
+
+    def __init__(self, temporaries: List[Temporary], arguments: List[Node], value: Node,
+                 line: int = 0, column: int = 0):
+        super().__init__(NodeType.INLINE_EXPANSION, line, column)
+        self.temporaries = temporaries
+        self.arguments = arguments
+        self.value = value
+
+
+class TemporaryDeclaration(Node):
+    """Объявление временной переменной (const), например значения,
+    вынесенного из цикла (optimizer.LoopInvariantMotion)"""
+
+    _fields = ('value',)
+
+    def __init__(self, temporary: Temporary, value: Node, line: int = 0, column: int = 0):
+        super().__init__(NodeType.TEMPORARY_DECLARATION, line, column)
+        self.temporary = temporary
+        self.value = value
@@ -0,0 +1,61 @@
+from typing import List, Tuple
+from .ast_nodes import Node, Literal, DataType
+
+
+def is_fstring(literal: Node) -> bool:
+    """Строковый литерал с подстановками {expr} (как в Parser._is_fstring)"""
+    return (isinstance(literal, Literal) and literal.literal_type == DataType.STRING
+            and isinstance(literal.value, str) and '{' in literal.value and '}' in literal.value)
+
+
+def split_fstring(value: str) -> List[Tuple[bool, str]]:
+    """Делит f-строку на части (это_выражение, текст)"""
+    parts = []
+    i = 0
+    while i < len(value):
+        if value[i] == '{':
+            j = i + 1
+            depth = 1
+            while j < len(value) and depth > 0:
+                if value[j] == '{':
+                    depth += 1
+                elif value[j] == '}':
+                    depth -= 1
+                j += 1
+            parts.append((True, value[i + 1:j - 1]))
+            i = j
+        else:
+            j = value.find('{', i)
+            if j == -1:
+                j = len(value)
+            parts.append((False, value[i:j]))
+            i = j
+    return parts
+
+
+def fstring_expressions(literal: Literal) -> List[Node]:
+    """Разобранные выражения внутри f-строки.
+
+    Парсер хранит f-строку как строковый литерал, поэтому анализам, которым
+    важны имена и вызовы в подстановках, нужен отдельный разбор. Результат
+    кэшируется в узле. Имена в этих выражениях не разрешены анализатором
+    (binding = None), позиции отсчитываются от начала подстановки.
+    """
+    cached = getattr(literal, '_fstring_nodes', None)
+    if cached is not None:
+        return cached
+
+    from ..lexer.lexer import Lexer
+    from .parser import Parser
+
+    nodes = []
+    if is_fstring(literal):
+        for is_expression, text in split_fstring(literal.value):
+            if not is_expression or not text.strip():
+                continue
+            try:
+                nodes.append(Parser(Lexer(text)).parse_expression())
+            except Exception:
+                continue  # подстановку, которую не разобрать, анализы пропускают
+    literal._fstring_nodes = nodes
+    return nodes
@@ -4,18 +4,31 @@ from ..lexer.token_types import TokenType
 from .ast_nodes import *
 from ..exceptions import ParserError, UnexpectedTokenError, MissingTokenError
 
+# Служебные токены не входят в текстовый диапазон узлов
+_LAYOUT_TOKENS = (TokenType.NEWLINE, TokenType.INDENT, TokenType.DEDENT, TokenType.EOF)
+
 
 class Parser:
     def __init__(self, lexer: Lexer):
         self.lexer = lexer
         self.current_token = None
+        self.current_token_end = 0  # смещение конца текущего токена в исходнике
+        self.last_token_end = 0  # смещение конца последнего поглощённого значимого токена
         self.next_token()
 
     def next_token(self):
         """Получаем следующий токен"""
+        if self.current_token is not None and self.current_token.type not in _LAYOUT_TOKENS:
+            self.last_token_end = self.current_token_end
         self.current_token = self.lexer.get_next_token()
+        self.current_token_end = self.lexer.position
         return self.current_token
 
+    def _finish(self, node: Node) -> Node:
+        """Запоминаем конец узла (для индекса диапазонов в Program)"""
+        node.end_offset = self.last_token_end
+        return node
+
     def expect(self, token_type: TokenType, error_message: str = None):
         """Проверяем, что текущий токен соответствует ожидаемому"""
         if self.current_token.type != token_type:
@@ -91,10 +104,11 @@ class Parser:
                         self.peek(TokenType.NOT) or
                         self.peek(TokenType.PRINT)):  # ДОБАВЛЕНО
                     print(f"DEBUG PARSER: Parsing ExpressionStatement")  # ДОБАВЛЕНО
+                    start_token = self.current_token
                     statements.append(ExpressionStatement(
                         self.parse_expression(),
-                        self.current_token.line,
-                        self.current_token.column
+                        start_token.line,
+                        start_token.column
                     ))
                 else:
                     # Пропускаем неизвестные токены (например, оставшиеся DEDENT)
@@ -102,13 +116,15 @@ class Parser:
 
             self.skip_newlines()
 
-        return Program(statements, 1, 1)
+        program = Program(statements, 1, 1)
+        program.source = self.lexer.source_code
+        return program
 
     def parse_import(self) -> Import:
         """Разбор импорта"""
         token = self.expect(TokenType.IMPORT, "Ожидался 'import'")
         module_name = self.expect(TokenType.VARIABLE, "Ожидалось имя модуля")
-        return Import(module_name.value, token.line, token.column)
+        return self._finish(Import(module_name.value, token.line, token.column))
 
     def parse_function_declaration(self) -> FunctionDeclaration:
         """Разбор объявления функции"""
@@ -133,19 +149,13 @@ class Parser:
         parameters = []
 
         if not self.peek(TokenType.RPAREN):
-            parameters.append(Identifier(
-                self.expect(TokenType.VARIABLE, "Ожидался идентификатор параметра").value,
-                self.current_token.line,
-                self.current_token.column
-            ))
+            token = self.expect(TokenType.VARIABLE, "Ожидался идентификатор параметра")
+            parameters.append(Identifier(token.value, token.line, token.column))
 
             while self.peek(TokenType.COMMA):
                 self.next_token()  # пропускаем запятую
-                parameters.append(Identifier(
-                    self.expect(TokenType.VARIABLE, "Ожидался идентификатор параметра").value,
-                    self.current_token.line,
-                    self.current_token.column
-                ))
+                token = self.expect(TokenType.VARIABLE, "Ожидался идентификатор параметра")
+                parameters.append(Identifier(token.value, token.line, token.column))
 
         return parameters
 
@@ -204,6 +214,9 @@ class Parser:
 
         if self.peek(TokenType.RETURN):
             return self.parse_return_statement()
+        elif self.peek(TokenType.DEF):
+            # Вложенная функция
+            return self.parse_function_declaration()
         elif self.peek(TokenType.IF):
             return self.parse_if_statement()
         elif self.peek(TokenType.WHILE):
@@ -231,10 +244,11 @@ class Parser:
                     self.peek(TokenType.MINUS) or
                     self.peek(TokenType.NOT) or
                     self.peek(TokenType.PRINT)):  # ДОБАВЛЕНО: поддержка print как начала выражения
+                start_token = self.current_token
                 return ExpressionStatement(
                     self.parse_expression(),
-                    self.current_token.line,
-                    self.current_token.column
+                    start_token.line,
+                    start_token.column
                 )
             elif self.peek(TokenType.PASS):
                 # Пропускаем pass
@@ -262,17 +276,17 @@ class Parser:
         else:
             value = self.parse_expression()
 
-        return ReturnStatement(value, token.line, token.column)
+        return self._finish(ReturnStatement(value, token.line, token.column))
 
     def parse_break_statement(self) -> BreakStatement:
         """Разбор оператора break"""
         token = self.expect(TokenType.BREAK, "Ожидался 'break'")
-        return BreakStatement(token.line, token.column)
+        return self._finish(BreakStatement(token.line, token.column))
 
     def parse_continue_statement(self) -> ContinueStatement:
         """Разбор оператора continue"""
         token = self.expect(TokenType.CONTINUE, "Ожидался 'continue'")
-        return ContinueStatement(token.line, token.column)
+        return self._finish(ContinueStatement(token.line, token.column))
 
     def parse_assignment(self) -> Assignment:
         """Разбор присваивания"""
@@ -345,8 +359,9 @@ class Parser:
         return Assignment(target, value, target.line, target.column)
 
     def parse_if_statement(self) -> IfStatement:
-        """Разбор условного оператора if"""
-        token = self.expect(TokenType.IF, "Ожидался 'if'")
+        """Разбор условного оператора if (и ветки elif как вложенного if)"""
+        keyword = TokenType.ELIF if self.peek(TokenType.ELIF) else TokenType.IF
+        token = self.expect(keyword, "Ожидался 'if'")
         condition = self.parse_expression()
         self.expect(TokenType.COLON, "Ожидался ':'")
 
@@ -387,11 +402,8 @@ class Parser:
     def parse_for_loop(self) -> ForLoop:
         """Разбор цикла for"""
         token = self.expect(TokenType.FOR, "Ожидался 'for'")
-        variable = Identifier(
-            self.expect(TokenType.VARIABLE, "Ожидался идентификатор переменной").value,
-            self.current_token.line,
-            self.current_token.column
-        )
+        variable_token = self.expect(TokenType.VARIABLE, "Ожидался идентификатор переменной")
+        variable = Identifier(variable_token.value, variable_token.line, variable_token.column)
         self.expect(TokenType.IN, "Ожидался 'in'")
         iterable = self.parse_expression()
         self.expect(TokenType.COLON, "Ожидался ':'")
@@ -425,12 +437,12 @@ class Parser:
 
     def parse_logical_and(self) -> Node:
         """Логическое И"""
-        node = self.parse_comparison()
+        node = self.parse_logical_not()
 
         while self.peek(TokenType.AND):
             operator_token = self.current_token
             self.next_token()
-            right = self.parse_comparison()
+            right = self.parse_logical_not()
 
             # Используем правильное строковое представление оператора
             operator_str = operator_token.value
@@ -439,6 +451,16 @@ class Parser:
 
         return node
 
+    def parse_logical_not(self) -> Node:
+        """Логическое НЕ: слабее сравнений, как в Python (not a == b -- not (a == b))"""
+        if self.peek(TokenType.NOT):
+            operator_token = self.current_token
+            self.next_token()
+            operand = self.parse_logical_not()
+            return UnaryOperation(operator_token.value, operand,
+                                  operator_token.line, operator_token.column)
+        return self.parse_comparison()
+
     def parse_comparison(self) -> Node:
         """Операции сравнения"""
         node = self.parse_addition()
@@ -486,12 +508,12 @@ class Parser:
 
     def parse_multiplication(self) -> Node:
         """Умножение, деление, остаток от деления"""
-        node = self.parse_power()
+        node = self.parse_unary()
 
         while self.peek(TokenType.MUL) or self.peek(TokenType.DIV) or self.peek(TokenType.MOD):
             operator_token = self.current_token
             self.next_token()
-            right = self.parse_power()
+            right = self.parse_unary()
 
             # Используем правильное строковое представление оператора
             operator_str = operator_token.value
@@ -501,13 +523,14 @@ class Parser:
         return node
 
     def parse_power(self) -> Node:
-        """Возведение в степень"""
-        node = self.parse_unary()
+        """Возведение в степень: связывает сильнее унарного минуса слева
+        (-2 ** 2 == -(2 ** 2)), но показатель может быть унарным (2 ** -1)"""
+        node = self.parse_primary()
 
         if self.peek(TokenType.POW):
             operator_token = self.current_token
             self.next_token()
-            right = self.parse_power()
+            right = self.parse_unary()
 
             # Используем правильное строковое представление оператора
             operator_str = operator_token.value
@@ -517,8 +540,8 @@ class Parser:
         return node
 
     def parse_unary(self) -> Node:
-        """Унарные операции"""
-        if self.peek(TokenType.PLUS) or self.peek(TokenType.MINUS) or self.peek(TokenType.NOT):
+        """Унарные плюс и минус"""
+        if self.peek(TokenType.PLUS) or self.peek(TokenType.MINUS):
             operator_token = self.current_token
             self.next_token()
             operand = self.parse_unary()
@@ -528,12 +551,18 @@ class Parser:
             return UnaryOperation(operator_str, operand,
                                   operator_token.line, operator_token.column)
 
-        return self.parse_primary()
+        return self.parse_power()
 
     def parse_primary(self) -> Node:
         """Разбор первичных выражений"""
         token = self.current_token
 
+        # TokenType.FLOAT_NUMBER -- псевдоним TokenType.FLOAT (одинаковое значение
+        # в Enum), поэтому число отличаем от слова 'float' по тексту токена
+        if self.peek(TokenType.FLOAT_NUMBER) and token.value != 'float':
+            self.next_token()
+            return self._finish(Literal(float(token.value), DataType.FLOAT, token.line, token.column))
+
         if (self.peek(TokenType.VARIABLE) or
                 self.peek(TokenType.PRINT) or
                 self.peek(TokenType.STR) or
@@ -544,38 +573,35 @@ class Parser:
 
             # Проверяем, является ли это вызовом функции
             if self.peek(TokenType.LPAREN):
-                return self.parse_function_call(Identifier(token.value, token.line, token.column))
+                identifier = self._finish(Identifier(token.value, token.line, token.column))
+                return self._finish(self.parse_function_call(identifier))
             else:
-                return Identifier(token.value, token.line, token.column)
+                return self._finish(Identifier(token.value, token.line, token.column))
 
         elif self.peek(TokenType.INTEGER):
             self.next_token()
-            return Literal(int(token.value), DataType.INT, token.line, token.column)
-
-        elif self.peek(TokenType.FLOAT_NUMBER):
-            self.next_token()
-            return Literal(float(token.value), DataType.FLOAT, token.line, token.column)
+            return self._finish(Literal(int(token.value), DataType.INT, token.line, token.column))
 
         elif self.peek(TokenType.STRING) or self.peek(TokenType.CHAR):
             self.next_token()
 
             # Проверяем, является ли это f-строкой (содержит {})
             if self._is_fstring(token.value):
-                return self.parse_fstring(token)
+                return self._finish(self.parse_fstring(token))
             else:
-                return Literal(token.value, DataType.STRING, token.line, token.column)
+                return self._finish(Literal(token.value, DataType.STRING, token.line, token.column))
 
         elif self.peek(TokenType.TRUE):
             self.next_token()
-            return Literal(True, DataType.BOOLEAN, token.line, token.column)
+            return self._finish(Literal(True, DataType.BOOLEAN, token.line, token.column))
 
         elif self.peek(TokenType.FALSE):
             self.next_token()
-            return Literal(False, DataType.BOOLEAN, token.line, token.column)
+            return self._finish(Literal(False, DataType.BOOLEAN, token.line, token.column))
 
         elif self.peek(TokenType.NONE):
             self.next_token()
-            return Literal(None, DataType.NONE, token.line, token.column)
+            return self._finish(Literal(None, DataType.NONE, token.line, token.column))
 
         elif self.peek(TokenType.LPAREN):
             self.next_token()  # пропускаем '('
@@ -584,7 +610,7 @@ class Parser:
             return node
 
         elif self.peek(TokenType.LBRACKET):
-            return self.parse_list_literal()
+            return self._finish(self.parse_list_literal())
 
         else:
             raise UnexpectedTokenError("expression", token.type.name, token.line, token.column)
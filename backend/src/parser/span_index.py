@@ -0,0 +1,175 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
+from .ast_nodes import Node, Block, Identifier
+from .walker import iter_child_nodes
+
+
+class SpanIndex:
+    """Индекс текстовых диапазонов узлов AST для запросов редактора.
+
+    Строится один раз после разбора: для каждого узла вычисляется полуинтервал
+    [start, end) смещений в исходнике, затем строка разбивается на элементарные
+    отрезки, у каждого из которых ровно один самый внутренний узел. Поэтому
+    node_at() -- это один бинарный поиск, O(log n).
+    """
+
+    def __init__(self, root: Node, source: str):
+        self._line_starts = [0]
+        for i, char in enumerate(source):
+            if char == '\n':
+                self._line_starts.append(i + 1)
+
+        self._spans: Dict[int, Tuple[int, int]] = {}
+        self._parents: Dict[int, Optional[Node]] = {}
+        self._build(root)
+
+    # ---- ПОСТРОЕНИЕ ----
+    def _offset(self, line: int, column: int) -> int:
+        if line < 1 or line > len(self._line_starts):
+            return -1
+        return self._line_starts[line - 1] + column - 1
+
+    def _own_span(self, node: Node) -> Optional[Tuple[int, int]]:
+        """Диапазон, известный из позиции самого узла (без потомков).
+
+        Если конец узла неизвестен, возвращается точка начала: она всё равно
+        расширяет диапазон составного узла (например, 'def' перед параметрами).
+        """
+        # У Block позиция указывает на токен после блока
+        if isinstance(node, Block) or node.line < 1:
+            return None
+        start = self._offset(node.line, node.column)
+        if start < 0:
+            return None
+        end = node.end_offset
+        if end is None and isinstance(node, Identifier):
+            end = start + len(node.name)
+        if end is None or end < start:
+            end = start
+        return start, end
+
+    def _build(self, root: Node):
+        # Прямой обход с явным стеком: родители и глубина
+        order = []
+        depth = {}
+        stack = [(root, None, 0)]
+        while stack:
+            node, parent, level = stack.pop()
+            self._parents[id(node)] = parent
+            depth[id(node)] = level
+            order.append(node)
+            children = list(iter_child_nodes(node))
+            for child in reversed(children):
+                stack.append((child, node, level + 1))
+
+        # Обратный порядок прямого обхода: потомки обрабатываются раньше родителя
+        for node in reversed(order):
+            span = self._own_span(node)
+            for child in iter_child_nodes(node):
+                child_span = self._spans.get(id(child))
+                if child_span is None:
+                    continue
+                if span is None:
+                    span = child_span
+                else:
+                    span = (min(span[0], child_span[0]), max(span[1], child_span[1]))
+            if span is not None and span[1] > span[0]:
+                self._spans[id(node)] = span
+
+        entries = [(self._spans[id(n)][0], -self._spans[id(n)][1], depth[id(n)], i, n)
+                   for i, n in enumerate(order) if id(n) in self._spans]
+        entries.sort(key=lambda e: e[:4])
+        self._nodes: List[Node] = [e[4] for e in entries]
+        self._starts: List[int] = [e[0] for e in entries]
+        self._build_segments()
+
+    def _build_segments(self):
+        """Разбиение на элементарные отрезки с самым внутренним узлом"""
+        bounds: List[int] = []
+        owners: List[Optional[Node]] = []
+
+        def emit(position, owner):
+            if bounds and bounds[-1] == position:
+                owners[-1] = owner
+            elif not owners or owners[-1] is not owner:
+                bounds.append(position)
+                owners.append(owner)
+
+        stack: List[Tuple[Node, int]] = []
+        for node in self._nodes:
+            start, end = self._spans[id(node)]
+            while stack and stack[-1][1] <= start:
+                _, closed_end = stack.pop()
+                emit(closed_end, stack[-1][0] if stack else None)
+            if stack and end > stack[-1][1]:
+                end = stack[-1][1]  # перекрытие соседей: прижимаем к объемлющему
+            stack.append((node, end))
+            emit(start, node)
+        while stack:
+            _, closed_end = stack.pop()
+            emit(closed_end, stack[-1][0] if stack else None)
+
+        self._bounds = bounds
+        self._owners = owners
+
+    # ---- ЗАПРОСЫ ----
+    def span(self, node: Node) -> Optional[Tuple[int, int]]:
+        """Диапазон [start, end) узла или None для узлов без текста"""
+        return self._spans.get(id(node))
+
+    def parent(self, node: Node) -> Optional[Node]:
+        return self._parents.get(id(node))
+
+    def node_at(self, offset: int) -> Optional[Node]:
+        """Самый внутренний узел, покрывающий смещение: O(log n)"""
+        i = bisect_right(self._bounds, offset) - 1
+        if i < 0:
+            return None
+        return self._owners[i]
+
+    def nodes_in_range(self, start: int, end: int) -> List[Node]:
+        """Узлы, пересекающиеся с [start, end), в порядке документа.
+
+        Поиск -- O(log n), плюс размер ответа: предки узла в точке start
+        (они начинаются раньше) и срез узлов, начинающихся внутри диапазона.
+        """
+        result = []
+        node = self.node_at(start)
+        while node is not None:
+            node_start, node_end = self._spans[id(node)]
+            if node_start < start and node_end > start:
+                result.append(node)
+            node = self._parents.get(id(node))
+        result.reverse()
+
+        lo = bisect_left(self._starts, start)
+        hi = bisect_left(self._starts, end) if end > start else lo
+        result.extend(self._nodes[lo:hi])
+        return result
+
+    # ---- ИНКРЕМЕНТАЛЬНОЕ ОБНОВЛЕНИЕ ----
+    def apply_edit(self, start: int, old_end: int, new_end: int) -> bool:
+        """Сдвигает диапазоны после правки [start, old_end) -> [start, new_end).
+
+        Возможно только для правок строго внутри одного элементарного отрезка
+        (например, набор текста внутри идентификатора или строки): структура
+        вложенности тогда не меняется. Иначе возвращает False.
+        """
+        i = bisect_right(self._bounds, start) - 1
+        if i < 0 or self._bounds[i] == start or self._owners[i] is None:
+            return False
+        if i + 1 < len(self._bounds) and self._bounds[i + 1] <= old_end:
+            return False
+
+        delta = new_end - old_end
+        if delta == 0:
+            return True
+
+        def shift(position):
+            return position + delta if position >= old_end else position
+
+        self._bounds = [shift(b) for b in self._bounds]
+        self._starts = [shift(s) for s in self._starts]
+        for key, (s, e) in self._spans.items():
+            self._spans[key] = (shift(s), shift(e))
+        return True
@@ -0,0 +1,70 @@
+from typing import Callable, Iterator, Optional
+from .ast_nodes import Node
+
+PRE_ORDER = 'pre'
+POST_ORDER = 'post'
+
+_END = object()
+
+
+def iter_child_nodes(node: Node) -> Iterator[Node]:
+    """Возвращает прямых потомков узла в порядке исходного кода.
+
+    Поля берутся из метаданных класса (Node._fields). Списки могут быть
+    вложенными (литерал списка хранит значения вложенных списков как list),
+    поэтому разворачиваем их без рекурсии.
+    """
+    for field in node._fields:
+        value = getattr(node, field, None)
+        if isinstance(value, Node):
+            yield value
+        elif isinstance(value, list):
+            stack = [iter(value)]
+            while stack:
+                item = next(stack[-1], _END)
+                if item is _END:
+                    stack.pop()
+                elif isinstance(item, Node):
+                    yield item
+                elif isinstance(item, list):
+                    stack.append(iter(item))
+
+
+def walk(root: Node, order: str = PRE_ORDER,
+         prune: Optional[Callable[[Node], bool]] = None) -> Iterator[Node]:
+    """Итеративный обход AST с явным стеком.
+
+    order  -- PRE_ORDER (родитель раньше потомков) или POST_ORDER.
+    prune  -- если вернул True для узла, его потомки не обходятся
+              (сам узел при этом всё равно возвращается).
+
+    Глубина дерева ограничена только памятью, а не лимитом рекурсии Python.
+    """
+    if root is None:
+        return
+    if order == PRE_ORDER:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            yield node
+            if prune is not None and prune(node):
+                continue
+            children = list(iter_child_nodes(node))
+            children.reverse()
+            stack.extend(children)
+    elif order == POST_ORDER:
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+                continue
+            stack.append((node, True))
+            if prune is not None and prune(node):
+                continue
+            children = list(iter_child_nodes(node))
+            for child in reversed(children):
+                stack.append((child, False))
+    else:
+        raise ValueError(f"Unknown traversal order: {order}")
+
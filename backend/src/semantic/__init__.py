@@ -1,4 +1,10 @@
-from .symbol_table import SymbolTable, SymbolType, Symbol, Scope
+from .symbol_table import SymbolTable, FlatSymbolTable, RecordingSymbolTable, SymbolType, Symbol, Scope, Binding
 from .analyzer import SemanticAnalyzer
+from .type_inference import TypeInferencer
+from .parallel import ParallelSemanticAnalyzer
+from .incremental import AnalysisState
+from .liveness import LivenessAnalyzer
 
-__all__ = ['SymbolTable', 'SymbolType', 'Symbol', 'Scope', 'SemanticAnalyzer']
\ No newline at end of file
+__all__ = ['SymbolTable', 'FlatSymbolTable', 'RecordingSymbolTable', 'SymbolType', 'Symbol', 'Scope', 'Binding', 'SemanticAnalyzer',
+           'TypeInferencer', 'ParallelSemanticAnalyzer',
+           'AnalysisState', 'LivenessAnalyzer']
\ No newline at end of file
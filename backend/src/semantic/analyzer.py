@@ -1,13 +1,21 @@
-from .symbol_table import SymbolTable, SymbolType, DataType
+from .symbol_table import SymbolTable, SymbolType, DataType, Binding
 from ..exceptions import UndefinedVariableError, RedeclarationError, TypeMismatchError
 from ..parser.ast_nodes import *
+from ..parser.walker import iter_child_nodes
 
 
 class SemanticAnalyzer:
-    def __init__(self):
-        self.symbol_table = SymbolTable()
+    def __init__(self, symbol_table_class=SymbolTable):
+        # symbol_table_class: SymbolTable или FlatSymbolTable (одинаковый интерфейс)
+        self.symbol_table = symbol_table_class()
         self.errors = []
         self.current_function_return_type = None
+        self._predeclared = set()  # id вложенных функций, объявленных заранее
+        self._return_types = []  # стек типов возврата объемлющих функций
+        # Обращения к глобальной области: имя -> (вид, тип) символа, видимого
+        # при первом обращении, или None. Заполняется, только если не None
+        # (инкрементальный анализ задаёт словарь перед каждым оператором модуля)
+        self.global_reads = None
         self._initialize_builtin_functions()
 
     def _initialize_builtin_functions(self):
@@ -41,71 +49,43 @@ class SemanticAnalyzer:
         for statement in node.statements:
             self.visit(statement)
 
-    def visit_functiondeclaration(self, node):
-        """Посещение объявления функции"""
-        # Проверяем конфликты в текущей области видимости
-        local_symbol = self.symbol_table.lookup_local(node.name)
-        if local_symbol is not None and local_symbol.symbol_type == SymbolType.FUNCTION:
-            self.errors.append(RedeclarationError(node.name, node.line, node.column))
-            return
-
-        # Добавляем функцию в текущую область видимости
-        self.symbol_table.define(
-            node.name,
-            SymbolType.FUNCTION,
-            node.return_type,
-            node.line,
-            node.column
-        )
-
-        # Входим в новую область видимости для тела функции
-        self.symbol_table.enter_scope()
-
-        # Добавляем параметры в область видимости функции
-        for param in node.parameters:
-            self.symbol_table.define(
-                param.name,
-                SymbolType.VARIABLE,
-                DataType.ANY,
-                param.line,
-                param.column
-            )
-
-        # Сохраняем текущий тип возвращаемого значения
-        old_return_type = self.current_function_return_type
-        self.current_function_return_type = node.return_type
-
-        # Анализируем тело функции
-        for statement in node.body.statements:
-            self.visit(statement)
-
-        # Выходим из области видимости функции
-        self.symbol_table.exit_scope()
-        self.current_function_return_type = old_return_type
-
     def visit_block(self, node):
         """Посещение блока кода"""
         for statement in node.statements:
             self.visit(statement)
 
-    def visit_assignment(self, node):
-        """Посещение присваивания"""
-        # Анализируем значение
-        value_type = self.visit(node.value)
+    def _note_global(self, name, symbol):
+        """Запоминает зависимость от глобального имени (или его отсутствия)"""
+        if self.global_reads is None or name in self.global_reads:
+            return
+        if symbol is None:
+            self.global_reads[name] = None
+        elif symbol.scope_id == 0:
+            self.global_reads[name] = (symbol.symbol_type, symbol.data_type)
+
+    # ---- ПРАВИЛА ----
+    # Методы check_*/resolve_*/enter_*/exit_* получают уже вычисленные типы
+    # потомков. Их вызывает и отдельный проход (visit_*), и CodeGenerator в
+    # режиме fused_analysis, который проверяет программу во время генерации.
 
+    def check_assignment(self, node, value_type):
+        """Объявление или проверка цели присваивания"""
         # Проверяем, объявлена ли переменная
         symbol = self.symbol_table.lookup(node.target.name)
+        self._note_global(node.target.name, symbol)
 
         if symbol is None:
             # Переменная не объявлена - создаем ее
-            self.symbol_table.define(
+            symbol = self.symbol_table.define(
                 node.target.name,
                 SymbolType.VARIABLE,
                 value_type or DataType.ANY,
                 node.target.line,
                 node.target.column
             )
+            node.target.binding = Binding(symbol, True)
         else:
+            node.target.binding = Binding(symbol, False)
             # Переменная уже объявлена - проверяем совместимость типов
             if symbol.symbol_type != SymbolType.VARIABLE:
                 self.errors.append(TypeMismatchError(
@@ -115,11 +95,8 @@ class SemanticAnalyzer:
 
         return value_type
 
-    def visit_binaryoperation(self, node):
-        """Посещение бинарной операции"""
-        left_type = self.visit(node.left)
-        right_type = self.visit(node.right)
-
+    def check_binary_operation(self, node, left_type, right_type):
+        """Тип результата бинарной операции по типам операндов"""
         # Для арифметических операций разрешаем числовые типы
         if node.operator in ['+', '-', '*', '/', '%', '**']:
             # ИСПРАВЛЕНО: Числовые литералы имеют тип INT или FLOAT, а не VARIABLE
@@ -164,137 +141,106 @@ class SemanticAnalyzer:
 
         return DataType.ANY
 
-    def is_numeric_type(self, data_type):
-        """Проверяет, является ли тип числовым"""
-        # ИСПРАВЛЕНО: Включаем литеральные числовые типы
-        return data_type in [DataType.INT, DataType.FLOAT, DataType.ANY]
-
-    def visit_identifier(self, node):
-        """Посещение идентификатора"""
+    def resolve_identifier(self, node):
+        """Разрешение имени: разметка узла и тип символа"""
         symbol = self.symbol_table.lookup(node.name)
+        self._note_global(node.name, symbol)
         if symbol is None:
+            node.binding = None
             self.errors.append(UndefinedVariableError(
                 node.name, node.line, node.column
             ))
             return DataType.ANY
+        node.binding = Binding(symbol, False)
         return symbol.data_type
 
-    def visit_literal(self, node):
-        """Посещение литерала"""
-        return node.literal_type
-
-    def visit_listliteral(self, node):
-        """Посещение литерала списка"""
-        if hasattr(node, 'elements') and node.elements:
-            # Анализируем все элементы
-            for element in node.elements:
-                self.visit(element)
-        return DataType.LIST
-
-    def visit_ifstatement(self, node):
-        """Посещение условного оператора"""
-        condition_type = self.visit(node.condition)
+    def check_condition(self, condition, condition_type):
+        """Условие if/while должно быть булевым"""
         if condition_type != DataType.BOOLEAN:
             self.errors.append(TypeMismatchError(
                 "boolean", condition_type.value,
-                node.condition.line, node.condition.column
+                condition.line, condition.column
             ))
 
-        self.visit(node.then_branch)
-        if node.else_branch:
-            self.visit(node.else_branch)
-
-        return DataType.NONE
-
-    def visit_whileloop(self, node):
-        """Посещение цикла while"""
-        condition_type = self.visit(node.condition)
-        if condition_type != DataType.BOOLEAN:
+    def check_return(self, node, return_type):
+        """Тип return должен совпадать с объявленным типом функции"""
+        if (self.current_function_return_type is not None and
+                self.current_function_return_type != DataType.ANY and
+                self.current_function_return_type != return_type):
             self.errors.append(TypeMismatchError(
-                "boolean", condition_type.value,
-                node.condition.line, node.condition.column
+                self.current_function_return_type.value,
+                return_type.value,
+                node.line, node.column
             ))
 
-        self.visit(node.body)
-        return DataType.NONE
-
-    def visit_forloop(self, node):
-        """Посещение цикла for"""
-        # Анализируем итерируемое выражение
-        iterable_type = self.visit(node.iterable)
-
+    def enter_for_loop(self, node):
+        """Область видимости цикла for с переменной цикла"""
         # Входим в новую область видимости цикла
         self.symbol_table.enter_scope()
 
         # Добавляем переменную цикла в область видимости
-        self.symbol_table.define(
+        symbol = self.symbol_table.define(
             node.variable.name,
             SymbolType.VARIABLE,
             DataType.ANY,
             node.variable.line,
             node.variable.column
         )
+        node.variable.binding = Binding(symbol, True)
 
-        # Анализируем тело цикла
-        self.visit(node.body)
-
+    def exit_for_loop(self, node):
         # Выходим из области видимости цикла
         self.symbol_table.exit_scope()
 
-        return DataType.NONE
+    def enter_function(self, node):
+        """Объявляет функцию и открывает область её тела.
 
-    def visit_returnstatement(self, node):
-        """Посещение оператора return"""
-        if node.value:
-            return_type = self.visit(node.value)
-            if (self.current_function_return_type is not None and
-                    self.current_function_return_type != DataType.ANY and
-                    self.current_function_return_type != return_type):
-                self.errors.append(TypeMismatchError(
-                    self.current_function_return_type.value,
-                    return_type.value,
-                    node.line, node.column
-                ))
-        return DataType.NONE
-
-    def visit_functiondeclaration(self, node):
-        """Посещение объявления функции"""
+        Возвращает False при повторном объявлении: тогда тело не анализируется
+        и exit_function вызывать не нужно.
+        """
         # Проверяем конфликты в текущей области видимости
-        local_symbol = self.symbol_table.lookup_local(node.name)
-        if local_symbol is not None and local_symbol.symbol_type == SymbolType.FUNCTION:
-            self.errors.append(RedeclarationError(node.name, node.line, node.column))
-            return
+        if id(node) in self._predeclared:
+            # Вложенная функция уже объявлена при входе во внешнюю
+            self._predeclared.discard(id(node))
+        else:
+            local_symbol = self.symbol_table.lookup_local(node.name)
+            self._note_global(node.name, local_symbol)
+            if local_symbol is not None and local_symbol.symbol_type == SymbolType.FUNCTION:
+                self.errors.append(RedeclarationError(node.name, node.line, node.column))
+                return False
 
-        # Добавляем функцию в текущую область видимости
-        self.symbol_table.define(
-            node.name,
-            SymbolType.FUNCTION,
-            node.return_type,
-            node.line,
-            node.column
-        )
+            # Добавляем функцию в текущую область видимости
+            self.symbol_table.define(
+                node.name,
+                SymbolType.FUNCTION,
+                node.return_type,
+                node.line,
+                node.column
+            )
 
         # Входим в новую область видимости для тела функции
         self.symbol_table.enter_scope()
 
         # Добавляем параметры в область видимости функции
         for param in node.parameters:
-            self.symbol_table.define(
+            symbol = self.symbol_table.define(
                 param.name,
                 SymbolType.VARIABLE,
                 DataType.ANY,
                 param.line,
                 param.column
             )
+            param.binding = Binding(symbol, True)
 
         # Сохраняем текущий тип возвращаемого значения
-        old_return_type = self.current_function_return_type
+        self._return_types.append(self.current_function_return_type)
         self.current_function_return_type = node.return_type
 
         # Проходим по телу функции и находим объявления вложенных функций
         for statement in node.body.statements:
             if isinstance(statement, FunctionDeclaration):
                 # Добавляем вложенную функцию в текущую область видимости (внутри внешней функции)
+                self._predeclared.add(id(statement))
                 self.symbol_table.define(
                     statement.name,
                     SymbolType.FUNCTION,
@@ -302,13 +248,103 @@ class SemanticAnalyzer:
                     statement.line,
                     statement.column
                 )
+        return True
+
+    def exit_function(self, node):
+        # Выходим из области видимости функции
+        self.symbol_table.exit_scope()
+        self.current_function_return_type = self._return_types.pop()
+
+    # ---- ПОСЕЩЕНИЕ УЗЛОВ ----
+    def visit_assignment(self, node):
+        """Посещение присваивания"""
+        # Анализируем значение
+        value_type = self.visit(node.value)
+        return self.check_assignment(node, value_type)
+
+    def visit_binaryoperation(self, node):
+        """Посещение бинарной операции"""
+        left_type = self.visit(node.left)
+        right_type = self.visit(node.right)
+        return self.check_binary_operation(node, left_type, right_type)
+
+    def visit_identifier(self, node):
+        """Посещение идентификатора"""
+        return self.resolve_identifier(node)
+
+    def visit_functioncall(self, node):
+        """Посещение вызова функции"""
+        # Имя вызываемой функции не проверяем: в Python функция может быть
+        # объявлена ниже места вызова (например, при взаимной рекурсии).
+        if self.global_reads is not None:
+            # но вызов зависит от сигнатуры вызываемой функции
+            self._note_global(node.name.name, self.symbol_table.lookup(node.name.name))
+        for argument in node.arguments:
+            self.visit(argument)
+        return DataType.ANY
+
+    def visit_literal(self, node):
+        """Посещение литерала"""
+        return node.literal_type
+
+    def visit_listliteral(self, node):
+        """Посещение литерала списка"""
+        if hasattr(node, 'elements') and node.elements:
+            # Анализируем все элементы
+            for element in node.elements:
+                self.visit(element)
+        return DataType.LIST
 
+    def visit_ifstatement(self, node):
+        """Посещение условного оператора"""
+        condition_type = self.visit(node.condition)
+        self.check_condition(node.condition, condition_type)
+
+        self.visit(node.then_branch)
+        if node.else_branch:
+            self.visit(node.else_branch)
+
+        return DataType.NONE
+
+    def visit_whileloop(self, node):
+        """Посещение цикла while"""
+        condition_type = self.visit(node.condition)
+        self.check_condition(node.condition, condition_type)
+
+        self.visit(node.body)
+        return DataType.NONE
+
+    def visit_forloop(self, node):
+        """Посещение цикла for"""
+        # Анализируем итерируемое выражение
+        iterable_type = self.visit(node.iterable)
+
+        self.enter_for_loop(node)
+
+        # Анализируем тело цикла
+        self.visit(node.body)
+
+        self.exit_for_loop(node)
+
+        return DataType.NONE
+
+    def visit_returnstatement(self, node):
+        """Посещение оператора return"""
+        if node.value:
+            return_type = self.visit(node.value)
+            self.check_return(node, return_type)
+        return DataType.NONE
+
+    def visit_functiondeclaration(self, node):
+        """Посещение объявления функции"""
+        if not self.enter_function(node):
+            return
+
+        # Анализируем тело функции
         for statement in node.body.statements:
             self.visit(statement)
 
-        # Выходим из области видимости функции
-        self.symbol_table.exit_scope()
-        self.current_function_return_type = old_return_type
+        self.exit_function(node)
 
     def visit_expressionstatement(self, node):
         """Посещение выражения как оператора"""
@@ -351,33 +387,7 @@ class SemanticAnalyzer:
         return DataType.INT
 
     def generic_visit(self, node):
-        """Обход узлов по умолчанию"""
-        # Для узлов с statements
-        if hasattr(node, 'statements'):
-            for statement in node.statements:
-                self.visit(statement)
-            return DataType.NONE
-
-        # Для узлов с expression
-        elif hasattr(node, 'expression'):
-            return self.visit(node.expression)
-
-        # Для узлов с elements (списки)
-        elif hasattr(node, 'elements'):
-            for element in node.elements:
-                self.visit(element)
-            return DataType.LIST
-
-        # Для узлов с value
-        elif hasattr(node, 'value'):
-            return self.visit(node.value)
-
-        # Для узлов с condition и body (if, while)
-        elif hasattr(node, 'condition') and hasattr(node, 'body'):
-            self.visit(node.condition)
-            self.visit(node.body)
-            if hasattr(node, 'else_branch') and node.else_branch:
-                self.visit(node.else_branch)
-            return DataType.NONE
-
-        return DataType.ANY
\ No newline at end of file
+        """Обход узлов по умолчанию: посещаем потомков по метаданным узла"""
+        for child in iter_child_nodes(node):
+            self.visit(child)
+        return DataType.ANY
@@ -0,0 +1,230 @@
+import json
+from typing import Dict, List, Optional
+from ..parser.ast_nodes import *
+from ..parser.walker import iter_child_nodes
+from ..parser.fstrings import is_fstring, fstring_expressions
+
+
+class CallGraph:
+    """Граф вызовов модуля: какие функции вызывают какие.
+
+    Имя в FunctionCall разрешается лексически, как в SemanticAnalyzer:
+    сначала функции, вложенные в текущую (они объявляются при входе в
+    объемлющую), затем объемлющие функции и модуль. Если имя в этой области --
+    параметр или переменная, вызов считается вызовом неизвестного значения.
+    Учитываются и вызовы внутри подстановок f-строк.
+
+    Компоненты сильной связности считаются итеративным алгоритмом Тарьяна;
+    sccs перечисляет их в обратном топологическом порядке (вызываемые раньше
+    вызывающих). Граф строится один раз на программу: CallGraph.of(program);
+    проходы, меняющие вызовы, должны вызвать CallGraph.invalidate(program).
+    """
+
+    MODULE = '<module>'
+
+    def __init__(self, program: Program):
+        self.program = program
+        self.functions: List[FunctionDeclaration] = []
+        self._parent: Dict[int, Optional[FunctionDeclaration]] = {}
+        self._nested: Dict[Optional[int], Dict[str, List[FunctionDeclaration]]] = {None: {}}
+        self._variables: Dict[Optional[int], set] = {None: set()}
+        self._calls: Dict[Optional[int], List[FunctionCall]] = {None: []}
+        self._targets: Dict[int, FunctionDeclaration] = {}
+        self._callees: Dict[Optional[int], List[FunctionDeclaration]] = {}
+        self._callers: Dict[int, List[FunctionDeclaration]] = {}
+        self._unresolved: Dict[Optional[int], List[str]] = {}
+        self._build()
+        self.sccs: List[List[FunctionDeclaration]] = self._strongly_connected()
+        self._scc_index = {id(f): i for i, scc in enumerate(self.sccs) for f in scc}
+
+    # ---- КЭШ ----
+    @classmethod
+    def of(cls, program: Program) -> 'CallGraph':
+        """Граф вызовов программы (строится при первом обращении)"""
+        if program._call_graph is None:
+            program._call_graph = cls(program)
+        return program._call_graph
+
+    @staticmethod
+    def invalidate(program: Program):
+        program._call_graph = None
+
+    # ---- ПОСТРОЕНИЕ ----
+    @staticmethod
+    def _key(func: Optional[FunctionDeclaration]) -> Optional[int]:
+        return id(func) if func is not None else None
+
+    def _build(self):
+        stack = [(child, None) for child in reversed(list(iter_child_nodes(self.program)))]
+        while stack:
+            node, owner = stack.pop()
+            key = self._key(owner)
+            if isinstance(node, FunctionDeclaration):
+                self.functions.append(node)
+                self._parent[id(node)] = owner
+                self._nested[key].setdefault(node.name, []).append(node)
+                self._nested[id(node)] = {}
+                self._variables[id(node)] = {p.name for p in node.parameters}
+                self._calls[id(node)] = []
+                owner = node
+            elif isinstance(node, Assignment):
+                self._variables[key].add(node.target.name)
+            elif isinstance(node, ForLoop):
+                self._variables[key].add(node.variable.name)
+            elif isinstance(node, FunctionCall):
+                self._calls[key].append(node)
+            elif is_fstring(node):
+                for expression in reversed(fstring_expressions(node)):
+                    stack.append((expression, owner))
+            for child in reversed(list(iter_child_nodes(node))):
+                stack.append((child, owner))
+
+        for func in [None] + self.functions:
+            key = self._key(func)
+            callees = []
+            unresolved = []
+            for call in self._calls[key]:
+                target = self._resolve(call.name.name, func)
+                if target is None:
+                    unresolved.append(call.name.name)
+                    continue
+                self._targets[id(call)] = target
+                if target not in callees:
+                    callees.append(target)
+                    if func is not None:
+                        self._callers.setdefault(id(target), []).append(func)
+            self._callees[key] = callees
+            self._unresolved[key] = unresolved
+
+    def _resolve(self, name: str, scope: Optional[FunctionDeclaration]) -> Optional[FunctionDeclaration]:
+        while True:
+            key = self._key(scope)
+            declared = self._nested[key].get(name)
+            if declared:
+                # Повторное объявление: в JS действует последнее
+                return declared[-1]
+            if name in self._variables[key] or scope is None:
+                return None
+            scope = self._parent[id(scope)]
+
+    def _strongly_connected(self) -> List[List[FunctionDeclaration]]:
+        """Алгоритм Тарьяна без рекурсии"""
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        result = []
+        counter = 0
+        for root in self.functions:
+            if id(root) in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                node, child_position = work.pop()
+                if child_position == 0:
+                    index[id(node)] = lowlink[id(node)] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack.add(id(node))
+                callees = self._callees[id(node)]
+                if child_position < len(callees):
+                    work.append((node, child_position + 1))
+                    callee = callees[child_position]
+                    if id(callee) not in index:
+                        work.append((callee, 0))
+                    elif id(callee) in on_stack:
+                        lowlink[id(node)] = min(lowlink[id(node)], index[id(callee)])
+                    continue
+                # Все потомки обработаны
+                if lowlink[id(node)] == index[id(node)]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(id(member))
+                        component.append(member)
+                        if member is node:
+                            break
+                    component.reverse()
+                    result.append(component)
+                if work:
+                    parent = work[-1][0]
+                    lowlink[id(parent)] = min(lowlink[id(parent)], lowlink[id(node)])
+        return result
+
+    # ---- ЗАПРОСЫ ----
+    def target(self, call: FunctionCall) -> Optional[FunctionDeclaration]:
+        """Функция модуля, которую вызывает call (None -- встроенная или неизвестная)"""
+        return self._targets.get(id(call))
+
+    def calls(self, func: Optional[FunctionDeclaration]) -> List[FunctionCall]:
+        """Вызовы в теле функции (без вложенных функций); None -- код модуля"""
+        return self._calls[self._key(func)]
+
+    def callees(self, func: Optional[FunctionDeclaration]) -> List[FunctionDeclaration]:
+        return self._callees[self._key(func)]
+
+    def callers(self, func: FunctionDeclaration) -> List[FunctionDeclaration]:
+        """Вызывающие функции (вызовы из кода модуля сюда не входят)"""
+        return self._callers.get(id(func), [])
+
+    def unresolved(self, func: Optional[FunctionDeclaration]) -> List[str]:
+        """Имена вызванных встроенных или неизвестных функций"""
+        return self._unresolved[self._key(func)]
+
+    def parent(self, func: FunctionDeclaration) -> Optional[FunctionDeclaration]:
+        """Объемлющая функция (None -- функция верхнего уровня)"""
+        return self._parent[id(func)]
+
+    def scc(self, func: FunctionDeclaration) -> List[FunctionDeclaration]:
+        return self.sccs[self._scc_index[id(func)]]
+
+    def is_recursive(self, func: FunctionDeclaration) -> bool:
+        """Прямая рекурсия или взаимная (общая компонента связности)"""
+        return len(self.scc(func)) > 1 or func in self._callees[id(func)]
+
+    def is_self_recursive(self, func: FunctionDeclaration) -> bool:
+        return func in self._callees[id(func)]
+
+    def is_leaf(self, func: FunctionDeclaration) -> bool:
+        """Не вызывает функций модуля (встроенные допускаются)"""
+        return not self._callees[id(func)]
+
+    # ---- ЭКСПОРТ ----
+    def _label(self, func: Optional[FunctionDeclaration]) -> str:
+        return self.MODULE if func is None else f"{func.name}:{func.line}"
+
+    def to_json(self) -> str:
+        functions = []
+        for func in self.functions:
+            functions.append({
+                'id': self._label(func),
+                'name': func.name,
+                'line': func.line,
+                'parent': self._label(self._parent[id(func)]) if self._parent[id(func)] else None,
+                'callees': [self._label(c) for c in self.callees(func)],
+                'unresolved': sorted(set(self.unresolved(func))),
+                'recursive': self.is_recursive(func),
+                'leaf': self.is_leaf(func),
+                'scc': self._scc_index[id(func)],
+            })
+        return json.dumps({
+            'functions': functions,
+            'module': {'callees': [self._label(c) for c in self.callees(None)],
+                       'unresolved': sorted(set(self.unresolved(None)))},
+            'sccs': [[self._label(f) for f in scc] for scc in self.sccs],
+        }, indent=2)
+
+    def to_dot(self) -> str:
+        lines = ['digraph call_graph {', f'    "{self.MODULE}" [shape=box];']
+        for func in self.functions:
+            attributes = [f'label="{func.name}"']
+            if self.is_recursive(func):
+                attributes.append('color=red')
+            if self.is_leaf(func):
+                attributes.append('style=dashed')
+            lines.append(f'    "{self._label(func)}" [{", ".join(attributes)}];')
+        for func in [None] + self.functions:
+            for callee in self.callees(func):
+                lines.append(f'    "{self._label(func)}" -> "{self._label(callee)}";')
+        lines.append('}')
+        return '\n'.join(lines)
@@ -0,0 +1,136 @@
+from typing import Dict, List, Optional, Tuple
+from ..exceptions import TranspilerError
+from ..parser.ast_nodes import Program, FunctionDeclaration
+from .analyzer import SemanticAnalyzer
+from .symbol_table import RecordingSymbolTable
+
+
+class StatementResult:
+    """Результат анализа одного оператора верхнего уровня"""
+
+    __slots__ = ('text', 'line', 'errors', 'reads', 'events')
+
+    def __init__(self, text: str, line: int, errors: list, reads: dict, events: list):
+        self.text = text
+        self.line = line
+        self.errors = errors
+        self.reads = reads    # глобальное имя -> (вид, тип) при входе в оператор
+        self.events = events  # объявления в глобальной области
+
+
+def _shift_error(error, delta: int):
+    """Копия ошибки с номером строки, сдвинутым на delta"""
+    if delta == 0 or error.line is None:
+        return error
+    shifted = type(error).__new__(type(error))
+    TranspilerError.__init__(shifted, error.message, error.line + delta, error.column)
+    return shifted
+
+
+class AnalysisState:
+    """Переиспользуемое состояние инкрементального семантического анализа.
+
+    Для каждого оператора верхнего уровня (в том числе функции) хранятся его
+    текст, ошибки, прочитанные глобальные имена вместе с символами, которые
+    они тогда обозначали, и объявленные им глобальные имена. После правки
+    оператор анализируется заново, только если изменился его текст или
+    какое-то из прочитанных имён теперь обозначает другой символ (изменилась
+    сигнатура функции или глобальная переменная). Результат совпадает с
+    полным анализом SemanticAnalyzer.
+    """
+
+    def __init__(self):
+        self.program: Optional[Program] = None
+        self.results: List[StatementResult] = []
+        self.errors = []
+        self.reanalyzed: List[int] = []  # номера операторов, проверенных при последнем update
+
+    def analyze(self, program: Program) -> bool:
+        """Полный анализ с нуля"""
+        self.results = []
+        return self.update(program)
+
+    def update(self, program: Program) -> bool:
+        """Анализ новой версии программы с переиспользованием результатов.
+
+        program -- заново разобранная программа (с program.source).
+        """
+        texts = self._statement_texts(program)
+        cached: Dict[str, List[StatementResult]] = {}
+        for result in self.results:
+            cached.setdefault(result.text, []).append(result)
+
+        analyzer = SemanticAnalyzer(symbol_table_class=RecordingSymbolTable)
+        table = analyzer.symbol_table
+        module_scope = table.scope_stack[0]
+        results = []
+        self.reanalyzed = []
+        for number, statement in enumerate(program.statements):
+            text = texts[number]
+            candidates = cached.get(text)
+            result = None
+            if candidates and self._still_valid(candidates[0], module_scope):
+                old = candidates.pop(0)
+                for event in old.events:
+                    table.define(*event)
+                delta = statement.line - old.line
+                result = StatementResult(text, statement.line,
+                                         [_shift_error(e, delta) for e in old.errors],
+                                         old.reads, old.events)
+            else:
+                self.reanalyzed.append(number)
+                first_error = len(analyzer.errors)
+                first_event = len(table.module_events)
+                analyzer.global_reads = {}
+                analyzer.visit(statement)
+                result = StatementResult(text, statement.line, analyzer.errors[first_error:],
+                                         analyzer.global_reads, table.module_events[first_event:])
+            results.append(result)
+
+        self.program = program
+        self.results = results
+        self.errors = [error for result in results for error in result.errors]
+        return len(self.errors) == 0
+
+    @staticmethod
+    def _statement_texts(program: Program) -> List[str]:
+        """Текст каждого оператора верхнего уровня: строки до следующего оператора.
+
+        Дешевле полного SpanIndex: операторы модуля начинаются с начала
+        строки, поэтому достаточно номеров строк.
+        """
+        source = program.source
+        line_starts = [0]
+        position = source.find('\n')
+        while position != -1:
+            line_starts.append(position + 1)
+            position = source.find('\n', position + 1)
+        line_starts.append(len(source))
+
+        statements = program.statements
+        texts = []
+        for i, statement in enumerate(statements):
+            start = line_starts[min(statement.line, len(line_starts)) - 1]
+            if i + 1 < len(statements):
+                end = line_starts[min(statements[i + 1].line, len(line_starts)) - 1]
+            else:
+                end = len(source)
+            texts.append(source[start:end].rstrip())
+        return texts
+
+    @staticmethod
+    def _still_valid(result: StatementResult, module_scope) -> bool:
+        for name, seen in result.reads.items():
+            symbol = module_scope.symbols.get(name)
+            current = (symbol.symbol_type, symbol.data_type) if symbol is not None else None
+            if current != seen:
+                return False
+        return True
+
+    def dependencies(self) -> Dict[str, Tuple[set, set]]:
+        """Для каждой функции верхнего уровня: (читаемые, объявляемые) глобальные имена"""
+        deps = {}
+        for statement, result in zip(self.program.statements, self.results):
+            if isinstance(statement, FunctionDeclaration):
+                deps[statement.name] = (set(result.reads), {event[0] for event in result.events})
+        return deps
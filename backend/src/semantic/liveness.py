@@ -0,0 +1,177 @@
+from typing import Dict, List, Optional, Set
+from ..parser.ast_nodes import *
+from ..parser.walker import walk, iter_child_nodes
+from ..parser.fstrings import is_fstring, fstring_expressions
+from .call_graph import CallGraph
+from .purity import PurityAnalyzer, Purity, BUILTIN_PURITY
+
+
+class LivenessAnalyzer:
+    """Анализ живости и переприсваиваний для генерации const и удаления
+    мёртвых присваиваний.
+
+    Для каждой функции (и кода модуля) выполняется обратный проход по
+    структурированному потоку управления: в циклах множество живых
+    переменных доводится до неподвижной точки, break/continue переходят к
+    выходу/заголовку цикла. Переменные различаются по Binding.key.
+
+    Результат -- атрибуты Assignment:
+      single_assignment -- единственное присваивание своей переменной
+                           (можно объявить как const);
+      dead_store        -- значение не читается, правая часть без побочных
+                           эффектов (присваивание можно не генерировать).
+    Присваивания переменным, которые видны из других функций (глобальные,
+    захваченные вложенными функциями), мёртвыми не считаются.
+    """
+
+    def __init__(self):
+        self.graph: Optional[CallGraph] = None
+        self._shared: Set[tuple] = set()     # переменные, видимые из нескольких функций
+        self._unresolved_names: Set[str] = set()  # имена из f-строк и вызываемые имена
+        self._loops: List[tuple] = []          # (живые на выходе, живые в заголовке)
+
+    def analyze(self, program: Program, resolve_names: bool = True) -> Program:
+        if resolve_names:
+            from .analyzer import SemanticAnalyzer
+            SemanticAnalyzer().analyze(program)
+        PurityAnalyzer().analyze(program, resolve_names=False)
+        self.graph = CallGraph.of(program)
+
+        assignments: Dict[tuple, List[Assignment]] = {}
+        owners: Dict[tuple, Optional[FunctionDeclaration]] = {}
+        for owner, node in self._nodes_with_owner(program):
+            if isinstance(node, Identifier) and node.binding is not None:
+                key = node.binding.key
+                if owners.setdefault(key, owner) is not owner:
+                    self._shared.add(key)
+            if isinstance(node, Assignment) and node.target.binding is not None:
+                assignments.setdefault(node.target.binding.key, []).append(node)
+            if isinstance(node, FunctionCall):
+                # Вызываемое имя не разрешается и может быть переменной (f = g; f())
+                self._unresolved_names.add(node.name.name)
+            if is_fstring(node):
+                # Имена в f-строках не размечены: такие переменные считаем
+                # живыми всегда (консервативно, по имени)
+                for expression in fstring_expressions(node):
+                    for inner in walk(expression):
+                        if isinstance(inner, Identifier):
+                            self._unresolved_names.add(inner.name)
+
+        for key, nodes in assignments.items():
+            single = len(nodes) == 1 and nodes[0].target.binding.is_definition
+            for node in nodes:
+                node.single_assignment = single
+                node.dead_store = False
+
+        for func in [None] + self.graph.functions:
+            body = program.statements if func is None else func.body.statements
+            self._statements(body, set())
+
+        # Объявление (let) нельзя удалить, если остаются другие присваивания
+        for key, nodes in assignments.items():
+            if not all(n.dead_store for n in nodes):
+                for node in nodes:
+                    if node.target.binding.is_definition:
+                        node.dead_store = False
+        return program
+
+    @staticmethod
+    def _nodes_with_owner(program: Program):
+        """(объемлющая функция, узел) для всех узлов программы"""
+        stack = [(program, None)]
+        while stack:
+            node, owner = stack.pop()
+            yield owner, node
+            if isinstance(node, FunctionDeclaration):
+                owner = node
+            for child in iter_child_nodes(node):
+                stack.append((child, owner))
+
+    # ---- ЧТЕНИЯ И ЭФФЕКТЫ ВЫРАЖЕНИЙ ----
+    @staticmethod
+    def _reads(node: Optional[Node]) -> Set[tuple]:
+        """Ключи переменных, читаемых выражением"""
+        if node is None:
+            return set()
+        return {n.binding.key for n in walk(node)
+                if isinstance(n, Identifier) and n.binding is not None}
+
+    def _has_side_effects(self, node: Node) -> bool:
+        nodes = list(walk(node))
+        i = 0
+        while i < len(nodes):
+            current = nodes[i]
+            i += 1
+            if isinstance(current, FunctionCall):
+                target = self.graph.target(current)
+                if target is not None:
+                    if target.purity == Purity.IMPURE:
+                        return True
+                elif BUILTIN_PURITY.get(current.name.name) != Purity.PURE:
+                    return True
+            elif is_fstring(current):
+                for expression in fstring_expressions(current):
+                    nodes.extend(walk(expression))
+        return False
+
+    def _is_live(self, target: Identifier, live: Set) -> bool:
+        key = target.binding.key
+        return key in live or key in self._shared or target.name in self._unresolved_names
+
+    # ---- ОПЕРАТОРЫ (обратный проход) ----
+    def _statements(self, statements: List[Node], live: Set) -> Set:
+        for statement in reversed(statements):
+            live = self._statement(statement, live)
+        return live
+
+    def _statement(self, node: Node, live: Set) -> Set:
+        if isinstance(node, Assignment):
+            target = node.target
+            if target.binding is None:
+                return live | self._reads(node.value)
+            if not self._is_live(target, live) and not self._has_side_effects(node.value):
+                node.dead_store = True
+                return live
+            node.dead_store = False
+            return (live - {target.binding.key}) | self._reads(node.value)
+        if isinstance(node, ExpressionStatement):
+            return live | self._reads(node.expression)
+        if isinstance(node, ReturnStatement):
+            return self._reads(node.value)
+        if isinstance(node, IfStatement):
+            then_live = self._statements(node.then_branch.statements, set(live))
+            if isinstance(node.else_branch, IfStatement):
+                else_live = self._statement(node.else_branch, set(live))
+            elif node.else_branch is not None:
+                else_live = self._statements(node.else_branch.statements, set(live))
+            else:
+                else_live = live
+            return then_live | else_live | self._reads(node.condition)
+        if isinstance(node, WhileLoop):
+            condition = self._reads(node.condition)
+            head = condition | live
+            while True:
+                self._loops.append((live, head))
+                body = self._statements(node.body.statements, set(head))
+                self._loops.pop()
+                new_head = condition | live | body
+                if new_head == head:
+                    return head
+                head = new_head
+        if isinstance(node, ForLoop):
+            variable = node.variable.binding.key if node.variable.binding else None
+            head = set(live)
+            while True:
+                self._loops.append((live, head))
+                body = self._statements(node.body.statements, set(head))
+                self._loops.pop()
+                new_head = live | (body - {variable})
+                if new_head == head:
+                    return head | self._reads(node.iterable)
+                head = new_head
+        if isinstance(node, BreakStatement):
+            return set(self._loops[-1][0])
+        if isinstance(node, ContinueStatement):
+            return set(self._loops[-1][1])
+        # Объявления функций и import переменных не читают
+        return live
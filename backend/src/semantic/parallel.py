@@ -0,0 +1,124 @@
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from .. import exceptions
+from ..parser.ast_nodes import Program, FunctionDeclaration
+from .analyzer import SemanticAnalyzer
+from .symbol_table import RecordingSymbolTable, SymbolType
+
+
+def _pack_error(error, line_offset: int = 0) -> tuple:
+    # У исключений транслятора свой __init__, поэтому они не переживают pickle
+    line = error.line + line_offset if error.line is not None else None
+    return type(error).__name__, error.message, line, error.column
+
+
+def _unpack_error(packed: tuple):
+    class_name, message, line, column = packed
+    error_class = getattr(exceptions, class_name)
+    error = error_class.__new__(error_class)
+    exceptions.TranspilerError.__init__(error, message, line, column)
+    return error
+
+
+def _analyze_chunk(events: list, tasks: list) -> list:
+    """Фаза 2 (в процессе-работнике): анализ тел функций одного куска.
+
+    events -- объявления глобальной области в порядке фазы 1,
+    tasks  -- (число объявлений, видимых в момент def, номер первой строки
+              функции, текст функции), отсортированы по первому полю.
+    Возвращает ошибки каждой функции в упакованном виде.
+    """
+    from ..lexer.lexer import Lexer
+    from ..parser.parser import Parser
+
+    analyzer = SemanticAnalyzer()
+    replayed = 0
+    results = []
+    for visible, first_line, text in tasks:
+        # Глобальная область растёт только дописыванием -- доигрываем журнал
+        for event in events[replayed:visible]:
+            analyzer.symbol_table.define(*event)
+        replayed = visible
+
+        # Отладочный вывод парсера уже был при разборе всего модуля
+        with contextlib.redirect_stdout(io.StringIO()):
+            function = Parser(Lexer(text)).parse().statements[0]
+        start = len(analyzer.errors)
+        analyzer.visit(function)
+        results.append([_pack_error(e, first_line - 1) for e in analyzer.errors[start:]])
+    return results
+
+
+class ParallelSemanticAnalyzer:
+    """Двухфазный семантический анализ для модулей с большим числом функций.
+
+    Фаза 1 последовательно анализирует операторы модуля и строит глобальную
+    таблицу символов, запоминая для каждой функции верхнего уровня, сколько
+    глобальных объявлений было видно в момент её определения. Фаза 2
+    анализирует тела функций в пуле процессов; в работники передаётся текст
+    функции (диапазон из SpanIndex) и журнал глобальных объявлений, а не
+    граф узлов. Ошибки сливаются в порядке исходного кода и совпадают с
+    ошибками SemanticAnalyzer.
+
+    Разметка Identifier.binding заполняется только для кода верхнего уровня:
+    тела функций разбираются заново в работниках.
+    """
+
+    def __init__(self, workers: Optional[int] = None, min_functions: int = 64):
+        self.workers = workers or os.cpu_count() or 1
+        self.min_functions = min_functions
+        self.errors = []
+
+    def analyze(self, program: Program) -> bool:
+        analyzer = SemanticAnalyzer(symbol_table_class=RecordingSymbolTable)
+        table = analyzer.symbol_table
+        index = program.span_index() if program.source is not None else None
+
+        # Фаза 1: операторы модуля; ошибки группируются по номеру оператора
+        errors_by_statement = []
+        tasks = []  # (номер оператора, видимых объявлений, строка def, текст функции)
+        for number, statement in enumerate(program.statements):
+            start = len(analyzer.errors)
+            if isinstance(statement, FunctionDeclaration) and index is not None:
+                tasks.append((number, len(table.module_events), statement.line,
+                              self._function_text(program.source, index, statement)))
+                local_symbol = table.lookup_local(statement.name)
+                if local_symbol is None or local_symbol.symbol_type != SymbolType.FUNCTION:
+                    # Объявление функции видно следующим операторам; ошибку
+                    # повторного объявления выдаст работник
+                    table.define(statement.name, SymbolType.FUNCTION, statement.return_type,
+                                 statement.line, statement.column)
+            else:
+                analyzer.visit(statement)
+            errors_by_statement.append(analyzer.errors[start:])
+
+        # Фаза 2: тела функций
+        for (number, _, _, _), packed in zip(tasks, self._run(table.module_events, tasks)):
+            errors_by_statement[number] = [_unpack_error(e) for e in packed]
+
+        self.errors = [error for errors in errors_by_statement for error in errors]
+        return len(self.errors) == 0
+
+    @staticmethod
+    def _function_text(source: str, index, function: FunctionDeclaration) -> str:
+        """Текст функции верхнего уровня: от начала её строки до конца тела"""
+        start = source.rfind('\n', 0, index.span(function)[0]) + 1
+        return source[start:index.span(function)[1]] + '\n'
+
+    def _run(self, events: list, tasks: list) -> List[list]:
+        jobs = [task[1:] for task in tasks]
+        if self.workers == 1 or len(jobs) < self.min_functions:
+            return _analyze_chunk(events, jobs)
+
+        chunk_size = max(1, -(-len(jobs) // (self.workers * 4)))
+        chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(_analyze_chunk, events[:chunk[-1][0]], chunk) for chunk in chunks]
+            for future in futures:
+                results.extend(future.result())
+        return results
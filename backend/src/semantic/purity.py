@@ -0,0 +1,201 @@
+from enum import Enum
+from typing import Dict, List, Optional, Set, Tuple
+from ..parser.ast_nodes import *
+from ..parser.walker import walk
+from ..parser.fstrings import is_fstring, fstring_expressions
+from .symbol_table import SymbolType
+from .call_graph import CallGraph
+
+
+class Purity(Enum):
+    PURE = "pure"            # результат зависит только от аргументов
+    READ_ONLY = "read_only"  # читает внешнее (глобальное) состояние, не меняя его
+    IMPURE = "impure"        # ввод-вывод, запись во внешние переменные, изменение аргументов
+
+
+_RANK = {Purity.PURE: 0, Purity.READ_ONLY: 1, Purity.IMPURE: 2}
+
+BUILTIN_PURITY = {
+    'print': Purity.IMPURE,
+    'input': Purity.IMPURE,
+    'len': Purity.PURE,
+    'str': Purity.PURE,
+    'int': Purity.PURE,
+    'float': Purity.PURE,
+    'bool': Purity.PURE,
+    'abs': Purity.PURE,
+    'min': Purity.PURE,
+    'max': Purity.PURE,
+    'round': Purity.PURE,
+    'range': Purity.PURE,
+    'list': Purity.PURE,
+}
+
+
+def worse(a: Purity, b: Purity) -> Purity:
+    return a if _RANK[a] >= _RANK[b] else b
+
+
+class _Effects:
+    """Локальные эффекты одной функции (без учёта вызываемых)"""
+
+    def __init__(self):
+        self.purity = Purity.PURE
+        self.reasons: List[str] = []
+        # (вызываемая функция модуля, номер параметра для каждого аргумента)
+        self.calls: List[Tuple[FunctionDeclaration, List[Optional[int]]]] = []
+        self.mutated: Set[int] = set()  # номера параметров, изменяемых самой функцией
+
+    def note(self, purity: Purity, reason: str):
+        self.purity = worse(self.purity, purity)
+        if reason not in self.reasons:
+            self.reasons.append(reason)
+
+
+class PurityAnalyzer:
+    """Классификация функций модуля: PURE, READ_ONLY или IMPURE.
+
+    Локальные эффекты функции -- вызовы встроенных функций с побочным
+    эффектом (print), вызовы неизвестных функций, чтение и запись переменных
+    вне самой функции, передача параметра туда, где он может быть изменён
+    (в этом подмножестве Python списки меняются только вызываемой функцией).
+    Затем по графу вызовов (CallGraph) вычисляется неподвижная точка: функция не чище
+    любой из вызываемых. Результат записывается в FunctionDeclaration.purity
+    и purity_reasons.
+    """
+
+    def __init__(self):
+        self.functions: List[FunctionDeclaration] = []
+        self.effects: Dict[int, _Effects] = {}
+        self.results: Dict[str, Purity] = {}
+        # id(функции) -> номера параметров, которые она (или вызываемые) может изменить
+        self.mutated: Dict[int, Set[int]] = {}
+        self.graph: Optional[CallGraph] = None
+
+    def analyze(self, program: Program, resolve_names: bool = True) -> Dict[str, Purity]:
+        if resolve_names:
+            from .analyzer import SemanticAnalyzer
+            SemanticAnalyzer().analyze(program)
+        global_names = self._global_variables(program)
+        self.graph = CallGraph.of(program)
+        self.functions = self.graph.functions
+        for func in self.functions:
+            self.effects[id(func)] = self._local_effects(func, global_names)
+
+        # Неподвижная точка: эффекты только ухудшаются, решётка конечна
+        purity = {id(f): self.effects[id(f)].purity for f in self.functions}
+        mutated = {id(f): set(self.effects[id(f)].mutated) for f in self.functions}
+        changed = True
+        while changed:
+            changed = False
+            for func in self.functions:
+                effects = self.effects[id(func)]
+                current = purity[id(func)]
+                for callee, params in effects.calls:
+                    current = worse(current, purity[id(callee)])
+                    for position, param in enumerate(params):
+                        if param is not None and position in mutated[id(callee)] \
+                                and param not in mutated[id(func)]:
+                            mutated[id(func)].add(param)
+                            changed = True
+                if mutated[id(func)]:
+                    current = Purity.IMPURE
+                if current != purity[id(func)]:
+                    purity[id(func)] = current
+                    changed = True
+
+        for func in self.functions:
+            effects = self.effects[id(func)]
+            reasons = list(effects.reasons)
+            for index in sorted(mutated[id(func)] - effects.mutated):
+                reasons.append(f"may mutate parameter '{func.parameters[index].name}'")
+            for callee, _ in effects.calls:
+                if purity[id(callee)] != Purity.PURE:
+                    reason = f"calls {purity[id(callee)].value} '{callee.name}'"
+                    if reason not in reasons:
+                        reasons.append(reason)
+            func.purity = purity[id(func)]
+            func.purity_reasons = reasons
+            self.results[func.name] = func.purity
+        self.mutated = mutated
+        return self.results
+
+    @staticmethod
+    def _global_variables(program: Program) -> Set[str]:
+        """Имена переменных модуля (для подстановок f-строк без разметки)"""
+        names = set()
+        for node in walk(program, prune=lambda n: isinstance(n, FunctionDeclaration)):
+            if isinstance(node, Assignment):
+                names.add(node.target.name)
+            elif isinstance(node, ForLoop):
+                names.add(node.variable.name)
+        return names
+
+    def _local_effects(self, func: FunctionDeclaration, global_names: Set[str]) -> _Effects:
+        effects = _Effects()
+        params = {p.binding.key: i for i, p in enumerate(func.parameters) if p.binding is not None}
+        param_names = {p.name: i for i, p in enumerate(func.parameters)}
+
+        # Собственные переменные: параметры и всё, что объявлено в теле
+        body = list(walk(func.body, prune=lambda n: isinstance(n, FunctionDeclaration)))
+        own_keys = set(params)
+        own_names = set(param_names)
+        for node in body:
+            if isinstance(node, Identifier) and node.binding is not None and node.binding.is_definition:
+                own_keys.add(node.binding.key)
+                own_names.add(node.name)
+            elif isinstance(node, FunctionDeclaration):
+                own_names.add(node.name)
+
+        def is_external(identifier: Identifier) -> bool:
+            binding = identifier.binding
+            if binding is not None:
+                return binding.symbol.symbol_type == SymbolType.VARIABLE and binding.key not in own_keys
+            # Подстановки f-строк: разметки нет, решаем по имени
+            return identifier.name not in own_names and identifier.name in global_names
+
+        def param_index(argument: Node) -> Optional[int]:
+            if not isinstance(argument, Identifier):
+                return None
+            if argument.binding is not None:
+                return params.get(argument.binding.key)
+            return param_names.get(argument.name) if argument.name in own_names else None
+
+        nodes = body
+        targets = set()
+        callee_names = set()
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            i += 1
+            if isinstance(node, FunctionDeclaration):
+                continue  # вложенная функция анализируется отдельно
+            if isinstance(node, Assignment):
+                targets.add(id(node.target))
+                if is_external(node.target):
+                    effects.note(Purity.IMPURE, f"assigns outer variable '{node.target.name}'")
+            elif isinstance(node, FunctionCall):
+                name = node.name.name
+                callee_names.add(id(node.name))
+                target = self.graph.target(node)
+                if target is not None:
+                    effects.calls.append((target, [param_index(a) for a in node.arguments]))
+                else:
+                    builtin = BUILTIN_PURITY.get(name)
+                    if builtin is None:
+                        effects.note(Purity.IMPURE, f"calls unknown '{name}'")
+                        for argument in node.arguments:
+                            index = param_index(argument)
+                            if index is not None:
+                                effects.mutated.add(index)
+                                effects.note(Purity.IMPURE,
+                                             f"passes parameter '{argument.name}' to unknown '{name}'")
+                    elif builtin != Purity.PURE:
+                        effects.note(builtin, f"calls {name}")
+            elif isinstance(node, Identifier):
+                if id(node) not in targets and id(node) not in callee_names and is_external(node):
+                    effects.note(Purity.READ_ONLY, f"reads outer variable '{node.name}'")
+            elif is_fstring(node):
+                for expression in fstring_expressions(node):
+                    nodes.extend(walk(expression))
+        return effects
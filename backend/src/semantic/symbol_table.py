@@ -22,14 +22,47 @@ class Symbol:
         self.data_type = data_type
         self.line = line
         self.column = column
+        # Координаты объявления: id области и номер слота в ней (заполняет таблица)
+        self.scope_id = 0
+        self.slot = 0
+
+
+class Binding:
+    """Результат разрешения имени, которым анализатор помечает узлы AST.
+
+    scope_id      -- id области видимости, где объявлено имя (0 -- глобальная)
+    slot          -- порядковый номер имени в этой области
+    is_definition -- True, если этот узел впервые объявляет имя
+    """
+
+    __slots__ = ('scope_id', 'slot', 'is_definition', 'symbol')
+
+    def __init__(self, symbol: Symbol, is_definition: bool):
+        self.scope_id = symbol.scope_id
+        self.slot = symbol.slot
+        self.is_definition = is_definition
+        self.symbol = symbol
+
+    @property
+    def key(self):
+        """Уникальный ключ переменной в пределах программы"""
+        return self.scope_id, self.slot
+
+    def __repr__(self):
+        kind = 'def' if self.is_definition else 'use'
+        return f"Binding({self.symbol.name}, scope={self.scope_id}, slot={self.slot}, {kind})"
 
 class Scope:
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, scope_id: int = 0):
         self.symbols = {}
         self.parent = parent
+        self.scope_id = scope_id
 
     def define(self, symbol: Symbol):
         """Добавляет символ в текущую область видимости"""
+        previous = self.symbols.get(symbol.name)
+        symbol.scope_id = self.scope_id
+        symbol.slot = previous.slot if previous is not None else len(self.symbols)
         self.symbols[symbol.name] = symbol
 
     def lookup(self, name: str) -> Optional[Symbol]:
@@ -49,10 +82,12 @@ class SymbolTable:
     def __init__(self):
         self.current_scope = Scope()
         self.scope_stack = [self.current_scope]
+        self._scope_count = 1
 
     def enter_scope(self):
         """Вход в новую область видимости"""
-        new_scope = Scope(self.current_scope)
+        new_scope = Scope(self.current_scope, self._scope_count)
+        self._scope_count += 1
         self.current_scope = new_scope
         self.scope_stack.append(new_scope)
 
@@ -62,10 +97,11 @@ class SymbolTable:
             self.scope_stack.pop()
             self.current_scope = self.scope_stack[-1]
 
-    def define(self, name: str, symbol_type: SymbolType, data_type: DataType, line: int, column: int):
+    def define(self, name: str, symbol_type: SymbolType, data_type: DataType, line: int, column: int) -> Symbol:
         """Добавляет символ в текущую область видимости"""
         symbol = Symbol(name, symbol_type, data_type, line, column)
         self.current_scope.define(symbol)
+        return symbol
 
     def lookup(self, name: str) -> Optional[Symbol]:
         """Ищет символ в текущей и всех родительских областях видимости"""
@@ -73,4 +109,88 @@ class SymbolTable:
 
     def lookup_local(self, name: str) -> Optional[Symbol]:
         """Ищет символ только в текущей области видимости"""
-        return self.current_scope.lookup_local(name)
\ No newline at end of file
+        return self.current_scope.lookup_local(name)
+
+class RecordingSymbolTable(SymbolTable):
+    """SymbolTable, записывающая объявления в глобальной области по порядку.
+
+    Журнал module_events позволяет воспроизвести глобальную область на любой
+    момент анализа (параллельный и инкрементальный анализ).
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.module_events = []
+
+    def define(self, name: str, symbol_type: SymbolType, data_type: DataType, line: int, column: int) -> Symbol:
+        if self.current_scope is self.scope_stack[0]:
+            self.module_events.append((name, symbol_type, data_type, line, column))
+        return super().define(name, symbol_type, data_type, line, column)
+
+class FlatSymbolTable:
+    """Таблица символов с разрешением имён за O(1).
+
+    Вместо цепочки Scope хранит для каждого имени стек видимых объявлений
+    (самое внутреннее -- на вершине) и для каждой области список имён,
+    объявленных в ней. lookup() -- одно обращение к словарю, exit_scope()
+    откатывает только k имён своей области. Интерфейс совпадает с SymbolTable.
+    """
+
+    def __init__(self):
+        self._bindings = {}  # name -> [(глубина области, Symbol), ...]
+        self._undo = [[]]  # для каждой открытой области: имена, объявленные в ней
+        self._scope_ids = [0]
+        self._scope_count = 1
+
+    @property
+    def depth(self) -> int:
+        """Глубина текущей области (0 -- глобальная)"""
+        return len(self._undo) - 1
+
+    def enter_scope(self):
+        """Вход в новую область видимости"""
+        self._undo.append([])
+        self._scope_ids.append(self._scope_count)
+        self._scope_count += 1
+
+    def exit_scope(self):
+        """Выход из текущей области видимости"""
+        if len(self._undo) > 1:
+            self._scope_ids.pop()
+            bindings = self._bindings
+            for name in self._undo.pop():
+                stack = bindings[name]
+                stack.pop()
+                if not stack:
+                    del bindings[name]
+
+    def define(self, name: str, symbol_type: SymbolType, data_type: DataType, line: int, column: int) -> Symbol:
+        """Добавляет символ в текущую область видимости"""
+        symbol = Symbol(name, symbol_type, data_type, line, column)
+        depth = len(self._undo) - 1
+        symbol.scope_id = self._scope_ids[-1]
+        stack = self._bindings.get(name)
+        if stack is not None and stack[-1][0] == depth:
+            # Повторное объявление в той же области перекрывает предыдущее
+            symbol.slot = stack[-1][1].slot
+            stack[-1] = (depth, symbol)
+            return symbol
+        symbol.slot = len(self._undo[-1])
+        if stack is None:
+            self._bindings[name] = [(depth, symbol)]
+        else:
+            stack.append((depth, symbol))
+        self._undo[-1].append(name)
+        return symbol
+
+    def lookup(self, name: str) -> Optional[Symbol]:
+        """Ищет символ в текущей и всех родительских областях видимости"""
+        stack = self._bindings.get(name)
+        return stack[-1][1] if stack else None
+
+    def lookup_local(self, name: str) -> Optional[Symbol]:
+        """Ищет символ только в текущей области видимости"""
+        stack = self._bindings.get(name)
+        if stack and stack[-1][0] == len(self._undo) - 1:
+            return stack[-1][1]
+        return None
@@ -0,0 +1,445 @@
+from typing import Dict, List, Optional
+from ..parser.ast_nodes import *
+from ..parser.walker import walk, iter_child_nodes
+from .symbol_table import SymbolType
+
+# Типы результатов встроенных функций (None -- вычисляется по аргументам)
+BUILTIN_RETURN_TYPES = {
+    'print': DataType.NONE,
+    'len': DataType.INT,
+    'int': DataType.INT,
+    'float': DataType.FLOAT,
+    'str': DataType.STRING,
+    'bool': DataType.BOOLEAN,
+    'input': DataType.STRING,
+    'range': DataType.LIST,
+    'list': DataType.LIST,
+    'abs': None,
+    'min': None,
+    'max': None,
+}
+
+_EXPRESSIONS = (Identifier, Literal, BinaryOperation, UnaryOperation, FunctionCall)
+_ARITHMETIC = ('+', '-', '*', '%')
+_COMPARISON = ('==', '!=', '>', '<', '>=', '<=')
+
+
+def join_types(a: Optional[DataType], b: Optional[DataType]) -> Optional[DataType]:
+    """Объединение типов в точке слияния потоков.
+
+    None -- "пока ничего не известно" (нижний элемент решётки),
+    INT и FLOAT объединяются в FLOAT, остальные различные типы -- в ANY.
+    """
+    if a is None:
+        return b
+    if b is None or a == b:
+        return a
+    if {a, b} == {DataType.INT, DataType.FLOAT}:
+        return DataType.FLOAT
+    return DataType.ANY
+
+
+def _join_envs(a: Optional[dict], b: Optional[dict]) -> Optional[dict]:
+    """Слияние состояний; None -- недостижимая точка программы"""
+    if a is None:
+        return None if b is None else dict(b)
+    if b is None:
+        return dict(a)
+    # Переменная, не присвоенная на одном из путей, там просто не определена
+    return {key: join_types(a.get(key), b.get(key)) for key in a.keys() | b.keys()}
+
+
+def binary_result_type(operator: str, left: Optional[DataType],
+                       right: Optional[DataType], right_node: Node = None) -> Optional[DataType]:
+    """Тип результата бинарной операции в семантике Python"""
+    numeric = (DataType.INT, DataType.FLOAT)
+    if operator in _COMPARISON:
+        return DataType.BOOLEAN
+    if operator in ('and', 'or'):
+        # and/or возвращают один из операндов
+        return join_types(left, right)
+    if left is None or right is None:
+        return None
+    if operator == '/':
+        return DataType.FLOAT if left in numeric and right in numeric else DataType.ANY
+    if operator == '**':
+        if DataType.FLOAT in (left, right) and left in numeric and right in numeric:
+            return DataType.FLOAT
+        # int ** int целое только при неотрицательном показателе
+        if (left == right == DataType.INT and isinstance(right_node, Literal)
+                and right_node.value >= 0):
+            return DataType.INT
+        return DataType.ANY
+    if operator in _ARITHMETIC:
+        if left in numeric and right in numeric:
+            return join_types(left, right)
+        if operator == '+' and left == right and left in (DataType.STRING, DataType.LIST):
+            return left
+        if operator == '*' and {left, right} in ({DataType.STRING, DataType.INT},
+                                                 {DataType.LIST, DataType.INT}):
+            return left if left != DataType.INT else right
+    return DataType.ANY
+
+
+class TypeInferencer:
+    """Потоково-чувствительный вывод типов в пределах модуля.
+
+    Типы литералов и результатов вызовов распространяются через присваивания,
+    return и параметры (по всем местам вызова функции). Результат записывается
+    в узлы: expression.inferred_type, у функций -- inferred_return_type,
+    у параметров -- inferred_type идентификатора.
+
+    Переменные различаются по Binding.key, поэтому перед выводом имена
+    разрешаются SemanticAnalyzer (если resolve_names=True). Локальные
+    переменные отслеживаются по потоку управления; переменные, которые видны
+    из нескольких функций, получают один тип -- объединение всех присваиваний.
+
+    Для выражений-списков выводится и тип элементов (inferred_element_type):
+    без учёта потока, объединением по всем спискам, которые получает
+    переменная, параметр (по всем местам вызова) или возвращает функция.
+    Его использует, например, optimizer.TypedArrayMarker.
+    """
+
+    def __init__(self):
+        self.functions: Dict[str, List[FunctionDeclaration]] = {}
+        self.param_types: Dict[int, List[Optional[DataType]]] = {}
+        self.return_types: Dict[int, Optional[DataType]] = {}
+        self.shared_types: Dict[tuple, Optional[DataType]] = {}
+        self._shared = set()
+        self._escaping = set()
+        self._changed = False
+        self._loops = []  # стек (состояния break, состояния continue)
+        # Типы элементов списков: по ключу переменной и по id функции (результат)
+        self.element_types: Dict[tuple, Optional[DataType]] = {}
+        self.return_element_types: Dict[int, Optional[DataType]] = {}
+
+    def infer(self, program: Program, resolve_names: bool = True) -> Program:
+        if resolve_names:
+            from .analyzer import SemanticAnalyzer
+            SemanticAnalyzer().analyze(program)
+        self._collect(program)
+
+        bodies = [(None, program.statements)] + [
+            (func, func.body.statements) for decls in self.functions.values() for func in decls]
+        # Итерация до неподвижной точки: типы только растут по решётке
+        while True:
+            self._changed = False
+            for func, statements in bodies:
+                self._analyze_body(func, statements)
+            if not self._changed:
+                break
+
+        for decls in self.functions.values():
+            for func in decls:
+                func.inferred_return_type = self._final(self.return_types[id(func)])
+                for param, param_type in zip(func.parameters, self.param_types[id(func)]):
+                    param.inferred_type = self._final(param_type)
+        for node in walk(program):
+            if isinstance(node, _EXPRESSIONS) and node.inferred_type is None:
+                node.inferred_type = DataType.ANY
+
+        self._infer_elements(program)
+        for node in walk(program):
+            if isinstance(node, _EXPRESSIONS) and node.inferred_type == DataType.LIST:
+                node.inferred_element_type = self._final(self._element_type(node))
+        return program
+
+    @staticmethod
+    def _final(data_type: Optional[DataType]) -> DataType:
+        return DataType.ANY if data_type is None else data_type
+
+    # ---- ПОДГОТОВКА ----
+    def _collect(self, program: Program):
+        """Функции модуля, переменные из нескольких функций, утёкшие функции"""
+        owners = {}
+        stack = [(program, None)]
+        while stack:
+            node, owner = stack.pop()
+            if isinstance(node, FunctionDeclaration):
+                self.functions.setdefault(node.name, []).append(node)
+                self.param_types[id(node)] = [None] * len(node.parameters)
+                self.return_types[id(node)] = None
+                owner = node
+            elif isinstance(node, FunctionCall):
+                # Имя вызываемой функции -- не обращение к переменной
+                for argument in node.arguments:
+                    stack.append((argument, owner))
+                continue
+            elif isinstance(node, Identifier) and node.binding is not None:
+                symbol = node.binding.symbol
+                if symbol.symbol_type == SymbolType.FUNCTION:
+                    self._escaping.add(symbol.name)
+                key = node.binding.key
+                if owners.setdefault(key, owner) is not owner:
+                    self._shared.add(key)
+            for child in iter_child_nodes(node):
+                stack.append((child, owner))
+
+    def _callee(self, name: str) -> Optional[FunctionDeclaration]:
+        """Объявление функции по имени, если оно однозначно"""
+        decls = self.functions.get(name, [])
+        if len(decls) == 1 and name not in self._escaping:
+            return decls[0]
+        return None
+
+    def _widen(self, table: dict, key, data_type: Optional[DataType]):
+        old = table.get(key)
+        new = join_types(old, data_type)
+        if new != old:
+            table[key] = new
+            self._changed = True
+
+    # ---- ОПЕРАТОРЫ ----
+    def _analyze_body(self, func: Optional[FunctionDeclaration], statements: List[Node]):
+        env = {}
+        if func is not None:
+            params = self.param_types[id(func)]
+            if len(self.functions[func.name]) > 1 or func.name in self._escaping:
+                params[:] = [DataType.ANY] * len(params)
+            for param, param_type in zip(func.parameters, params):
+                if param.binding is not None:
+                    self._assign(env, param.binding.key, param_type)
+        self._current = func
+        env = self._statements(statements, env)
+        if func is not None and env is not None:
+            # Выход из функции без return возвращает None
+            self._widen(self.return_types, id(func), DataType.NONE)
+
+    def _assign(self, env: dict, key, data_type: Optional[DataType]):
+        if key in self._shared:
+            self._widen(self.shared_types, key, data_type)
+        else:
+            env[key] = data_type
+
+    def _statements(self, statements: List[Node], env: Optional[dict]) -> Optional[dict]:
+        for statement in statements:
+            if env is None:
+                break  # недостижимый код после return/break/continue
+            env = self._statement(statement, env)
+        return env
+
+    def _statement(self, node: Node, env: dict) -> Optional[dict]:
+        if isinstance(node, Assignment):
+            value_type = self._expression(node.value, env)
+            node.target.inferred_type = value_type
+            if node.target.binding is not None:
+                self._assign(env, node.target.binding.key, value_type)
+            return env
+        if isinstance(node, ExpressionStatement):
+            self._expression(node.expression, env)
+            return env
+        if isinstance(node, ReturnStatement):
+            value_type = self._expression(node.value, env) if node.value else DataType.NONE
+            if self._current is not None:
+                self._widen(self.return_types, id(self._current), value_type)
+            return None
+        if isinstance(node, IfStatement):
+            self._expression(node.condition, env)
+            then_env = self._statements(node.then_branch.statements, dict(env))
+            else_env = dict(env)
+            if isinstance(node.else_branch, IfStatement):
+                else_env = self._statement(node.else_branch, else_env)
+            elif node.else_branch is not None:
+                else_env = self._statements(node.else_branch.statements, else_env)
+            return _join_envs(then_env, else_env)
+        if isinstance(node, WhileLoop):
+            return self._loop(node, env, lambda head: self._expression(node.condition, head))
+        if isinstance(node, ForLoop):
+            iterable_type = self._expression(node.iterable, env)
+            item_type = self._item_type(node.iterable, iterable_type)
+
+            def bind_variable(head):
+                node.variable.inferred_type = item_type
+                if node.variable.binding is not None:
+                    self._assign(head, node.variable.binding.key, item_type)
+            return self._loop(node, env, bind_variable)
+        if isinstance(node, BreakStatement):
+            self._loops[-1][0].append(env)
+            return None
+        if isinstance(node, ContinueStatement):
+            self._loops[-1][1].append(env)
+            return None
+        # Вложенные функции анализируются отдельно, import типов не меняет
+        return env
+
+    def _loop(self, node, env: dict, enter) -> Optional[dict]:
+        """Цикл: состояние в заголовке доводится до неподвижной точки"""
+        head = dict(env)
+        while True:
+            self._loops.append(([], []))
+            body_env = dict(head)
+            enter(body_env)
+            end = self._statements(node.body.statements, body_env)
+            breaks, continues = self._loops.pop()
+            back = end
+            for state in continues:
+                back = _join_envs(back, state)
+            new_head = _join_envs(head, back)
+            if new_head == head:
+                break
+            head = new_head
+        # Выход: условие ложно в заголовке либо break
+        exit_env = dict(head)
+        for state in breaks:
+            exit_env = _join_envs(exit_env, state)
+        return exit_env
+
+    @staticmethod
+    def _item_type(iterable: Node, iterable_type: Optional[DataType]) -> DataType:
+        if (isinstance(iterable, FunctionCall) and iterable.name.name == 'range'
+                and BUILTIN_RETURN_TYPES.get('range') == iterable_type):
+            return DataType.INT
+        if iterable_type == DataType.STRING:
+            return DataType.STRING
+        return DataType.ANY
+
+    # ---- ВЫРАЖЕНИЯ ----
+    def _expression(self, node: Node, env: dict) -> Optional[DataType]:
+        result = self._expression_type(node, env)
+        node.inferred_type = result
+        return result
+
+    def _expression_type(self, node: Node, env: dict) -> Optional[DataType]:
+        if isinstance(node, Literal):
+            if isinstance(node.value, list):
+                self._list_elements(node.value, env)
+            return node.literal_type
+        if isinstance(node, Identifier):
+            binding = node.binding
+            if binding is None:
+                return DataType.ANY
+            if binding.key in self._shared:
+                return self.shared_types.get(binding.key)
+            if binding.symbol.symbol_type == SymbolType.FUNCTION:
+                return DataType.ANY
+            return env.get(binding.key, DataType.ANY)
+        if isinstance(node, BinaryOperation):
+            left = self._expression(node.left, env)
+            right = self._expression(node.right, env)
+            return binary_result_type(node.operator, left, right, node.right)
+        if isinstance(node, UnaryOperation):
+            operand = self._expression(node.operand, env)
+            if node.operator == 'not':
+                return DataType.BOOLEAN
+            if operand in (DataType.INT, DataType.FLOAT, None):
+                return operand
+            return DataType.INT if operand == DataType.BOOLEAN else DataType.ANY
+        if isinstance(node, FunctionCall):
+            return self._call(node, env)
+        return DataType.ANY
+
+    def _list_elements(self, values: list, env: dict):
+        stack = [values]
+        while stack:
+            for item in stack.pop():
+                if isinstance(item, Node):
+                    self._expression(item, env)
+                elif isinstance(item, list):
+                    stack.append(item)
+
+    def _call(self, node: FunctionCall, env: dict) -> Optional[DataType]:
+        argument_types = [self._expression(a, env) for a in node.arguments]
+        name = node.name.name
+        func = self._callee(name)
+        if func is not None:
+            params = self.param_types[id(func)]
+            for i in range(len(params)):
+                self._widen_param(params, i, argument_types[i] if i < len(argument_types) else DataType.ANY)
+            return self.return_types[id(func)]
+        if name in self.functions:
+            return DataType.ANY
+        if name in BUILTIN_RETURN_TYPES:
+            result = BUILTIN_RETURN_TYPES[name]
+            if result is None:
+                result = None
+                for argument_type in argument_types:
+                    result = join_types(result, argument_type)
+                if result not in (DataType.INT, DataType.FLOAT, None):
+                    result = DataType.ANY
+            return result
+        return DataType.ANY
+
+    # ---- ЭЛЕМЕНТЫ СПИСКОВ ----
+    def _infer_elements(self, program: Program):
+        """Типы элементов по всем значениям переменных, параметров и результатов"""
+        flows = []  # (таблица, ключ, выражение или None -- неизвестное значение)
+        for node in walk(program):
+            if isinstance(node, Assignment) and node.target.binding is not None:
+                flows.append((self.element_types, node.target.binding.key, node.value))
+            elif isinstance(node, ForLoop) and node.variable.binding is not None:
+                flows.append((self.element_types, node.variable.binding.key, None))
+            elif isinstance(node, FunctionCall):
+                func = self._callee(node.name.name)
+                if func is None:
+                    continue
+                for i, param in enumerate(func.parameters):
+                    if param.binding is not None:
+                        argument = node.arguments[i] if i < len(node.arguments) else None
+                        flows.append((self.element_types, param.binding.key, argument))
+        for decls in self.functions.values():
+            for func in decls:
+                if len(decls) > 1 or func.name in self._escaping:
+                    # Вызовы не все известны: о параметрах ничего не известно
+                    flows.extend((self.element_types, p.binding.key, None)
+                                 for p in func.parameters if p.binding is not None)
+                for node in walk(func.body, prune=lambda n: isinstance(n, FunctionDeclaration)):
+                    if isinstance(node, ReturnStatement) and node.value is not None:
+                        flows.append((self.return_element_types, id(func), node.value))
+
+        # Неподвижная точка: типы элементов только растут по решётке
+        changed = True
+        while changed:
+            changed = False
+            for table, key, value in flows:
+                new = join_types(table.get(key), DataType.ANY if value is None
+                                 else self._element_type(value))
+                if new != table.get(key):
+                    table[key] = new
+                    changed = True
+
+    def _element_type(self, node: Node) -> Optional[DataType]:
+        """Тип элементов значения node; None -- не список (или пустой)"""
+        if node.inferred_type == DataType.ANY:
+            return DataType.ANY  # может оказаться списком чего угодно
+        if node.inferred_type != DataType.LIST:
+            return None
+        if isinstance(node, Literal) and isinstance(node.value, list):
+            result = None
+            for item in node.value:
+                if isinstance(item, Node):
+                    item_type = item.inferred_type
+                elif isinstance(item, bool):
+                    item_type = DataType.BOOLEAN
+                elif isinstance(item, int):
+                    item_type = DataType.INT
+                elif isinstance(item, float):
+                    item_type = DataType.FLOAT
+                else:
+                    item_type = DataType.ANY
+                result = join_types(result, item_type)
+            return result
+        if isinstance(node, Identifier) and node.binding is not None:
+            return self.element_types.get(node.binding.key)
+        if isinstance(node, BinaryOperation):
+            # [..] + [..], [..] * n, and/or
+            return join_types(self._element_type(node.left), self._element_type(node.right))
+        if isinstance(node, FunctionCall):
+            name = node.name.name
+            func = self._callee(name)
+            if func is not None:
+                return self.return_element_types.get(id(func))
+            if name not in self.functions:
+                if name == 'range':
+                    return DataType.INT
+                if name == 'list' and len(node.arguments) == 1:
+                    argument = node.arguments[0]
+                    if argument.inferred_type == DataType.STRING:
+                        return DataType.STRING
+                    return self._element_type(argument)
+        return DataType.ANY
+
+    def _widen_param(self, params: list, index: int, data_type: Optional[DataType]):
+        new = join_types(params[index], data_type)
+        if new != params[index]:
+            params[index] = new
+            self._changed = True
@@ -1,8 +1,13 @@
 # transpiler.py - исправленная версия
+import os
+
 try:
     from .lexer.lexer import Lexer
     from .parser.parser import Parser
     from .semantic.analyzer import SemanticAnalyzer
+    from .semantic.liveness import LivenessAnalyzer
+    from .optimizer import ConstantFolder, DeadCodeEliminator, TailCallEliminator, Memoizer, Inliner, \
+        LoopInvariantMotion, TypedArrayMarker
     from .codegen.generator import CodeGenerator
     from .exceptions import TranspilerError
 except ImportError:
@@ -10,44 +15,211 @@ except ImportError:
     from lexer.lexer import Lexer
     from parser.parser import Parser
     from semantic.analyzer import SemanticAnalyzer
+    from semantic.liveness import LivenessAnalyzer
+    from optimizer import ConstantFolder, DeadCodeEliminator, TailCallEliminator, Memoizer, Inliner, \
+        LoopInvariantMotion, TypedArrayMarker
     from codegen.generator import CodeGenerator
     from exceptions import TranspilerError
 
 
+# Режимы семантического анализа
+ANALYSIS_OFF = None
+ANALYSIS_SEPARATE = 'separate'  # отдельный проход анализатора перед генерацией
+ANALYSIS_FUSED = 'fused'        # анализ во время генерации, один обход AST
+
+
+class TranspileResult:
+    """Результат транспиляции: JS-код, семантические ошибки и карта исходников (JSON)"""
+
+    def __init__(self, code: str, errors: list, source_map: str = None):
+        self.code = code
+        self.errors = errors
+        self.source_map = source_map
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
 class Transpiler:
-    def __init__(self):
+    def __init__(self, analysis=ANALYSIS_OFF, optimize: bool = False, source_map: bool = False,
+                 minify: bool = False, memoize: bool = False, memoize_size: int = None,
+                 typed_arrays: bool = False, runtime_module: str = None):
+        if analysis not in (ANALYSIS_OFF, ANALYSIS_SEPARATE, ANALYSIS_FUSED):
+            raise ValueError(f"Unknown analysis mode: {analysis}")
+        self.analysis = analysis
+        self.optimize = optimize
+        self.source_map = source_map
+        self.minify = minify
+        # Кэш чистых рекурсивных функций; директива # pyjs: memoize действует и без флага
+        self.memoize = memoize
+        self.memoize_size = memoize_size
+        # Числовые списки, которые только читаются, -- Float64Array/Int32Array
+        self.typed_arrays = typed_arrays
+        # Импорт хелперов рантайма из общего ES-модуля (codegen.runtime) вместо копий в файле
+        self.runtime_module = runtime_module
+        # Результаты оптимизаций последней транспиляции (optimize), см. --dump-analysis
+        self.inlined_calls = 0      # подставленных вызовов
+        self.inlined_functions = []  # подставленные функции
+        self.hoisted_invariants = 0  # вынесенных из циклов выражений
+        self.guarded_loops = 0      # циклов с проверкой перед вынесенными выражениями
+        self.typed_array_literals = 0  # литералов -- типизированных массивов (typed_arrays)
+        self.plain_arrays = {}      # числовой список -> почему обычный массив
         self.lexer = None
         self.parser = None
         self.semantic_analyzer = SemanticAnalyzer()
-        self.code_generator = CodeGenerator()
+        self.code_generator = CodeGenerator(fused_analysis=analysis == ANALYSIS_FUSED,
+                                            optimize=optimize, source_map=source_map,
+                                            minify=minify, runtime_module=runtime_module)
 
     def transpile(self, source_code: str) -> str:
         """
         Транспилирует код Python в JavaScript
         """
-        try:
-            print(f"DEBUG: Transpiling: {repr(source_code)}")  # ДЛЯ ОТЛАДКИ
-
-            # 1. Лексический анализ (только для отладки)
-            debug_lexer = Lexer(source_code)
-            tokens = debug_lexer.tokenize()
-            print(f"DEBUG: Tokens: {tokens}")  # ДЛЯ ОТЛАДКИ
+        return self.compile(source_code).code
 
-            # 2. Синтаксический анализ (используем ОТДЕЛЬНЫЙ лексер)
-            parser_lexer = Lexer(source_code)  # ← ВАЖНО: новый лексер для парсера
-            self.parser = Parser(parser_lexer)
-            ast = self.parser.parse()
-            print(f"DEBUG: AST: {ast}")  # ДЛЯ ОТЛАДКИ
-
-            # 3. Семантический анализ (пока закомментируем)
-            # self.semantic_analyzer.analyze(ast)
+    def compile(self, source_code: str) -> TranspileResult:
+        """
+        Транспилирует код и возвращает его вместе с семантическими ошибками
+        """
+        try:
+            ast, errors = self._front_end(source_code)
 
             # 4. Генерация кода
             js_code = self.code_generator.generate(ast)
             print(f"DEBUG: Generated JS: {repr(js_code)}")  # ДЛЯ ОТЛАДКИ
+            if self.analysis == ANALYSIS_FUSED:
+                errors = self.code_generator.errors
+
+            return TranspileResult(js_code, errors, self._source_map_json())
+
+        except Exception as e:
+            print(f"DEBUG: Error: {e}")  # ДЛЯ ОТЛАДКИ
+            raise TranspilerError(f"Transpilation failed: {str(e)}")
 
-            return js_code
+    def transpile_file(self, source, destination) -> TranspileResult:
+        """
+        Транспилирует файл source в destination (пути или открытые потоки,
+        destination может быть бинарным). Код пишется в поток по мере
+        генерации и целиком в памяти не собирается, поэтому в результате
+        code = None. С source_map карта пишется рядом (destination + '.map')
+        и на неё ссылается комментарий sourceMappingURL; для потока карта
+        возвращается только в результате.
+        """
+        if hasattr(source, 'read'):
+            source_code = source.read()
+        else:
+            with open(source, encoding='utf-8') as source_file:
+                source_code = source_file.read()
+
+        if hasattr(destination, 'write'):
+            return self._transpile_to(source_code, destination)
+        map_path = str(destination) + '.map'
+        with open(destination, 'w', encoding='utf-8', newline='\n') as output:
+            result = self._transpile_to(source_code, output, source_name=str(source),
+                                        map_name=os.path.basename(map_path))
+        if result.source_map is not None:
+            with open(map_path, 'w', encoding='utf-8') as map_file:
+                map_file.write(result.source_map)
+        return result
+
+    def _transpile_to(self, source_code: str, stream, source_name: str = None,
+                      map_name: str = None) -> TranspileResult:
+        try:
+            ast, errors = self._front_end(source_code)
+
+            # 4. Генерация кода прямо в поток; файл завершается переводом строки
+            self.code_generator.generate_to(ast, stream)
+            tail = "\n"
+            if self.source_map and map_name is not None:
+                tail += f"//# sourceMappingURL={map_name}\n"
+            stream.write(tail.encode("utf-8") if self.code_generator.writer.binary else tail)
+            if self.analysis == ANALYSIS_FUSED:
+                errors = self.code_generator.errors
+
+            return TranspileResult(None, errors, self._source_map_json(source_name, map_name))
 
         except Exception as e:
             print(f"DEBUG: Error: {e}")  # ДЛЯ ОТЛАДКИ
-            raise TranspilerError(f"Transpilation failed: {str(e)}")
\ No newline at end of file
+            raise TranspilerError(f"Transpilation failed: {str(e)}")
+
+    def _source_map_json(self, source_name: str = None, map_name: str = None):
+        source_map = self.code_generator.source_map
+        if source_map is None:
+            return None
+        if source_name is not None:
+            source_map.source = os.path.basename(source_name)
+        if map_name is not None:
+            source_map.file = map_name[:-len('.map')]
+        return source_map.to_json()
+
+    def _front_end(self, source_code: str):
+        """Разбор, семантический анализ и оптимизации AST: (ast, ошибки)"""
+        print(f"DEBUG: Transpiling: {repr(source_code)}")  # ДЛЯ ОТЛАДКИ
+        self.inlined_calls = 0
+        self.inlined_functions = []
+        self.hoisted_invariants = 0
+        self.guarded_loops = 0
+        self.typed_array_literals = 0
+        self.plain_arrays = {}
+
+        # 1. Лексический анализ (только для отладки)
+        debug_lexer = Lexer(source_code)
+        tokens = debug_lexer.tokenize()
+        print(f"DEBUG: Tokens: {tokens}")  # ДЛЯ ОТЛАДКИ
+
+        # 2. Синтаксический анализ (используем ОТДЕЛЬНЫЙ лексер)
+        parser_lexer = Lexer(source_code)  # ← ВАЖНО: новый лексер для парсера
+        self.parser = Parser(parser_lexer)
+        ast = self.parser.parse()
+        print(f"DEBUG: AST: {ast}")  # ДЛЯ ОТЛАДКИ
+
+        # 3. Семантический анализ: отдельным проходом или вместе с генерацией
+        errors = []
+        if self.analysis == ANALYSIS_SEPARATE:
+            self.semantic_analyzer = SemanticAnalyzer()
+            self.semantic_analyzer.analyze(ast)
+            errors = self.semantic_analyzer.errors
+
+        # 3a. Оптимизации: свёртка констант, удаление недостижимого кода и
+        # неиспользуемых функций, хвостовая саморекурсия -- циклом, const для
+        # единственных присваиваний, удаление мёртвых присваиваний. Имена
+        # разрешаются заново: проходы меняют дерево (удалённое присваивание
+        # могло быть объявлением), а ошибки отдельного анализа уже собраны по
+        # исходной программе
+        if self.optimize:
+            ast = ConstantFolder().fold(ast)
+            ast = DeadCodeEliminator().eliminate(ast)
+            ast = TailCallEliminator().eliminate(ast)
+            LivenessAnalyzer().analyze(ast)
+
+        # 3b. Кэширование результатов чистых функций
+        Memoizer(all_recursive=self.memoize, max_size=self.memoize_size).mark(ast)
+
+        # 3c. Типизированные массивы (до подстановки: её временные переменные
+        # анализ не отслеживает)
+        if self.typed_arrays:
+            marker = TypedArrayMarker()
+            marker.mark(ast, resolve_names=not self.optimize)
+            self.typed_array_literals = marker.typed
+            self.plain_arrays = marker.fallbacks
+
+        # 3d. Подстановка маленьких функций (после выбора кэшируемых: их не
+        # подставляем), затем свёртка подставленных констант и удаление
+        # функций, которые больше нигде не вызываются
+        if self.optimize:
+            inliner = Inliner()
+            ast = inliner.inline(ast, resolve_names=False)
+            self.inlined_calls = inliner.inlined
+            self.inlined_functions = inliner.functions
+            if inliner.inlined:
+                ast = ConstantFolder().fold(ast)
+                ast = DeadCodeEliminator().eliminate(ast)
+
+        # 3e. Вынос инвариантов циклов (в том числе подставленных выражений)
+        if self.optimize:
+            motion = LoopInvariantMotion()
+            ast = motion.hoist(ast, resolve_names=False)
+            self.hoisted_invariants = motion.hoisted
+            self.guarded_loops = motion.guarded
+        return ast, errors
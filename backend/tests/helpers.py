@@ -0,0 +1,51 @@
+import contextlib
+import io
+import os
+import subprocess
+import tempfile
+
+from backend.src import cli
+from backend.src.transpiler import Transpiler
+
+
+def quiet():
+    """Подавляет отладочный вывод конвейера (DEBUG-печать лексера, парсера и генератора)"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+def transpile(source, **options):
+    """JavaScript-код программы"""
+    with quiet():
+        return Transpiler(**options).transpile(source)
+
+
+def compile_source(source, **options):
+    """TranspileResult: код и семантические ошибки"""
+    with quiet():
+        return Transpiler(**options).compile(source)
+
+
+def run_python(source):
+    """Вывод программы в CPython"""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        exec(source, {'__name__': '__main__'})
+    return output.getvalue()
+
+
+def run_node(code, *node_options):
+    """(код возврата, stdout, stderr) запуска JavaScript в node"""
+    run = subprocess.run(['node', *node_options, '-e', code], capture_output=True, text=True, timeout=30)
+    return run.returncode, run.stdout, run.stderr
+
+
+def run_cli(source, *arguments):
+    """stdout запуска cli.main для программы из временного файла"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "program.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(source)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            cli.main([path, *arguments])
+    return output.getvalue()
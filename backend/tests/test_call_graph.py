@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+import json
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.semantic.call_graph import CallGraph
+
+
+class TestCallGraph(unittest.TestCase):
+
+    SOURCE = '''def leaf(x):
+    return x * 2
+
+def fact(n):
+    if n <= 1:
+        return 1
+    return n * fact(n - 1)
+
+def is_even(n):
+    if n == 0:
+        return True
+    return is_odd(n - 1)
+
+def is_odd(n):
+    if n == 0:
+        return False
+    return is_even(n - 1)
+
+def outer(a):
+    def helper(b):
+        return leaf(b)
+    return helper(a)
+
+def shadow(leaf):
+    return leaf(1)
+
+def report(v):
+    print(f"{v} -> {fact(v)}")
+
+result = outer(3)
+'''
+
+    def setUp(self):
+        self.program = Parser(Lexer(self.SOURCE)).parse()
+        self.graph = CallGraph.of(self.program)
+
+    def _f(self, name):
+        return next(f for f in self.graph.functions if f.name == name)
+
+    def _names(self, funcs):
+        return [f.name for f in funcs]
+
+    def test_edges(self):
+        """Тест рёбер графа, включая вложенные функции и f-строки"""
+        self.assertEqual(self._names(self.graph.callees(self._f('outer'))), ['helper'])
+        self.assertEqual(self._names(self.graph.callees(self._f('helper'))), ['leaf'])
+        self.assertEqual(self._names(self.graph.callees(self._f('report'))), ['fact'])
+        self.assertEqual(self.graph.unresolved(self._f('report')), ['print'])
+        self.assertEqual(self._names(self.graph.callees(None)), ['outer'])
+        self.assertEqual(self._names(self.graph.callers(self._f('leaf'))), ['helper'])
+        self.assertIs(self.graph.parent(self._f('helper')), self._f('outer'))
+
+    def test_parameter_shadows_function(self):
+        """Тест: параметр с именем функции -- вызов неизвестного значения"""
+        self.assertEqual(self.graph.callees(self._f('shadow')), [])
+        self.assertEqual(self.graph.unresolved(self._f('shadow')), ['leaf'])
+
+    def test_recursion_and_leaves(self):
+        """Тест: прямая и взаимная рекурсия, листовые функции"""
+        self.assertTrue(self.graph.is_recursive(self._f('fact')))
+        self.assertTrue(self.graph.is_self_recursive(self._f('fact')))
+        self.assertTrue(self.graph.is_recursive(self._f('is_even')))
+        self.assertFalse(self.graph.is_self_recursive(self._f('is_even')))
+        self.assertEqual(sorted(self._names(self.graph.scc(self._f('is_odd')))), ['is_even', 'is_odd'])
+        self.assertFalse(self.graph.is_recursive(self._f('outer')))
+        self.assertTrue(self.graph.is_leaf(self._f('leaf')))
+        self.assertFalse(self.graph.is_leaf(self._f('outer')))
+
+    def test_sccs_in_reverse_topological_order(self):
+        """Тест: компоненты вызываемых идут раньше вызывающих"""
+        position = {id(f): i for i, scc in enumerate(self.graph.sccs) for f in scc}
+        for func in self.graph.functions:
+            for callee in self.graph.callees(func):
+                self.assertLessEqual(position[id(callee)], position[id(func)])
+
+    def test_cached_on_program(self):
+        """Тест: граф строится один раз и сбрасывается явно"""
+        self.assertIs(CallGraph.of(self.program), self.graph)
+        CallGraph.invalidate(self.program)
+        self.assertIsNot(CallGraph.of(self.program), self.graph)
+
+    def test_long_chain_without_recursion_limit(self):
+        """Тест: цепочка вызовов длиннее лимита рекурсии"""
+        count = sys.getrecursionlimit() + 100
+        code = "".join(f"def f{i}():\n    return f{i + 1}()\n" for i in range(count))
+        code += f"def f{count}():\n    return 0\n"
+        graph = CallGraph(Parser(Lexer(code)).parse())
+        self.assertEqual(len(graph.sccs), count + 1)
+
+    def test_exports(self):
+        """Тест экспорта в JSON и DOT"""
+        data = json.loads(self.graph.to_json())
+        fact = next(f for f in data['functions'] if f['name'] == 'fact')
+        self.assertEqual(fact['callees'], ['fact:4'])
+        self.assertTrue(fact['recursive'])
+        self.assertIn(['is_even:9', 'is_odd:14'], [sorted(scc) for scc in data['sccs']])
+        dot = self.graph.to_dot()
+        self.assertTrue(dot.startswith('digraph call_graph {'))
+        self.assertIn('"helper:20" -> "leaf:1";', dot)
+        self.assertIn('"fact:4" [label="fact", color=red];', dot)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,16 @@
 import unittest
 import sys
 import os
+import time
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from backend.src.transpiler import Transpiler
+from backend.src.transpiler import Transpiler, ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.semantic.analyzer import SemanticAnalyzer
+from backend.src.codegen.generator import CodeGenerator
+from backend.tests.helpers import quiet
 
 
 class TestCodeGenerator(unittest.TestCase):
@@ -120,8 +126,8 @@ else:
         print(i, j)"""
         js_code = self.transpiler.transpile(python_code)
 
-        self.assertIn("for (let i of range(3))", js_code)
-        self.assertIn("for (let j of range(2))", js_code)
+        self.assertIn("for (let i = 0; i < 3; i++)", js_code)
+        self.assertIn("for (let j = 0; j < 2; j++)", js_code)
 
     def test_binary_operations(self):
         """Тест генерации бинарных операций"""
@@ -248,5 +254,110 @@ x = 5  # inline comment"""
         self.assertIn("(a == b) && (c != d) || (e > f) && (g < h) || (i >= j) && (k <= l)", js_code)
 
 
+    def test_function_locals_do_not_leak_to_module_scope(self):
+        """Тест: локальная переменная функции не считается объявленной снаружи"""
+        python_code = """def f():
+    x = 1
+    return x
+x = 2"""
+        js_code = self.transpiler.transpile(python_code)
+
+        self.assertIn("    let x = 1;", js_code)
+        self.assertIn("\nlet x = 2;", js_code)
+
+    def test_declarations_from_analyzer_bindings(self):
+        """Тест: let/присваивание по разметке SemanticAnalyzer"""
+        python_code = """count = 0
+def inc(step):
+    count = count + step
+    total = count
+    total = total + 1
+    return total"""
+        ast = Parser(Lexer(python_code)).parse()
+        SemanticAnalyzer().analyze(ast)
+        js_code = CodeGenerator().generate(ast)
+
+        self.assertIn("let count = 0;", js_code)
+        self.assertIn("    count = count + step;", js_code)
+        self.assertIn("    let total = count;", js_code)
+        self.assertIn("    total = total + 1;", js_code)
+
+
+class TestFusedAnalysis(unittest.TestCase):
+    """Анализ во время генерации должен совпадать с отдельным проходом"""
+
+    PROGRAMS = [
+        "x = 5\ny = x + 10",
+        "x = 5\ny = x + z",
+        'x = 5 + "hello"',
+        "if 5:\n    x = 1\nwhile 1:\n    break",
+        "def f():\n    return 1\ndef f():\n    return y",
+        "def outer(a):\n    def inner(b):\n        return a + b\n    return inner(a)\nq = outer(1)",
+        "for i in range(3):\n    s = i\nt = i",
+        "def main():\n    print(undefined_name)\nif __name__ == \"__main__\":\n    main()\n    w = missing",
+        "a = 1\nif a > 0 and b:\n    a = a - 1\nelse:\n    c = a",
+    ]
+
+    def _bindings(self, ast):
+        from backend.src.parser.walker import walk
+        from backend.src.parser.ast_nodes import Identifier
+        return [(n.name, n.binding.key if n.binding else None)
+                for n in walk(ast) if isinstance(n, Identifier)]
+
+    def test_same_errors_and_bindings(self):
+        """Тест: те же ошибки и разметка имён, что у SemanticAnalyzer"""
+        for code in self.PROGRAMS:
+            with self.subTest(code=code):
+                separate_ast = Parser(Lexer(code)).parse()
+                analyzer = SemanticAnalyzer()
+                analyzer.analyze(separate_ast)
+
+                fused_ast = Parser(Lexer(code)).parse()
+                generator = CodeGenerator(fused_analysis=True)
+                generator.generate(fused_ast)
+
+                self.assertEqual([str(e) for e in generator.errors],
+                                 [str(e) for e in analyzer.errors])
+                self.assertEqual(self._bindings(fused_ast), self._bindings(separate_ast))
+
+    def test_transpiler_analysis_modes(self):
+        """Тест: compile() возвращает код и ошибки в обоих режимах"""
+        code = "x = 1\ny = x + z"
+        separate = Transpiler(analysis=ANALYSIS_SEPARATE).compile(code)
+        fused = Transpiler(analysis=ANALYSIS_FUSED).compile(code)
+
+        self.assertEqual(fused.code, separate.code)
+        self.assertFalse(fused.ok)
+        self.assertEqual([str(e) for e in fused.errors], [str(e) for e in separate.errors])
+        self.assertTrue(Transpiler().compile(code).ok)
+
+
+class TestLongExpressions(unittest.TestCase):
+    """Длинные выражения: код собирается фрагментами за линейное время"""
+
+    def _generate(self, terms, **options):
+        source = "x = 1\ny = " + " + ".join(["x"] * terms) + "\nprint(y - f(x, -x) * 2)"
+        with quiet():
+            ast = Parser(Lexer(source)).parse()
+            start = time.perf_counter()
+            js_code = CodeGenerator(**options).generate(ast)
+            return js_code, time.perf_counter() - start
+
+    def test_chain_beyond_recursion_limit(self):
+        """Тест: глубина дерева больше предела рекурсии Python"""
+        terms = sys.getrecursionlimit() * 5
+        for options in ({}, {'fused_analysis': True}, {'source_map': True}):
+            with self.subTest(options=options):
+                js_code, _ = self._generate(terms, **options)
+                self.assertIn(" + ".join(["x"] * terms) + ";", js_code)
+                self.assertIn("(y - f(x, -x) * 2)", js_code)
+
+    def test_linear_time(self):
+        """Тест: в 4 раза больше слагаемых -- примерно в 4 раза дольше (не в 16)"""
+        def best(terms):
+            return min(self._generate(terms)[1] for _ in range(3))
+        small, large = best(5000), best(20000)
+        self.assertLess(large / small, 8)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
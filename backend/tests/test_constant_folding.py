@@ -0,0 +1,140 @@
+import unittest
+import sys
+import os
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.optimizer import ConstantFolder
+from backend.tests.helpers import quiet, transpile, run_node
+
+
+def fold(expression):
+    """Свёрнутое выражение x = <expression> и число упрощений"""
+    with quiet():
+        program = Parser(Lexer(f"x = {expression}")).parse()
+    folder = ConstantFolder()
+    folder.fold(program)
+    return program.statements[0].value, folder.folded
+
+
+class TestConstantFolding(unittest.TestCase):
+    """Тесты свёртки константных выражений"""
+
+    def assertFolded(self, expression, expected):
+        value, _ = fold(expression)
+        self.assertIsInstance(value, Literal, expression)
+        self.assertEqual(value.value, expected, expression)
+        self.assertIs(type(value.value), type(expected), expression)
+
+    def assertNotFolded(self, expression):
+        value, folded = fold(expression)
+        self.assertNotIsInstance(value, Literal, expression)
+
+    def test_python_semantics(self):
+        cases = {
+            "60 * 60 * 24": 86400,
+            "7 / 2": 3.5,
+            "6 / 3": 2.0,        # истинное деление даёт float
+            "3 * 2.0": 6.0,
+            "-7 % 3": 2,         # знак делителя, а не делимого как в JS
+            "7 % -3": -2,
+            "-7.5 % 2": 0.5,
+            "2 ** 3 ** 2": 512,  # правоассоциативно
+            "-2 ** 2": -4,
+            "(-2) ** 2": 4,
+            "2 ** -1": 0.5,
+            "1 + 2 * 3 - 4": 3,
+            "1 < 2": True,
+            "3 >= 4.0": False,
+            "2 == 2.0": True,
+            "not 0": True,
+            "-(-5)": 5,
+        }
+        for expression, expected in cases.items():
+            with self.subTest(expression=expression):
+                self.assertFolded(expression, expected)
+
+    def test_inexact_results_kept(self):
+        """Исключения и неточные в JS значения остаются вычислению во время выполнения"""
+        for expression in ["1 / 0", "5 % 0", "0 ** -1", "(-8) ** 0.5", "2 ** 60",
+                           "9007199254740993 + 0", "10.0 ** 400", '"a" + "b"', "True + 1"]:
+            with self.subTest(expression=expression):
+                self.assertNotFolded(expression)
+
+    def test_logical_operators(self):
+        value, _ = fold("0 and y")
+        self.assertEqual(value.value, 0)
+        value, _ = fold("None or y")
+        self.assertIsInstance(value, Identifier)
+        value, _ = fold("True and y > 1")
+        self.assertEqual(value.operator, ">")
+        self.assertNotFolded("y and 0")
+
+    def test_identities(self):
+        for expression in ["y * 1", "1 * y", "y / 1", "y - 0", "y ** 1", "-(-y)", "+(+y)"]:
+            with self.subTest(expression=expression):
+                value, folded = fold(expression)
+                self.assertIsInstance(value, UnaryOperation)
+                self.assertEqual(value.operator, "+")
+                self.assertIsInstance(value.operand, Identifier)
+                self.assertGreater(folded, 0)
+        value, _ = fold("(y - z) * 1")
+        self.assertEqual(value.operator, "-")  # уже число, + не нужен
+        value, _ = fold("not not not y")
+        self.assertEqual(value.operator, "not")
+        self.assertIsInstance(value.operand, Identifier)
+        # Тождества, неточные в JS для строк или -0, не применяются
+        for expression in ["y + 0", "0 + y", "y * 0", "0 - y", "not not y"]:
+            with self.subTest(expression=expression):
+                value, folded = fold(expression)
+                self.assertEqual(folded, 0)
+        # y - -0.0 == y + 0: для y = -0 это 0, а не -0
+        value, _ = fold("y - -0.0")
+        self.assertIsInstance(value, BinaryOperation)
+        self.assertEqual(value.operator, "-")
+        self.assertEqual(str(value.right.value), "-0.0")
+        value, _ = fold("y - 0.0")
+        self.assertEqual(value.operator, "+")
+
+    def test_generated_code(self):
+        code = transpile("DAY = 60 * 60 * 24\nx = y * 1\nz = -2 ** 2\nprint(DAY, x, z)", optimize=True)
+        self.assertIn("const DAY = 86400;", code)
+        self.assertIn("const x = +y;", code)
+        self.assertIn("const z = -4;", code)
+        # Без optimize выражения остаются как есть
+        self.assertIn("let DAY = 60 * 60 * 24;", transpile("DAY = 60 * 60 * 24"))
+
+    def test_operator_parentheses(self):
+        """Унарные операции и ** генерируются с нужными скобками"""
+        code = transpile("a = -2 ** 2\nb = (-2) ** y\nc = not (x > 3)\nd = -(-x)\ne = +(-x)")
+        self.assertIn("let a = -(2 ** 2);", code)
+        self.assertIn("let b = (-2) ** y;", code)
+        self.assertIn("let c = !(x > 3);", code)
+        self.assertIn("let d = -(-x);", code)
+        self.assertIn("let e = +(-x);", code)
+        self.assertIn("console.log((-2) ** y);", transpile("print((-2) ** y)", optimize=True))
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_same_output_as_unoptimized(self):
+        """Свёрнутый код печатает то же, что исходный (там, где JS совпадает с Python)"""
+        source = ("x = 5\n"
+                  "print(60 * 60 * 24, 7 / 2, 2 ** 3 ** 2, -2 ** 2, (-2) ** 2, 2 ** -1)\n"
+                  "print(x * 1, 1 * x, x / 1, x - 0, x ** 1, -(-x), +(+x), -(+x))\n"
+                  "print(not not not x, not (x > 3), not x == 5, 1 < 2, 0 and x, None or x)\n"
+                  "print(-7 % 3, 7 % -3)\n")
+        outputs = []
+        for optimize in (False, True):
+            returncode, stdout, stderr = run_node(transpile(source, optimize=optimize))
+            self.assertEqual(returncode, 0, stderr)
+            outputs.append(stdout.splitlines())
+        self.assertEqual(outputs[0][:3], outputs[1][:3])
+        # % свёрнут по правилам Python
+        self.assertEqual(outputs[1][3], "2 -2")
+
+
+if __name__ == '__main__':
+    unittest.main()
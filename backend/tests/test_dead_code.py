@@ -0,0 +1,150 @@
+import unittest
+import sys
+import os
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.optimizer import ConstantFolder, DeadCodeEliminator
+from backend.src.transpiler import ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.tests.helpers import quiet, transpile, run_node
+
+
+def eliminate(source):
+    with quiet():
+        program = Parser(Lexer(source)).parse()
+    eliminator = DeadCodeEliminator()
+    eliminator.eliminate(ConstantFolder().fold(program))
+    return program, eliminator
+
+
+class TestUnreachableCode(unittest.TestCase):
+    """Тесты удаления недостижимых операторов"""
+
+    def test_after_return(self):
+        program, eliminator = eliminate("def f(x):\n    return x\n    print(x)\n    x = 2")
+        self.assertEqual(len(program.statements[0].body.statements), 1)
+        self.assertEqual(eliminator.removed_statements, 2)
+
+    def test_after_break_and_continue(self):
+        source = ("for i in range(3):\n    if i == 1:\n        continue\n        print(1)\n"
+                  "    while i > 0:\n        break\n        i = 0\n    print(i)")
+        program, _ = eliminate(source)
+        loop = program.statements[0]
+        self.assertEqual(len(loop.body.statements[0].then_branch.statements), 1)
+        self.assertEqual(len(loop.body.statements[1].body.statements), 1)
+        self.assertEqual(len(loop.body.statements), 3)
+
+    def test_after_terminating_if(self):
+        """if/elif/else, все ветви которого завершаются, завершает блок"""
+        source = ("def f(n):\n    if n < 0:\n        return 1\n    elif n == 0:\n        return 2\n"
+                  "    else:\n        return 3\n    print(n)")
+        program, _ = eliminate(source)
+        self.assertEqual(len(program.statements[0].body.statements), 1)
+        # Без else управление может дойти до следующего оператора
+        program, _ = eliminate("def f(n):\n    if n < 0:\n        return 1\n    print(n)")
+        self.assertEqual(len(program.statements[0].body.statements), 2)
+
+
+class TestConstantBranches(unittest.TestCase):
+    """Тесты удаления ветвей с константным условием"""
+
+    def test_if_branches(self):
+        program, eliminator = eliminate("if False:\n    a = 1\nelse:\n    a = 2\n    b = 3\nif 1 > 2:\n    c = 4")
+        self.assertEqual([s.target.name for s in program.statements], ['a', 'b'])
+        self.assertEqual(program.statements[0].value.value, 2)
+        self.assertEqual(eliminator.pruned_branches, 2)
+
+    def test_elif_chain(self):
+        program, _ = eliminate("if 0:\n    a = 1\nelif x > 1:\n    a = 2\nelse:\n    a = 3")
+        self.assertIsInstance(program.statements[0], IfStatement)
+        self.assertEqual(program.statements[0].condition.operator, '>')
+        program, _ = eliminate("if 0:\n    a = 1\nelif True:\n    a = 2\nelse:\n    a = 3")
+        self.assertEqual(program.statements[0].value.value, 2)
+
+    def test_while_false_and_unknown_conditions(self):
+        program, _ = eliminate('while False:\n    a = 1\nif x:\n    b = 1\nif "":\n    c = 1')
+        self.assertEqual(len(program.statements), 2)
+
+    def test_declaration_in_pruned_branch(self):
+        """Объявление из удалённой ветви переходит к оставшемуся присваиванию"""
+        source = "def f():\n    if False:\n        y = 1\n    else:\n        y = 2\n    return y\nprint(f())"
+        for mode in (None, ANALYSIS_SEPARATE, ANALYSIS_FUSED):
+            with self.subTest(mode=mode):
+                code = transpile(source, optimize=True, analysis=mode)
+                self.assertIn("const y = 2;", code)
+                self.assertNotIn("y = 1", code)
+
+
+class TestTreeShaking(unittest.TestCase):
+    """Тесты удаления неиспользуемых функций"""
+
+    SOURCE = '''def helper(x):
+    return x * 2
+
+def unused(x):
+    return helper(x)
+
+def also_unused():
+    return unused(1)
+
+def by_value(x):
+    return x + 1
+
+def work(x):
+    return helper(x) + 1
+
+def main():
+    f = by_value
+    print(work(1), f(2))
+
+if __name__ == "__main__":
+    main()
+'''
+
+    def test_unreachable_functions_removed(self):
+        program, eliminator = eliminate(self.SOURCE)
+        names = [s.name for s in program.statements if isinstance(s, FunctionDeclaration)]
+        self.assertEqual(names, ['helper', 'by_value', 'work', 'main'])
+        self.assertEqual(sorted(eliminator.removed_functions), ['also_unused', 'unused'])
+
+    def test_module_level_calls_are_roots(self):
+        program, _ = eliminate("def a():\n    return 1\ndef b():\n    return a()\ndef c():\n    return 3\nprint(b())")
+        names = [s.name for s in program.statements if isinstance(s, FunctionDeclaration)]
+        self.assertEqual(names, ['a', 'b'])
+
+    def test_fstring_calls_are_roots(self):
+        program, _ = eliminate('def a():\n    return 1\ndef b():\n    return 2\nprint(f"{a()}")')
+        names = [s.name for s in program.statements if isinstance(s, FunctionDeclaration)]
+        self.assertEqual(names, ['a'])
+
+    def test_library_module_kept(self):
+        """Модуль только из функций -- библиотека: функции не удаляются"""
+        program, eliminator = eliminate("import math\ndef a():\n    return 1\ndef b():\n    return 2")
+        self.assertEqual(len(program.statements), 3)
+        self.assertEqual(eliminator.removed_functions, [])
+
+    def test_output_shrinks(self):
+        normal = transpile(self.SOURCE)
+        optimized = transpile(self.SOURCE, optimize=True)
+        self.assertNotIn("function unused", optimized)
+        self.assertLess(len(optimized), len(normal))
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_same_output(self):
+        source = self.SOURCE.replace("def main():\n", "def main():\n    if False:\n        print(0)\n"
+                                                     "    while 0:\n        print(0)\n")
+        outputs = []
+        for optimize in (False, True):
+            returncode, stdout, stderr = run_node(transpile(source, optimize=optimize))
+            self.assertEqual(returncode, 0, stderr)
+            outputs.append(stdout)
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[1], "3 3\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
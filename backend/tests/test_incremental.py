@@ -0,0 +1,86 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.semantic.analyzer import SemanticAnalyzer
+from backend.src.semantic.incremental import AnalysisState
+
+
+class TestIncrementalAnalysis(unittest.TestCase):
+
+    SOURCE = '''rate = 2
+
+def scale(v):
+    return v * rate
+
+def shout(s):
+    return s + "!"
+
+def report(n):
+    print(scale(n))
+    return n
+
+x = report(1)
+'''
+
+    def _parse(self, code):
+        return Parser(Lexer(code)).parse()
+
+    def _full(self, code):
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(self._parse(code))
+        return [str(e) for e in analyzer.errors]
+
+    def _update(self, state, code):
+        state.update(self._parse(code))
+        self.assertEqual([str(e) for e in state.errors], self._full(code))
+        return state.reanalyzed
+
+    def test_dependencies(self):
+        """Тест: читаемые и объявляемые глобальные имена функций"""
+        state = AnalysisState()
+        state.analyze(self._parse(self.SOURCE))
+        deps = state.dependencies()
+        self.assertIn('rate', deps['scale'][0])
+        self.assertEqual(deps['scale'][1], {'scale'})
+        self.assertNotIn('rate', deps['shout'][0])
+        self.assertTrue({'print', 'scale'} <= deps['report'][0])
+
+    def test_only_edited_function_is_reanalyzed(self):
+        """Тест: правка тела функции не затрагивает остальные операторы"""
+        state = AnalysisState()
+        self.assertEqual(self._update(state, self.SOURCE), [0, 1, 2, 3, 4])
+        edited = self.SOURCE.replace('return s + "!"', 'return s + missing')
+        self.assertEqual(self._update(state, edited), [2])
+
+    def test_changed_global_invalidates_readers(self):
+        """Тест: изменение глобальной переменной перепроверяет читателей"""
+        state = AnalysisState()
+        self._update(state, self.SOURCE)
+        edited = self.SOURCE.replace('rate = 2', 'rate = "2"')
+        self.assertEqual(self._update(state, edited), [0, 1])
+
+    def test_removed_global_and_shifted_lines(self):
+        """Тест: удаление объявления и сдвиг номеров строк в ошибках"""
+        state = AnalysisState()
+        self._update(state, self.SOURCE)
+        edited = self.SOURCE.replace('rate = 2\n', '')
+        self.assertEqual(self._update(state, edited), [0])
+        edited = "\n\n" + edited.replace('print(scale(n))', 'print(scale(n) + nope)')
+        self._update(state, edited)
+
+    def test_redeclaration_follows_edits(self):
+        """Тест: повторное объявление функции появляется и исчезает"""
+        state = AnalysisState()
+        self._update(state, self.SOURCE)
+        self._update(state, self.SOURCE + "def shout(s):\n    return s\n")
+        self.assertIn("Redeclaration of 'shout'", str(state.errors[-1]))
+        self._update(state, self.SOURCE.replace("def shout(s)", "def whisper(s)"))
+
+
+if __name__ == '__main__':
+    unittest.main()
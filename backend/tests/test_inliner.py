@@ -0,0 +1,213 @@
+import unittest
+import sys
+import os
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk
+from backend.src.optimizer import Inliner
+from backend.src.transpiler import Transpiler, ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.tests.helpers import quiet, transpile, run_python, run_node, run_cli
+
+
+def inline(source, **options):
+    with quiet():
+        program = Parser(Lexer(source)).parse()
+        inliner = Inliner(**options)
+        inliner.inline(program)
+    return program, inliner
+
+
+def calls(node):
+    return [n.name.name for n in walk(node) if isinstance(n, FunctionCall)]
+
+
+HELPERS = '''def sq(x):
+    return x * x
+
+def add(a, b):
+    return b + a
+
+def inc(v):
+    return v + 1
+
+def noisy(v):
+    print("noisy", v)
+    return v
+
+'''
+
+
+class TestInlinerSelection(unittest.TestCase):
+    """Тесты выбора подставляемых функций"""
+
+    def test_small_functions_inlined(self):
+        program, inliner = inline(HELPERS + "y = 3\nprint(sq(y), inc(y), noisy(y))")
+        self.assertEqual(calls(program.statements[-1]), ['print', 'noisy'])
+        self.assertEqual(inliner.inlined, 2)
+        self.assertEqual(inliner.functions, ['sq', 'inc'])
+
+    def test_excluded_functions(self):
+        source = '''K = 10
+
+def fact(n):
+    if n <= 1:
+        return 1
+    return n * fact(n - 1)
+
+def scaled(x):
+    return x * K
+
+def big(x):
+    return x + x * 2 + x * 3 + x * 4 + x * 5
+
+def two_statements(x):
+    y = x + 1
+    return y
+
+def apply(f, x):
+    return f(x)
+
+print(fact(3), scaled(1), big(1), two_statements(1), apply(abs, -1))
+'''
+        program, inliner = inline(source)
+        self.assertEqual(calls(program.statements[-1]),
+                         ['print', 'fact', 'scaled', 'big', 'two_statements', 'apply'])
+        self.assertEqual(inliner.inlined, 0)
+        # Порог размера настраивается
+        _, inliner = inline(source, max_size=20)
+        self.assertEqual(inliner.functions, ['big'])
+
+    def test_nested_calls_expanded(self):
+        """Тело подставляется уже с развёрнутыми вызовами внутри"""
+        source = "def sq(x):\n    return x * x\ndef norm(a, b):\n    return sq(a) + sq(b)\nprint(norm(1, 2))"
+        program, inliner = inline(source)
+        self.assertEqual(calls(program.statements[-1]), ['print'])
+        self.assertEqual(inliner.inlined, 3)
+
+
+class TestInlinerArguments(unittest.TestCase):
+    """Тесты подстановки аргументов"""
+
+    def expansion(self, source):
+        program, _ = inline(HELPERS + source)
+        return program.statements[-1].value
+
+    def test_direct_substitution(self):
+        value = self.expansion("y = 2\nz = add(y + 1, 5)")
+        self.assertIsInstance(value, BinaryOperation)
+        self.assertEqual(value.right.operator, '+')  # b + a -> 5 + (y + 1)
+        self.assertEqual(value.left.value, 5)
+
+    def test_temporaries(self):
+        # Аргумент используется дважды
+        value = self.expansion("y = 2\nz = sq(y + 1)")
+        self.assertIsInstance(value, InlineExpansion)
+        self.assertEqual([t.name for t in value.temporaries], ['x$1'])
+        # Аргумент с побочным эффектом
+        value = self.expansion("z = inc(noisy(1))")
+        self.assertIsInstance(value, InlineExpansion)
+        # Тело вычисляет аргументы в обратном порядке: оба -- во временных
+        value = self.expansion("z = add(noisy(1), noisy(2))")
+        self.assertEqual(len(value.temporaries), 2)
+
+    def test_unused_pure_argument_dropped(self):
+        source = "def first(a, b):\n    return a\nz = first(1, 2 + 3)\nw = first(1, print(2))"
+        program, _ = inline(source)
+        self.assertIsInstance(program.statements[1].value, Literal)
+        self.assertIsInstance(program.statements[2].value, InlineExpansion)
+
+
+class TestInlinerGeneration(unittest.TestCase):
+    """Тесты генерации подставленного кода"""
+
+    SOURCE = HELPERS + '''def main():
+    total = 0
+    for i in range(5):
+        total = total + sq(i + 1) + 2 * inc(i) + add(noisy(i), noisy(10 - i))
+    print(total, sq(3))
+
+if __name__ == "__main__":
+    main()
+'''
+
+    def test_generated_code(self):
+        code = transpile(self.SOURCE, optimize=True)
+        self.assertIn("let x$", code)
+        self.assertIn("2 * (i + 1)", code)
+        self.assertIn("console.log(total, 9);", code)  # sq(3) подставлен и свёрнут
+        # Подставленные всюду функции удалены
+        self.assertNotIn("function sq", code)
+        self.assertIn("function noisy", code)
+        self.assertIn("sq(i + 1)", transpile(self.SOURCE))
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_expansion_as_assigned_value(self):
+        """Подстановка с временными переменными -- целиком значение присваивания"""
+        source = HELPERS + "def f(y):\n    z = sq(y + 1)\n    w = 0\n    w = sq(y - 1)\n    return z + w\nprint(f(2))"
+        code = transpile(source, optimize=True)
+        self.assertIn("const z = (x$1 = y + 1, x$1 * x$1);", code)
+        returncode, stdout, stderr = run_node(code)
+        self.assertEqual(returncode, 0, stderr)
+        self.assertEqual(stdout, "10\n")
+
+    def test_inlined_count_reported(self):
+        transpiler = Transpiler(optimize=True)
+        with quiet():
+            transpiler.transpile(self.SOURCE)
+        self.assertEqual(transpiler.inlined_calls, 4)
+        self.assertEqual(transpiler.inlined_functions, ['sq', 'inc', 'add'])
+        with quiet():
+            transpiler.transpile("print(1)")
+        self.assertEqual((transpiler.inlined_calls, transpiler.inlined_functions), (0, []))
+
+    def test_inlined_count_in_cli_report(self):
+        report = run_cli(self.SOURCE, "--optimize", "--dump-analysis")
+        self.assertIn("== optimizations ==\ninlined call sites: 4 (sq, inc, add)\n", report)
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_same_output(self):
+        """Порядок вычисления аргументов сохраняется"""
+        outputs = []
+        for options in ({}, {'optimize': True}, {'optimize': True, 'analysis': ANALYSIS_FUSED},
+                        {'optimize': True, 'analysis': ANALYSIS_SEPARATE, 'minify': True}):
+            returncode, stdout, stderr = run_node(transpile(self.SOURCE, **options))
+            self.assertEqual(returncode, 0, stderr)
+            outputs.append(stdout)
+        self.assertEqual(outputs[0].splitlines()[:4], ["noisy 0", "noisy 10", "noisy 1", "noisy 9"])
+        for output in outputs[1:]:
+            self.assertEqual(output, outputs[0])
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_nested_function_shadows_callee(self):
+        """Вызов из тела не подставляется туда, где имя затенено вложенной функцией"""
+        source = '''def helper():
+    print("outer")
+    return 1
+
+def a(x):
+    return helper() + x
+
+def main():
+    def helper():
+        print("inner")
+        return 2
+    print(a(1))
+    print(helper())
+
+main()
+'''
+        for optimize in (False, True):
+            with self.subTest(optimize=optimize):
+                returncode, stdout, stderr = run_node(transpile(source, optimize=optimize))
+                self.assertEqual(returncode, 0, stderr)
+                self.assertEqual(stdout, run_python(source))
+        self.assertEqual(run_python(source), "outer\n2\ninner\n2\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,237 @@
+import unittest
+import sys
+import os
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk
+from backend.src.optimizer import LoopInvariantMotion
+from backend.src.transpiler import Transpiler, ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.tests.helpers import quiet, transpile, run_node, run_cli
+
+
+def hoist(source):
+    with quiet():
+        program = Parser(Lexer(source)).parse()
+        motion = LoopInvariantMotion()
+        motion.hoist(program)
+    return program, motion
+
+
+def declarations(node):
+    return [n for n in walk(node) if isinstance(n, TemporaryDeclaration)]
+
+
+class TestInvariantSelection(unittest.TestCase):
+    """Тесты выбора выносимых выражений"""
+
+    def test_while_condition(self):
+        source = ("def count(items, scale):\n    i = 0\n    while i < len(items) * scale:\n"
+                  "        i = i + 1\n    return i")
+        program, motion = hoist(source)
+        body = program.statements[0].body.statements
+        self.assertIsInstance(body[1], TemporaryDeclaration)
+        self.assertIsInstance(body[1].value, BinaryOperation)  # len(items) * scale целиком
+        loop = body[2]
+        self.assertIsInstance(loop, WhileLoop)  # условие вычисляется всегда: без проверки
+        self.assertIsInstance(loop.condition.right, Temporary)
+        self.assertEqual((motion.hoisted, motion.guarded), (1, 0))
+
+    def test_changed_operands_stay(self):
+        source = '''def f(items, n):
+    i = 0
+    while i < len(items) + n:
+        n = n - 1
+        items = [i]
+        i = i + len(items) * 2
+    return i
+'''
+        program, motion = hoist(source)
+        self.assertEqual(declarations(program), [])
+        self.assertEqual(motion.hoisted, 0)
+
+    def test_impure_calls_stay(self):
+        source = '''def log(x):
+    print(x)
+    return x
+
+def twice(x):
+    return x * 2
+
+def f(n, k):
+    i = 0
+    while i < n:
+        i = i + log(k) + 1
+    while i < twice(n):
+        i = i + twice(k) + 1
+        print(i)
+    while i < n * n + k:
+        i = i + 1
+        log(i)
+    return i
+'''
+        program, motion = hoist(source)
+        values = [d.value for d in declarations(program)]
+        # print только выводит, а log может менять состояние: в третьем цикле
+        # выносится только n * n + k
+        self.assertEqual(len(values), 3)
+        self.assertEqual([v.name.name for v in values[:2]], ['twice', 'twice'])
+        self.assertEqual(values[2].operator, '+')
+        self.assertEqual(motion.guarded, 1)
+
+
+class TestInvariantGuards(unittest.TestCase):
+    """Тесты проверок перед циклами, тело которых может не выполниться"""
+
+    def test_guards(self):
+        source = '''def f(n, k, items):
+    s = 0
+    for i in range(1, n):
+        s = s + len(items) * k
+    for x in items:
+        s = s + len(items) * x
+    while s > n:
+        s = s - len(items) * k
+    return s
+'''
+        program, motion = hoist(source)
+        first, second, third = [s for s in program.statements[0].body.statements
+                                if isinstance(s, IfStatement)]
+        self.assertEqual(first.condition.operator, '<')  # range(1, n): 1 < n
+        self.assertIsInstance(first.then_branch.statements[0], TemporaryDeclaration)
+        self.assertIsInstance(first.then_branch.statements[1], ForLoop)
+        self.assertEqual(second.condition.left.name.name, 'len')  # len(items) > 0
+        self.assertEqual(third.condition.operator, '>')  # условие while ещё раз
+        self.assertEqual((motion.hoisted, motion.guarded), (3, 3))
+
+    def test_uncertain_expressions_stay(self):
+        """Выражения, которые первая итерация может не вычислить"""
+        source = '''def f(n, k, items):
+    s = 0
+    for i in range(n):
+        if i > 2:
+            s = s + len(items) * k
+        s = s + (i > 5 and len(items) * k > 0)
+    for x in items:
+        if x > 0:
+            break
+        s = s + len(items) * k
+    for c in make(n):
+        s = s + len(items) * k
+    return s
+
+def make(n):
+    print(n)
+    return [n]
+'''
+        program, motion = hoist(source)
+        self.assertEqual(declarations(program), [])
+
+    def test_nested_loops(self):
+        """Инвариант внутреннего цикла покидает и внешний"""
+        source = '''def f(n, k):
+    s = 0
+    i = 0
+    while i < n:
+        j = 0
+        while j < len(k) * 2:
+            s = s + j
+            j = j + 1
+        i = i + 1
+    return s
+'''
+        program, motion = hoist(source)
+        guard = program.statements[0].body.statements[2]
+        self.assertIsInstance(guard, IfStatement)
+        declaration, outer = guard.then_branch.statements
+        self.assertIsInstance(declaration, TemporaryDeclaration)
+        self.assertIsInstance(outer, WhileLoop)
+        self.assertEqual(declarations(outer), [])
+        self.assertEqual(motion.hoisted, 1)
+
+
+class TestInvariantGeneration(unittest.TestCase):
+    """Тесты генерации кода с вынесенными инвариантами"""
+
+    SOURCE = '''def weight(x):
+    return x * 3 + 1
+
+def total(items, scale):
+    i = 0
+    acc = 0
+    while i < len(items) * scale:
+        acc = acc + weight(scale) * i - len(items)
+        i = i + 1
+    return acc
+
+def grid(n, k):
+    s = 0
+    for a in range(n):
+        for b in range(n - 1, -1, -1):
+            s = s + a * b + (k + 3) * k
+    return s
+
+def main():
+    data = [1, 2, 3]
+    print(total(data, 2), grid(4, 5), grid(0, 5))
+    for x in data:
+        print(x, weight(len(data)) + 1)
+
+if __name__ == "__main__":
+    main()
+'''
+
+    def test_generated_code(self):
+        code = transpile(self.SOURCE, optimize=True)
+        self.assertIn("const $inv1 = len(items) * scale;\n    if (i < $inv1) {", code)
+        self.assertIn("while (i < $inv1) {", code)
+        self.assertIn("if (n - 1 > -1) {", code)
+        self.assertNotIn("$inv", transpile(self.SOURCE))
+
+    def test_hoisted_count_reported(self):
+        transpiler = Transpiler(optimize=True)
+        with quiet():
+            transpiler.transpile(self.SOURCE)
+        counts = (transpiler.hoisted_invariants, transpiler.guarded_loops)
+        self.assertEqual(counts, (5, 3))
+        report = run_cli(self.SOURCE, "--optimize", "--dump-analysis")
+        self.assertIn("hoisted loop invariants: %d (%d guarded loops)\n" % counts, report)
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_zero_iterations(self):
+        """Тело не выполнялось -- вынесенное выражение не вычисляется"""
+        source = '''def f(n, v, items):
+    s = 0
+    for i in range(n):
+        s = s + len(v) * 2
+    for x in items:
+        s = s + len(v) * 2
+    return s
+
+print(f(0, None, []), f(2, [7], [1]))
+'''
+        code = transpile(source, optimize=True)
+        self.assertIn("$inv", code)
+        returncode, stdout, stderr = run_node(code)
+        self.assertEqual(returncode, 0, stderr)
+        self.assertEqual(stdout, "0 6\n")
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_same_output(self):
+        outputs = []
+        for options in ({}, {'optimize': True}, {'optimize': True, 'analysis': ANALYSIS_FUSED},
+                        {'optimize': True, 'analysis': ANALYSIS_SEPARATE, 'minify': True}):
+            returncode, stdout, stderr = run_node(transpile(self.SOURCE, **options))
+            self.assertEqual(returncode, 0, stderr)
+            outputs.append(stdout)
+        self.assertEqual(outputs[0], "87 676 0\n1 11\n2 11\n3 11\n")
+        for output in outputs[1:]:
+            self.assertEqual(output, outputs[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
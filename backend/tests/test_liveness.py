@@ -0,0 +1,232 @@
+import unittest
+import sys
+import os
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk
+from backend.src.semantic.liveness import LivenessAnalyzer
+from backend.src.transpiler import ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.tests.helpers import quiet, transpile, compile_source, run_node
+
+
+def analyze(source):
+    with quiet():
+        program = Parser(Lexer(source)).parse()
+        LivenessAnalyzer().analyze(program)
+    return program
+
+
+def assignments(program, name):
+    return [n for n in walk(program) if isinstance(n, Assignment) and n.target.name == name]
+
+
+class TestLiveness(unittest.TestCase):
+    """Тесты анализа живости и переприсваиваний"""
+
+    def test_single_assignment(self):
+        """Единственное присваивание помечается, переприсваиваемое -- нет"""
+        program = analyze('''def f(n):
+    a = n + 1
+    b = 0
+    b = a
+    return b
+''')
+        self.assertTrue(assignments(program, 'a')[0].single_assignment)
+        self.assertFalse(any(n.single_assignment for n in assignments(program, 'b')))
+
+    def test_dead_store_in_straight_line(self):
+        """Перезаписанное до чтения значение -- мёртвое присваивание"""
+        program = analyze('''def f(n):
+    r = 0
+    r = n * 2
+    r = r + 1
+    unused = n - 1
+    return r
+''')
+        first, second, third = assignments(program, 'r')
+        # Первое присваивание -- объявление, его нельзя удалить, пока есть другие
+        self.assertFalse(first.dead_store)
+        self.assertFalse(second.dead_store)
+        self.assertFalse(third.dead_store)
+        self.assertTrue(assignments(program, 'unused')[0].dead_store)
+
+    def test_overwritten_store_is_dead(self):
+        program = analyze('''def f(n):
+    r = n
+    r = 1
+    r = 2
+    return r
+''')
+        self.assertEqual([n.dead_store for n in assignments(program, 'r')], [False, True, False])
+
+    def test_loop_keeps_stores_read_in_next_iteration(self):
+        """В цикле значение, прочитанное на следующей итерации, живо"""
+        program = analyze('''def f(n):
+    total = 0
+    i = 0
+    while i < n:
+        last = total
+        total = total + i
+        i = i + 1
+    return total
+''')
+        self.assertFalse(any(n.dead_store for n in assignments(program, 'total')))
+        self.assertFalse(any(n.dead_store for n in assignments(program, 'i')))
+        self.assertTrue(assignments(program, 'last')[0].dead_store)
+
+    def test_for_loop_and_break(self):
+        program = analyze('''def f(items):
+    found = 0
+    for x in items:
+        found = x
+        if x > 10:
+            break
+        found = 0
+    return found
+''')
+        stores = assignments(program, 'found')
+        self.assertEqual([n.dead_store for n in stores], [False, False, False])
+
+    def test_if_else_branches(self):
+        """Присваивания в обеих ветках живы, предшествующее им -- мёртвое"""
+        program = analyze('''def f(n):
+    x = 0
+    x = 1
+    if n > 3:
+        x = 2
+    else:
+        x = 3
+    return x
+''')
+        self.assertEqual([n.dead_store for n in assignments(program, 'x')],
+                         [False, True, False, False])
+
+    def test_if_without_else(self):
+        program = analyze('''def f(n):
+    x = 0
+    x = 1
+    if n > 3:
+        x = 2
+    return x
+''')
+        self.assertEqual([n.dead_store for n in assignments(program, 'x')],
+                         [False, False, False])
+
+    def test_nested_function_captures(self):
+        """Переменная, которую читает вложенная функция, всегда жива"""
+        program = analyze('''def g(a):
+    k = a + 1
+    def inner():
+        return k
+    k = 5
+    return inner()
+''')
+        self.assertFalse(any(n.dead_store for n in assignments(program, 'k')))
+
+    def test_side_effects_are_kept(self):
+        """Правая часть с побочным эффектом не удаляется"""
+        program = analyze('''def log(v):
+    print(v)
+    return v
+
+def square(v):
+    return v * v
+
+def f(n):
+    a = log(n)
+    b = square(n)
+    c = len([1, 2])
+    return n
+''')
+        self.assertFalse(assignments(program, 'a')[0].dead_store)
+        self.assertTrue(assignments(program, 'b')[0].dead_store)
+        self.assertTrue(assignments(program, 'c')[0].dead_store)
+
+    def test_module_globals(self):
+        """Глобальные переменные, читаемые функциями или f-строками, живы"""
+        program = analyze('''rate = 3
+label = 1
+junk = 2
+
+def scaled(v):
+    return v * rate
+
+print(scaled(2))
+print(f"{label}")
+''')
+        self.assertFalse(assignments(program, 'rate')[0].dead_store)
+        self.assertFalse(assignments(program, 'label')[0].dead_store)
+        self.assertTrue(assignments(program, 'junk')[0].dead_store)
+
+
+class TestConstEmission(unittest.TestCase):
+    """Тесты генерации const и удаления мёртвых присваиваний"""
+
+    SOURCE = '''def f(n):
+    total = 0
+    unused = n * 2
+    i = 0
+    while i < n:
+        tmp = i * 2
+        total = total + tmp
+        i = i + 1
+    x = 1
+    if n > 3:
+        x = 2
+    else:
+        x = 3
+    return total + x
+
+def g(a):
+    k = a + 1
+    def inner():
+        return k
+    k = 5
+    return inner()
+
+result = f(5) + g(1)
+print(result)
+'''
+
+    def test_const_and_dead_stores(self):
+        code = compile_source(self.SOURCE, optimize=True).code
+        self.assertIn("const tmp = i * 2;", code)
+        self.assertIn("const result = f(5) + g(1);", code)
+        self.assertIn("let total = 0;", code)
+        self.assertIn("let k = a + 1;", code)
+        self.assertNotIn("unused", code)
+
+    def test_default_emits_let(self):
+        """Без optimize генерация не меняется"""
+        code = transpile(self.SOURCE)
+        self.assertIn("let tmp = i * 2;", code)
+        self.assertIn("let unused = n * 2;", code)
+        self.assertNotIn("const", code)
+
+    def test_analysis_modes(self):
+        """Оптимизация совместима с отдельным и совмещённым анализом"""
+        expected = compile_source(self.SOURCE, optimize=True).code
+        for mode in (ANALYSIS_SEPARATE, ANALYSIS_FUSED):
+            result = compile_source(self.SOURCE, optimize=True, analysis=mode)
+            self.assertTrue(result.ok, result.errors)
+            self.assertEqual(result.code, expected)
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_behavior_preserved(self):
+        """Оптимизированный код печатает то же, что исходный"""
+        outputs = []
+        for optimize in (False, True):
+            returncode, stdout, stderr = run_node(transpile(self.SOURCE, optimize=optimize))
+            self.assertEqual(returncode, 0, stderr)
+            outputs.append(stdout)
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[1].strip(), "27")
+
+
+if __name__ == '__main__':
+    unittest.main()
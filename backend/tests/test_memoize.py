@@ -0,0 +1,124 @@
+import unittest
+import sys
+import os
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.optimizer import Memoizer
+from backend.tests.helpers import quiet, transpile, run_node
+
+
+def mark(source, **options):
+    with quiet():
+        program = Parser(Lexer(source)).parse()
+        memoizer = Memoizer(**options)
+        memoizer.mark(program)
+    return program, memoizer
+
+
+FIB = "def fib(n):\n    if n <= 1:\n        return n\n    return fib(n - 1) + fib(n - 2)\n"
+
+
+class TestMemoizeSelection(unittest.TestCase):
+    """Тесты выбора кэшируемых функций"""
+
+    SOURCE = FIB + '''
+def square(x):
+    return x * x
+
+def shout(n):
+    print(n)
+    if n > 0:
+        shout(n - 1)
+'''
+
+    def test_flag_selects_pure_recursive(self):
+        program, memoizer = mark(self.SOURCE, all_recursive=True)
+        self.assertEqual(memoizer.memoized, ['fib'])
+        fib, square, shout = program.statements
+        self.assertEqual(fib.memoize, 0)
+        self.assertIsNone(shout.memoize)   # print -- не чистая
+        self.assertIsNone(square.memoize)  # не рекурсивная
+        self.assertEqual(memoizer.rejected, {})
+
+    def test_without_flag_nothing_selected(self):
+        program, memoizer = mark(self.SOURCE)
+        self.assertEqual(memoizer.memoized, [])
+        self.assertIsNone(program.statements[0].memoize)
+
+    def test_directives(self):
+        source = ("# pyjs: memoize\n" + FIB +
+                  "def square(x):  # pyjs: memoize(128)\n    return x * x\n"
+                  "#  pyjs:memoize\ndef shout(n):\n    print(n)\n")
+        program, memoizer = mark(source, max_size=1000)
+        fib, square, shout = program.statements
+        self.assertEqual(fib.memoize, 1000)   # общая граница
+        self.assertEqual(square.memoize, 128)  # граница из директивы
+        self.assertIsNone(shout.memoize)
+        self.assertEqual(memoizer.memoized, ['fib', 'square'])
+        self.assertEqual(memoizer.rejected, {'shout': ['calls print']})
+
+    def test_mutual_recursion(self):
+        source = ("def even(n):\n    if n == 0:\n        return True\n    return odd(n - 1)\n"
+                  "def odd(n):\n    if n == 0:\n        return False\n    return even(n - 1)\n")
+        _, memoizer = mark(source, all_recursive=True)
+        self.assertEqual(memoizer.memoized, ['even', 'odd'])
+
+
+class TestMemoizeGeneration(unittest.TestCase):
+    """Тесты генерации кэша"""
+
+    def test_wrapper(self):
+        code = transpile(FIB, memoize=True)
+        self.assertIn("function pyMemoize(fn, limit = 0) {", code)
+        self.assertIn("fib = pyMemoize(fib);", code)
+        code = transpile(FIB, memoize=True, memoize_size=500)
+        self.assertIn("fib = pyMemoize(fib, 500);", code)
+
+    def test_default_output_unchanged(self):
+        self.assertNotIn("pyMemoize", transpile(FIB))
+        source = "def square(x):\n    return x * x\nprint(square(3))"
+        self.assertEqual(transpile(source), transpile(source, memoize=True))
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_exponential_becomes_linear(self):
+        """fib(90) без кэша считался бы часами"""
+        for options in ({}, {'memoize_size': 3}, {'optimize': True, 'minify': True}):
+            with self.subTest(options=options):
+                code = transpile(FIB + "print(fib(90))", memoize=True, **options)
+                returncode, stdout, stderr = run_node(code)
+                self.assertEqual(returncode, 0, stderr)
+                self.assertEqual(stdout, "2880067194370816000\n")
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_keys_and_lru(self):
+        """Числа, строки и списки не смешиваются в ключах, LRU вытесняет старые"""
+        source = '''# pyjs: memoize(2)
+def size(x):
+    return len(x)
+
+# pyjs: memoize
+def pair(a, b):
+    return a + b
+
+print(size("[1, 2]"), size([1, 2]), size("ab"), size([1, 2]), size("[1, 2]"))
+print(pair(1, 2), pair("1", "2"), pair(1, 2))
+'''
+        returncode, stdout, stderr = run_node(transpile(source))
+        self.assertEqual(returncode, 0, stderr)
+        self.assertEqual(stdout, "6 2 2 2 6\n3 12 3\n")
+        # Использованный ключ переносится в конец и вытесняется последним
+        code = transpile(source) + ("\nlet calls = 0;"
+                                    "\nconst f = pyMemoize((x) => { calls++; return x; }, 2);"
+                                    "\nf(1); f(2); f(1); f(3); f(1); f(2);"
+                                    "\nconsole.log(calls);")
+        returncode, stdout, stderr = run_node(code)
+        self.assertEqual(returncode, 0, stderr)
+        self.assertEqual(stdout.splitlines()[-1], "4")
+
+
+if __name__ == '__main__':
+    unittest.main()
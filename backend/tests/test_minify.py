@@ -0,0 +1,176 @@
+import unittest
+import sys
+import os
+import io
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.codegen.minify import compact, short_names, LocalRenamer
+from backend.src.codegen.writer import CodeWriter
+from backend.src.codegen.generator import CodeGenerator
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import Identifier
+from backend.src.parser.walker import walk
+from backend.src.transpiler import Transpiler, ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.tests.helpers import quiet, transpile, run_python, run_node
+
+
+class TestCompact(unittest.TestCase):
+    """Тесты сжатия пробелов в строке кода"""
+
+    def test_operators_and_punctuation(self):
+        self.assertEqual(compact("if (a > 1) {"), "if(a>1){")
+        self.assertEqual(compact("} else if (n == 0) {"), "}else if(n==0){")
+        self.assertEqual(compact("for (let i = 0; i < n; i++) {"), "for(let i=0;i<n;i++){")
+        self.assertEqual(compact("function f(a, b) {"), "function f(a,b){")
+
+    def test_keeps_required_spaces(self):
+        self.assertEqual(compact("return x;"), "return x;")
+        self.assertEqual(compact("let y = a - -b;"), "let y=a- -b;")
+        self.assertEqual(compact("let y = a + +b;"), "let y=a+ +b;")
+        self.assertEqual(compact("let y = a - +b;"), "let y=a-+b;")
+
+    def test_strings_untouched(self):
+        self.assertEqual(compact('console.log("a  b", `x = ${a + b}`);'),
+                         'console.log("a  b",`x = ${a + b}`);')
+        self.assertEqual(compact('let s = "say \\" hi  ";'), 'let s="say \\" hi  ";')
+
+    def test_short_names(self):
+        names = short_names({'a', 'c'})
+        self.assertEqual([next(names) for _ in range(3)], ['b', 'd', 'e'])
+        generated = short_names(set())
+        for _ in range(52):
+            name = next(generated)
+        self.assertEqual(name, 'Z')
+        self.assertEqual(next(generated), 'aa')
+
+
+class TestMinifiedWriter(unittest.TestCase):
+    """Тесты CodeWriter в режиме minify"""
+
+    def test_lines_are_joined(self):
+        stream = io.StringIO()
+        writer = CodeWriter(stream, minify=True)
+        writer.write_line("function f(a) {", 0)
+        writer.write_line("return a;", 1)
+        writer.write_line("}", 0)
+        writer.write_line("", 0)
+        writer.write_line("f(1)", 0)
+        writer.write_line("f(2);", 0)
+        writer.close()
+        # После строки без ';', '{', '}' нужен перевод строки (ASI)
+        self.assertEqual(stream.getvalue(), "function f(a){return a;}f(1)\nf(2);")
+
+
+class TestLocalRenamer(unittest.TestCase):
+    """Тесты коротких имён локальных переменных"""
+
+    SOURCE = '''limit = 10
+
+def scale(value, factor):
+    result = value * factor
+    if result > limit:
+        result = limit
+    return result
+
+def outer(count):
+    base = count + 1
+    def inner(step):
+        return base + step
+    for index in range(count):
+        base = inner(index)
+    return base
+'''
+
+    def _renamed(self, source):
+        with quiet():
+            program = Parser(Lexer(source)).parse()
+            LocalRenamer().analyze(program)
+        names = {}
+        for node in walk(program):
+            if isinstance(node, Identifier):
+                names.setdefault(node.name, set()).add(node.js_name)
+        return names
+
+    def test_consistent_names(self):
+        names = self._renamed(self.SOURCE)
+        # Все вхождения переменной получают одно имя
+        for name in ('value', 'factor', 'result', 'count', 'base', 'step', 'index'):
+            self.assertEqual(len(names[name]), 1, name)
+            self.assertLessEqual(len(next(iter(names[name]))), 2)
+        # Глобальные переменные не меняются
+        self.assertEqual(names['limit'], {None})
+        # Имена в разных функциях используются повторно
+        self.assertEqual(names['value'], names['count'])
+        # Вложенная функция не перекрывает переменные объемлющей
+        outer_names = names['count'] | names['base'] | names['index']
+        self.assertFalse(names['step'] & outer_names)
+
+    def test_protected_names(self):
+        """Имена из f-строк и вызываемые имена не переименовываются"""
+        names = self._renamed('def f(a):\n    label = a\n    print(f"{label}")\n    return a\n')
+        self.assertEqual(names['label'], {None})
+        self.assertEqual(names['a'], {'b'})
+
+    def test_no_clash_with_program_names(self):
+        names = self._renamed('a = 1\ndef f(b, x):\n    return a + b + x\n')
+        short = names['b'] | names['x']
+        self.assertFalse(short & {'a', 'b', 'x', 'f'})
+
+
+class TestMinifiedOutput(unittest.TestCase):
+    """Тесты режима minify генератора"""
+
+    PROGRAMS = [
+        "def add(a, b):\n    return a + b\nprint(add(2, 3))",
+        "def f(n):\n    total = 0\n    for i in range(n):\n        total = total + i - -1\n    return total\nprint(f(10))",
+        "def outer(value):\n    base = value * 2\n    def inner(step):\n        return base + step\n"
+        "    return inner(3) + inner(4)\nprint(outer(5))",
+        "items = [1, 2, 3]\nfor item in items:\n    label = \"value:  \"\n    print(f\"{label}{item}\")",
+        "k = 5\nwhile k > 0:\n    k = k - 1\n    if k == 2:\n        continue\n    elif k == 1:\n        print(k ** 2)\n    else:\n        print(k - -10)",
+        "def main():\n    print(\"hello\")\n\nif __name__ == \"__main__\":\n    main()",
+    ]
+
+    def test_smaller_than_normal(self):
+        for source in self.PROGRAMS:
+            with self.subTest(source=source):
+                normal = transpile(source)
+                minified = transpile(source, minify=True)
+                self.assertLess(len(minified), len(normal))
+                self.assertNotIn("    ", minified.replace('"value:  "', ''))
+                self.assertTrue(minified.startswith('"use strict";'))
+
+    def test_short_local_names(self):
+        code = transpile("def area(width, height):\n    result = width * height\n    return result",
+                         minify=True)
+        self.assertEqual(code, '"use strict";function area(a,b){let c=a*b;return c;}')
+
+    def test_analysis_modes(self):
+        """Ошибки анализа не зависят от минификации"""
+        source = "def f(a):\n    return a + missing"
+        for mode in (ANALYSIS_SEPARATE, ANALYSIS_FUSED):
+            with quiet():
+                normal = Transpiler(analysis=mode).compile(source)
+                minified = Transpiler(analysis=mode, minify=True).compile(source)
+            self.assertEqual([str(e) for e in minified.errors], [str(e) for e in normal.errors])
+            self.assertIn("function f(b){return b+missing;}", minified.code)
+
+    def test_source_map_not_supported(self):
+        with self.assertRaises(ValueError):
+            CodeGenerator(source_map=True, minify=True)
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_same_output_as_python(self):
+        for source in self.PROGRAMS:
+            for optimize in (False, True):
+                with self.subTest(source=source, optimize=optimize):
+                    code = transpile(source, minify=True, optimize=optimize)
+                    returncode, stdout, stderr = run_node(code)
+                    self.assertEqual(returncode, 0, stderr)
+                    self.assertEqual(stdout, run_python(source))
+
+
+if __name__ == '__main__':
+    unittest.main()
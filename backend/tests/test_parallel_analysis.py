@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.semantic.analyzer import SemanticAnalyzer
+from backend.src.semantic.parallel import ParallelSemanticAnalyzer
+
+
+class TestParallelAnalysis(unittest.TestCase):
+
+    SOURCE = '''limit = 10
+
+def first(a):
+    return a + limit + later
+
+later = 1
+
+def second(b):
+    total = b * later
+    if total:
+        missing = unknown + 1
+    return total + "s"
+
+def first(c):
+    return c
+
+def outer(x):
+    def inner(y):
+        return x + y + nope
+    return inner(x)
+
+first = 5
+r = second(first) + absent
+'''
+
+    def _sequential(self, code):
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(Parser(Lexer(code)).parse())
+        return [str(e) for e in analyzer.errors]
+
+    def _parallel(self, code, workers, min_functions=0):
+        analyzer = ParallelSemanticAnalyzer(workers=workers, min_functions=min_functions)
+        ok = analyzer.analyze(Parser(Lexer(code)).parse())
+        self.assertEqual(ok, not analyzer.errors)
+        return [str(e) for e in analyzer.errors]
+
+    def test_matches_sequential_in_process(self):
+        """Тест: тот же список ошибок в том же порядке (без пула)"""
+        expected = self._sequential(self.SOURCE)
+        self.assertTrue(expected)
+        self.assertEqual(self._parallel(self.SOURCE, workers=1), expected)
+
+    def test_matches_sequential_with_process_pool(self):
+        """Тест: тот же результат при анализе в пуле процессов"""
+        code = self.SOURCE + ''.join(
+            f"\ndef f{i}(p):\n    q = p + g{i % 3}\n    return q\n" for i in range(12))
+        self.assertEqual(self._parallel(code, workers=2), self._sequential(code))
+
+    def test_error_lines_are_absolute(self):
+        """Тест: номера строк ошибок из работников -- строки модуля"""
+        errors = self._parallel(self.SOURCE, workers=1)
+        self.assertIn("Line 4", errors[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -453,6 +453,73 @@ class TestParser(unittest.TestCase):
         self.assertIsInstance(ast.statements[1], ExpressionStatement)
 
 
+    def test_nested_function_declaration(self):
+        """Тест парсинга вложенной функции"""
+        code = "def outer(a):\n    def inner(b):\n        return a + b\n    return inner(1)"
+        lexer = Lexer(code)
+        parser = Parser(lexer)
+        ast = parser.parse()
+
+        self.print_test_info("Вложенная функция", ast, "outer -> [inner, return]")
+
+        outer = ast.statements[0]
+        self.assertEqual(len(outer.body.statements), 2)
+        inner = outer.body.statements[0]
+        self.assertIsInstance(inner, FunctionDeclaration)
+        self.assertEqual(inner.name, 'inner')
+        self.assertEqual([p.name for p in inner.parameters], ['b'])
+        self.assertIsInstance(outer.body.statements[1], ReturnStatement)
+
+    def test_float_literal_and_float_call(self):
+        """Тест: дробное число -- литерал, float(...) -- вызов"""
+        code = "x = 2.5\ny = float(x)"
+        lexer = Lexer(code)
+        parser = Parser(lexer)
+        ast = parser.parse()
+
+        self.print_test_info("Дробный литерал", ast, "Literal(2.5), FunctionCall(float)")
+
+        value = ast.statements[0].value
+        self.assertIsInstance(value, Literal)
+        self.assertEqual(value.value, 2.5)
+        self.assertEqual(value.literal_type, DataType.FLOAT)
+        call = ast.statements[1].value
+        self.assertIsInstance(call, FunctionCall)
+        self.assertEqual(call.name.name, 'float')
+
+    def test_power_and_unary_precedence(self):
+        """Тест: ** сильнее унарного минуса слева, показатель может быть унарным"""
+        code = "a = -2 ** 2\nb = 2 ** -1\nc = 2 ** 3 ** 2\nd = -x * y"
+        ast = Parser(Lexer(code)).parse()
+
+        self.print_test_info("Приоритет ** и унарного минуса", ast)
+
+        a = ast.statements[0].value
+        self.assertIsInstance(a, UnaryOperation)
+        self.assertEqual(a.operand.operator, "**")
+        b = ast.statements[1].value
+        self.assertEqual(b.operator, "**")
+        self.assertIsInstance(b.right, UnaryOperation)
+        c = ast.statements[2].value
+        self.assertEqual(c.right.operator, "**")
+        d = ast.statements[3].value
+        self.assertEqual(d.operator, "*")
+        self.assertIsInstance(d.left, UnaryOperation)
+
+    def test_not_precedence(self):
+        """Тест: not слабее сравнений, но сильнее and"""
+        code = "a = not x == y\nb = not x and y"
+        ast = Parser(Lexer(code)).parse()
+
+        self.print_test_info("Приоритет not", ast)
+
+        a = ast.statements[0].value
+        self.assertIsInstance(a, UnaryOperation)
+        self.assertEqual(a.operand.operator, "==")
+        b = ast.statements[1].value
+        self.assertEqual(b.operator, "and")
+        self.assertIsInstance(b.left, UnaryOperation)
+
 if __name__ == '__main__':
     # Запускаем тесты с подробным выводом
     unittest.main(verbosity=2)
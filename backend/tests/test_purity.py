@@ -0,0 +1,128 @@
+import unittest
+import sys
+import os
+import io
+import contextlib
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk
+from backend.src.semantic.purity import PurityAnalyzer, Purity
+from backend.src import cli
+
+
+class TestPurity(unittest.TestCase):
+
+    SOURCE = '''rate = 3
+count = 0
+
+def add(a, b):
+    return a + b
+
+def scaled(v):
+    return v * rate
+
+def bump():
+    count = count + 1
+
+def log(msg):
+    print(msg)
+
+def total(a, b):
+    return add(a, b) + scaled(a)
+
+def noisy(a):
+    log(a)
+    return a
+
+def fib(n):
+    if n < 2:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+def ping(n):
+    if n > 0:
+        pong(n - 1)
+
+def pong(n):
+    print(n)
+    ping(n)
+
+def show(x):
+    return f"{x} -> {noisy(x)}"
+
+def leak(items):
+    external_sort(items)
+
+def outer(k):
+    def inner(j):
+        return j + k
+    return inner(1)
+'''
+
+    def setUp(self):
+        self.ast = Parser(Lexer(self.SOURCE)).parse()
+        self.results = PurityAnalyzer().analyze(self.ast)
+
+    def _function(self, name):
+        return next(n for n in walk(self.ast) if isinstance(n, FunctionDeclaration) and n.name == name)
+
+    def test_classification(self):
+        """Тест классификации функций"""
+        expected = {
+            'add': Purity.PURE,
+            'scaled': Purity.READ_ONLY,
+            'bump': Purity.IMPURE,
+            'log': Purity.IMPURE,
+            'total': Purity.READ_ONLY,
+            'noisy': Purity.IMPURE,
+            'fib': Purity.PURE,
+            'ping': Purity.IMPURE,
+            'pong': Purity.IMPURE,
+            'show': Purity.IMPURE,
+            'leak': Purity.IMPURE,
+            'outer': Purity.READ_ONLY,
+            'inner': Purity.READ_ONLY,
+        }
+        self.assertEqual(self.results, expected)
+
+    def test_annotations_and_reasons(self):
+        """Тест: результат доступен как аннотация узла с причинами"""
+        self.assertEqual(self._function('add').purity, Purity.PURE)
+        self.assertEqual(self._function('add').purity_reasons, [])
+        self.assertIn("assigns outer variable 'count'", self._function('bump').purity_reasons)
+        self.assertIn("reads outer variable 'rate'", self._function('scaled').purity_reasons)
+        self.assertIn("calls impure 'noisy'", self._function('show').purity_reasons)
+        self.assertIn("passes parameter 'items' to unknown 'external_sort'",
+                      self._function('leak').purity_reasons)
+
+    def test_parameter_mutation_propagates(self):
+        """Тест: передача списка функции, которая может его изменить"""
+        ast = Parser(Lexer(self.SOURCE + "def wrap(xs):\n    leak(xs)\n")).parse()
+        PurityAnalyzer().analyze(ast)
+        wrap = next(n for n in walk(ast) if isinstance(n, FunctionDeclaration) and n.name == 'wrap')
+        self.assertEqual(wrap.purity, Purity.IMPURE)
+        self.assertIn("may mutate parameter 'xs'", wrap.purity_reasons)
+
+    def test_dump_analysis_cli(self):
+        """Тест: --dump-analysis печатает отчёт"""
+        with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False, encoding='utf-8') as f:
+            f.write(self.SOURCE)
+        try:
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                cli.main([f.name, '--dump-analysis'])
+        finally:
+            os.unlink(f.name)
+        report = out.getvalue()
+        self.assertIn("== purity ==", report)
+        self.assertIn("add (line 4): pure", report)
+        self.assertIn("bump (line 10): impure -- assigns outer variable 'count'", report)
+
+
+if __name__ == '__main__':
+    unittest.main()
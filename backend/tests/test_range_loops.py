@@ -0,0 +1,171 @@
+import unittest
+import sys
+import os
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.transpiler import Transpiler, ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.tests.helpers import quiet, transpile, run_python, run_node
+
+
+class TestCountedLoopCode(unittest.TestCase):
+    """Тесты генерации счётных циклов для for ... in range(...)"""
+
+    def test_one_argument(self):
+        code = transpile("for i in range(10):\n    print(i)")
+        self.assertIn("for (let i = 0; i < 10; i++) {", code)
+        self.assertNotIn("function range", code)
+
+    def test_start_stop(self):
+        code = transpile("for i in range(2, 10):\n    print(i)")
+        self.assertIn("for (let i = 2; i < 10; i++) {", code)
+
+    def test_positive_step(self):
+        code = transpile("for i in range(0, 10, 3):\n    print(i)")
+        self.assertIn("for (let i = 0; i < 10; i += 3) {", code)
+
+    def test_negative_step(self):
+        """Отрицательный шаг меняет направление сравнения"""
+        code = transpile("for i in range(10, 0, -1):\n    print(i)")
+        self.assertIn("for (let i = 10; i > 0; i--) {", code)
+        code = transpile("for i in range(10, -10, -4):\n    print(i)")
+        self.assertIn("for (let i = 10; i > -10; i -= 4) {", code)
+
+    def test_stop_is_hoisted(self):
+        """Граница-выражение вычисляется один раз, как в range()"""
+        code = transpile("for i in range(n * 2):\n    print(i)")
+        self.assertIn("for (let i = 0, i$stop = n * 2; i < i$stop; i++) {", code)
+
+    def test_identifier_stop(self):
+        code = transpile("for i in range(n):\n    total = i")
+        self.assertIn("for (let i = 0; i < n; i++) {", code)
+        # Тело меняет границу: её нужно сохранить
+        code = transpile("for i in range(n):\n    n = n - 1")
+        self.assertIn("for (let i = 0, i$stop = n; i < i$stop; i++) {", code)
+        # Функция модуля может изменить глобальную переменную
+        code = transpile("def g():\n    return 1\nfor i in range(n):\n    g()")
+        self.assertIn("i$stop = n", code)
+
+    def test_fallbacks(self):
+        """Случаи, которые остаются for...of по массиву range()"""
+        programs = [
+            "for i in range(0, 10, k):\n    print(i)",       # знак шага неизвестен
+            "for i in range(0, 10, 0):\n    print(i)",       # ValueError в Python
+            "for i in range(3):\n    i = i * 2\n    print(i)",  # присваивание переменной цикла
+            "for i in range(1, 2, 3, 4):\n    print(i)",
+        ]
+        for source in programs:
+            with self.subTest(source=source):
+                code = transpile(source)
+                self.assertIn("for (let i of range(", code)
+                self.assertIn("function range", code)
+
+    def test_user_defined_range(self):
+        """Пользовательская функция range не подменяется"""
+        code = transpile("def range(n):\n    return [1]\nfor i in range(5):\n    print(i)")
+        self.assertIn("for (let i of range(5))", code)
+
+    def test_code_size(self):
+        """Без for...of по range() хелпер не генерируется и код короче"""
+        source = "for i in range(10):\n    for j in range(i, 0, -1):\n        print(i * j)"
+        code = transpile(source)
+        self.assertNotIn("range", code)
+        self.assertLess(len(code), 200)
+
+    def test_analysis_modes(self):
+        """Разметка и ошибки анализа не зависят от формы цикла"""
+        source = "for i in range(x, n, 2):\n    print(i)"
+        for mode in (ANALYSIS_SEPARATE, ANALYSIS_FUSED):
+            with quiet():
+                result = Transpiler(analysis=mode).compile(source)
+            self.assertEqual(len(result.errors), 2)
+            self.assertIn("for (let i = x; i < n; i += 2) {", result.code)
+
+
+@unittest.skipUnless(shutil.which('node'), "node is not installed")
+class TestCountedLoopBehavior(unittest.TestCase):
+    """Сгенерированный JS печатает то же, что Python"""
+
+    PROGRAMS = [
+        "for i in range(5):\n    print(i)",
+        "for i in range(3, 8):\n    print(i)",
+        "for i in range(0, 10, 3):\n    print(i)",
+        "for i in range(10, 0, -3):\n    print(i)",
+        "for i in range(5, -6, -1):\n    print(i)",
+        "for i in range(5, 5):\n    print(i)",
+        "for i in range(0, 5, -1):\n    print(i)",
+        "for i in range(-3):\n    print(i)",
+        "n = 4\nfor i in range(n):\n    n = n - 1\n    print(n)",
+        "def f(n):\n    s = 0\n    for i in range(1, n * 2, 2):\n        s = s + i\n    return s\nprint(f(6))",
+        "for i in range(3):\n    i = i + 10\n    print(i)",
+        "total = 0\nfor i in range(10):\n    if i == 7:\n        break\n    if i % 2 == 0:\n        continue\n    total = total + i\nprint(total)",
+        "for i in range(3):\n    for j in range(i, -1, -1):\n        print(i * 10 + j)",
+    ]
+
+    def test_same_output_as_python(self):
+        for source in self.PROGRAMS:
+            with self.subTest(source=source):
+                code = transpile(source)
+                returncode, stdout, stderr = run_node(code)
+                self.assertEqual(returncode, 0, stderr)
+                self.assertEqual(stdout, run_python(source))
+
+
+class TestLazyRange(unittest.TestCase):
+    """Тесты ленивого range, используемого как значение"""
+
+    def test_helpers_emitted(self):
+        code = transpile("r = range(5)\nprint(len(r))\nitems = list(r)")
+        self.assertIn("class PyRange", code)
+        self.assertIn("*[Symbol.iterator]()", code)
+        self.assertIn("function len(value)", code)
+        self.assertIn("function list(value)", code)
+        self.assertNotIn("out.push", code)
+
+    def test_counted_loop_needs_no_helper(self):
+        code = transpile("for i in range(5):\n    print(i)")
+        self.assertNotIn("PyRange", code)
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_same_output_as_python(self):
+        programs = [
+            "r = range(10, 0, -3)\nprint(len(r))\nfor x in r:\n    print(x)",
+            "r = range(2, 9, 3)\nfor x in r:\n    print(x)\nfor x in r:\n    print(x)",
+            "print(len(range(5, 5)))\nprint(len(range(0, 10, 4)))\nprint(len(range(-7)))",
+            "items = list(range(1, 4))\nprint(len(items))\nfor x in items:\n    print(x)",
+            "def total(values):\n    s = 0\n    for v in values:\n        s = s + v\n    return s\nprint(total(range(1, 101)))",
+            "def count(n):\n    return len(range(0, n, 7))\nprint(count(10000000))",
+            "step = -2\nfor i in range(6, 0, step):\n    print(i)",
+        ]
+        for source in programs:
+            with self.subTest(source=source):
+                code = transpile(source)
+                returncode, stdout, stderr = run_node(code)
+                self.assertEqual(returncode, 0, stderr)
+                self.assertEqual(stdout, run_python(source))
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_array_consumers(self):
+        """Ленивый range там, где ожидается список: обход и len() в вызываемой
+        функции, list(), вывод. Других операций над списками в подмножестве нет"""
+        source = ("def total(values):\n    s = 0\n    for v in values:\n        s = s + v\n    return s\n\n"
+                  "def size(values):\n    return len(values)\n\n"
+                  "r = range(2, 11, 3)\nprint(r)\nprint(str(range(4)))\nprint(f\"r = {r}\")\n"
+                  "print(total(r), size(r), total(list(r)), size(list(r)))\n")
+        for options in ({}, {'optimize': True}, {'optimize': True, 'minify': True}, {'typed_arrays': True}):
+            with self.subTest(**options):
+                returncode, stdout, stderr = run_node(transpile(source, **options))
+                self.assertEqual(returncode, 0, stderr)
+                self.assertEqual(stdout, run_python(source))
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_zero_step_raises(self):
+        code = transpile("r = range(0, 5, 0)")
+        returncode, stdout, stderr = run_node(code)
+        self.assertNotEqual(returncode, 0)
+        self.assertIn("must not be zero", stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import sys
+import os
+import io
+import contextlib
+import shutil
+import subprocess
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src import cli
+from backend.src.codegen.runtime import (RUNTIME_HELPERS, RUNTIME_MODULE, RuntimeHelper, register_helper,
+                                         runtime_module_source, write_runtime_module)
+from backend.tests.helpers import quiet, transpile, run_node
+
+
+SOURCE = '''# pyjs: memoize
+def fib(n):
+    if n <= 1:
+        return n
+    return fib(n - 1) + fib(n - 2)
+
+r = range(2, 9, 3)
+print(fib(20), len(r), list(r))
+for i in range(2):
+    print(str(i))
+'''
+
+
+class TestRuntimeImports(unittest.TestCase):
+    """Тесты импорта хелперов из общего модуля"""
+
+    def test_only_used_helpers_imported(self):
+        code = transpile(SOURCE, runtime_module="./pyjs_runtime.js")
+        self.assertIn('import { range, pyMemoize, str, len, list } from "./pyjs_runtime.js";', code)
+        self.assertNotIn("function ", code.split("function fib")[0])
+        code = transpile("print(len([1]))", runtime_module="./rt.js")
+        self.assertIn('import { len } from "./rt.js";', code)
+        self.assertNotIn("import", transpile("print(1)", runtime_module="./rt.js"))
+        # Функция модуля перекрывает встроенную
+        code = transpile("def len(x):\n    return 0\nprint(len([1]))", runtime_module="./rt.js")
+        self.assertNotIn("import", code)
+
+    def test_inline_helpers_by_default(self):
+        code = transpile(SOURCE)
+        self.assertNotIn("import", code)
+        self.assertIn("class PyRange {", code)
+        self.assertIn("function pyMemoize(fn, limit = 0) {", code)
+        self.assertIn("function list(value) {\n    return Array.from(value);\n}", code)
+
+    def test_registered_helper(self):
+        """Новый хелпер подключается без изменений генератора"""
+        register_helper(RuntimeHelper('abs', 'function abs(value) {\n    return Math.abs(value);\n}',
+                                      builtins=('abs',)))
+        try:
+            self.assertIn('import { abs } from "./rt.js";',
+                          transpile("print(abs(-2))", runtime_module="./rt.js"))
+            self.assertIn("function abs(value) {\n    return Math.abs(value);\n}",
+                          transpile("print(abs(-2))"))
+            self.assertIn("export { range, pyMemoize, str, len, list, abs };", runtime_module_source())
+        finally:
+            del RUNTIME_HELPERS['abs']
+
+
+class TestRuntimeModule(unittest.TestCase):
+    """Тесты файла общего модуля"""
+
+    def test_written_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = write_runtime_module(directory)
+            self.assertEqual(os.path.basename(path), RUNTIME_MODULE)
+            os.utime(path, ns=(0, 0))
+            write_runtime_module(directory)
+            self.assertEqual(os.stat(path).st_mtime_ns, 0)  # то же содержимое не перезаписано
+            write_runtime_module(directory, minify=True)
+            self.assertNotEqual(os.stat(path).st_mtime_ns, 0)
+            with open(path, encoding="utf-8") as f:
+                self.assertTrue(f.read().startswith("class PyRange{"))
+
+    def test_cli_requires_output(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                cli.main(["program.py", "--runtime-module"])
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_modules_run(self):
+        """Два файла сборки используют один модуль; вывод как со встроенными хелперами"""
+        returncode, expected, stderr = run_node(transpile(SOURCE))
+        self.assertEqual(returncode, 0, stderr)
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "package.json"), "w", encoding="utf-8") as f:
+                f.write('{"type": "module"}\n')
+            for name, source in (("first", SOURCE), ("second", "print(len(range(5)))\n")):
+                path = os.path.join(directory, name)
+                with open(path + ".py", "w", encoding="utf-8") as f:
+                    f.write(source)
+                with quiet():
+                    self.assertEqual(cli.main([path + ".py", "-o", path + ".js", "--runtime-module"]), 0)
+            self.assertEqual(sorted(os.listdir(directory)),
+                             ["first.js", "first.py", "package.json", RUNTIME_MODULE, "second.js", "second.py"])
+            outputs = [subprocess.run(['node', os.path.join(directory, name + ".js")],
+                                      capture_output=True, text=True, timeout=30)
+                       for name in ("first", "second")]
+        for run in outputs:
+            self.assertEqual(run.returncode, 0, run.stderr)
+        self.assertEqual(outputs[0].stdout, expected)
+        self.assertEqual(outputs[1].stdout, "5\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
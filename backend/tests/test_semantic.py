@@ -324,6 +324,55 @@ for i in items:
         print()
 
 
+
+class TestBindings(unittest.TestCase):
+    """Разметка идентификаторов координатами объявлений"""
+
+    def _analyze(self, code):
+        ast = Parser(Lexer(code)).parse()
+        analyzer = SemanticAnalyzer()
+        analyzer.analyze(ast)
+        return ast
+
+    def test_assignment_definition_and_reassignment(self):
+        """Тест: первое присваивание -- объявление, повторное -- нет"""
+        ast = self._analyze("x = 1\ny = 2\nx = x + y")
+        first, second, third = ast.statements
+        self.assertTrue(first.target.binding.is_definition)
+        self.assertTrue(second.target.binding.is_definition)
+        self.assertFalse(third.target.binding.is_definition)
+        self.assertEqual(first.target.binding.key, third.target.binding.key)
+        self.assertEqual((first.target.binding.scope_id, first.target.binding.slot), (0, 1))
+        self.assertEqual(second.target.binding.slot, 2)  # слот 0 занят встроенной print
+
+        read_x = third.value.left
+        self.assertEqual(read_x.binding.key, first.target.binding.key)
+        self.assertFalse(read_x.binding.is_definition)
+
+    def test_function_scopes_get_distinct_ids(self):
+        """Тест: локальные переменные разных функций -- разные области"""
+        ast = self._analyze("def f(a):\n    x = a\n    return x\ndef g(a):\n    x = a\n    return x")
+        f, g = ast.statements
+        fx = f.body.statements[0].target.binding
+        gx = g.body.statements[0].target.binding
+        self.assertNotEqual(fx.scope_id, gx.scope_id)
+        self.assertNotEqual(fx.scope_id, 0)
+        self.assertEqual(f.parameters[0].binding.slot, 0)
+        self.assertEqual(fx.slot, 1)
+        self.assertEqual(f.body.statements[1].value.binding.key, fx.key)
+
+    def test_global_write_from_function(self):
+        """Тест: присваивание глобальной переменной внутри функции -- не объявление"""
+        ast = self._analyze("count = 0\ndef inc():\n    count = count + 1")
+        target = ast.statements[1].body.statements[0].target
+        self.assertFalse(target.binding.is_definition)
+        self.assertEqual(target.binding.scope_id, 0)
+
+    def test_unresolved_identifier(self):
+        """Тест: необъявленный идентификатор не размечается"""
+        ast = self._analyze("x = y")
+        self.assertIsNone(ast.statements[0].value.binding)
+
 if __name__ == '__main__':
     print("Запуск семантических тестов...")
     print("=" * 50)
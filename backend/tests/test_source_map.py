@@ -0,0 +1,181 @@
+import unittest
+import sys
+import os
+import io
+import json
+import contextlib
+import shutil
+import subprocess
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.codegen.source_map import SourceMapBuilder, encode_vlq, decode_vlq
+from backend.src.transpiler import Transpiler, ANALYSIS_FUSED
+from backend.src import cli
+from backend.tests.helpers import quiet
+
+
+def decode_mappings(mappings):
+    """Абсолютные позиции сегментов: [(строка JS, столбец JS, строка .py, столбец .py)]"""
+    result = []
+    source_line = source_column = 0
+    for generated_line, line in enumerate(mappings.split(';')):
+        generated_column = 0
+        for segment in filter(None, line.split(',')):
+            values = decode_vlq(segment)
+            generated_column += values[0]
+            source_line += values[2]
+            source_column += values[3]
+            result.append((generated_line, generated_column, source_line, source_column))
+    return result
+
+
+class TestVlq(unittest.TestCase):
+    """Тесты кодирования Base64 VLQ"""
+
+    def test_known_values(self):
+        self.assertEqual(encode_vlq(0), "A")
+        self.assertEqual(encode_vlq(1), "C")
+        self.assertEqual(encode_vlq(-1), "D")
+        self.assertEqual(encode_vlq(15), "e")
+        self.assertEqual(encode_vlq(16), "gB")
+        self.assertEqual(encode_vlq(123), "2H")
+
+    def test_round_trip(self):
+        values = [0, 1, -1, 31, -32, 4095, -4096, 4096, 100000, -987654]
+        self.assertEqual(decode_vlq(''.join(encode_vlq(v) for v in values)), values)
+
+    def test_builder(self):
+        builder = SourceMapBuilder(file="out.js", source="in.py")
+        builder.new_line()
+        builder.new_line()
+        builder.add(4, 1, 4)
+        builder.add(10, 1, 11)
+        builder.new_line()
+        builder.add(0, 3, 0)
+        data = builder.to_dict()
+        self.assertEqual(data["version"], 3)
+        self.assertEqual(data["sources"], ["in.py"])
+        self.assertEqual(decode_mappings(data["mappings"]),
+                         [(1, 4, 1, 4), (1, 10, 1, 11), (2, 0, 3, 0)])
+
+
+class TestSourceMapGeneration(unittest.TestCase):
+    """Тесты карты исходников, которую строит CodeGenerator"""
+
+    SOURCE = '''def safe(x):
+    return x + 1
+
+def explode(n):
+    total = safe(n)
+    if total > 2:
+        print(total)
+    return missing_function(total)
+
+def main():
+    print(safe(1))
+    print(explode(2))
+
+if __name__ == "__main__":
+    main()
+'''
+
+    def _compile(self, **options):
+        with quiet():
+            return Transpiler(source_map=True, **options).compile(self.SOURCE)
+
+    def test_code_is_unchanged(self):
+        """Карта не меняет сгенерированный код"""
+        with quiet():
+            plain = Transpiler().transpile(self.SOURCE)
+        result = self._compile()
+        self.assertEqual(result.code, plain)
+        self.assertNotIn('\x00', result.code)
+
+    def test_statement_and_call_mappings(self):
+        result = self._compile()
+        data = json.loads(result.source_map)
+        self.assertEqual(data["sourcesContent"], [self.SOURCE])
+        js_lines = result.code.split('\n')
+        py_lines = self.SOURCE.split('\n')
+        segments = decode_mappings(data["mappings"])
+        self.assertTrue(segments)
+        self.assertLessEqual(len(data["mappings"].split(';')), len(js_lines))
+
+        def mapped(js_text):
+            line = next(i for i, text in enumerate(js_lines) if js_text in text)
+            column = js_lines[line].index(js_text)
+            return [(s[2], s[3]) for s in segments if s[0] == line and s[1] == column]
+
+        # Оператор -- в начало строки Python
+        self.assertEqual(mapped("let total = safe(n);"), [(4, 4)])
+        self.assertEqual(mapped("if (total > 2) {"), [(5, 4)])
+        # Вызов внутри строки -- в позицию вызова
+        self.assertEqual(mapped("safe(n);"), [(4, 12)])
+        self.assertEqual(mapped("missing_function(total)"), [(7, 11)])
+        self.assertEqual(py_lines[7][11:], "missing_function(total)")
+        # Закрывающие скобки и вспомогательные строки не сопоставляются
+        for line, text in enumerate(js_lines):
+            if text.strip().startswith('}') or not text.strip():
+                self.assertFalse([s for s in segments if s[0] == line], text)
+
+    def test_fused_analysis(self):
+        self.assertEqual(self._compile(analysis=ANALYSIS_FUSED).source_map, self._compile().source_map)
+
+    def test_tail_call_arguments(self):
+        """Вызовы в нескольких изменённых аргументах хвостового самовызова"""
+        source = ("def inc(x):\n    print(x)\n    return x + 1\n\n"
+                  "def loop(n, acc):\n    if n <= 0:\n        return acc\n"
+                  "    return loop(inc(n) - 2, inc(acc))\n\nprint(loop(5, 0))\n")
+        with quiet():
+            result = Transpiler(source_map=True, optimize=True).compile(source)
+        self.assertIn("continue tail;", result.code)
+        js_lines = result.code.split('\n')
+        segments = decode_mappings(json.loads(result.source_map)["mappings"])
+        for js_text, position in (("inc(n) - 2", (7, 16)), ("inc(acc)", (7, 28))):
+            line = next(i for i, text in enumerate(js_lines) if js_text in text)
+            self.assertIn("$next", js_lines[line])
+            self.assertIn((line, js_lines[line].index(js_text)) + position, segments)
+
+    def test_transpile_file_writes_map(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "program.py")
+            destination = os.path.join(directory, "program.js")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write(self.SOURCE)
+            with quiet():
+                result = Transpiler(source_map=True).transpile_file(source, destination)
+            with open(destination, encoding="utf-8") as f:
+                code = f.read()
+            self.assertTrue(code.endswith("\n//# sourceMappingURL=program.js.map\n"))
+            with open(destination + ".map", encoding="utf-8") as f:
+                data = json.load(f)
+            self.assertEqual(data["file"], "program.js")
+            self.assertEqual(data["sources"], ["program.py"])
+            self.assertEqual(json.loads(result.source_map), data)
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_node_stack_trace(self):
+        """Трассировка стека node указывает на строки Python"""
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "program.py")
+            destination = os.path.join(directory, "program.js")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write(self.SOURCE)
+            with quiet(), contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(cli.main([source, "-o", destination, "--source-map"]), 0)
+            run = subprocess.run(['node', '--enable-source-maps', destination],
+                                 capture_output=True, text=True, timeout=30)
+        self.assertNotEqual(run.returncode, 0)
+        self.assertIn("program.py:8:", run.stderr)    # return missing_function(total)
+        self.assertIn("program.py:12:11", run.stderr)  # print(explode(2))
+
+    def test_cli_requires_output(self):
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                cli.main(["program.py", "--source-map"])
+
+
+if __name__ == '__main__':
+    unittest.main()
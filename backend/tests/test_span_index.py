@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+
+
+class TestSpanIndex(unittest.TestCase):
+
+    SOURCE = '''def add(a, b):
+    return a + b
+
+x = add(1, 22)
+print("hi", x)
+'''
+
+    def setUp(self):
+        self.program = Parser(Lexer(self.SOURCE)).parse()
+
+    def _text(self, node):
+        start, end = self.program.span_index().span(node)
+        return self.SOURCE[start:end]
+
+    def test_node_at_returns_innermost(self):
+        """Тест: node_at возвращает самый внутренний узел"""
+        offset = self.SOURCE.index('22')
+        node = self.program.node_at(offset)
+        self.assertIsInstance(node, Literal)
+        self.assertEqual(node.value, 22)
+
+        node = self.program.node_at(self.SOURCE.index('a + b') + 2)
+        self.assertIsInstance(node, BinaryOperation)
+        self.assertEqual(self._text(node), 'a + b')
+
+        node = self.program.node_at(self.SOURCE.index('def'))
+        self.assertIsInstance(node, FunctionDeclaration)
+
+    def test_node_at_outside_of_code(self):
+        """Тест: смещения вне узлов"""
+        self.assertIsNone(self.program.node_at(-1))
+        self.assertIsNone(self.program.node_at(len(self.SOURCE) + 10))
+
+    def test_statement_spans(self):
+        """Тест диапазонов операторов"""
+        assignment = self.program.statements[1]
+        self.assertEqual(self._text(assignment), 'x = add(1, 22)')
+        self.assertEqual(self._text(self.program.statements[0]), 'def add(a, b):\n    return a + b')
+
+    def test_nodes_in_range(self):
+        """Тест: узлы, пересекающиеся с диапазоном, в порядке документа"""
+        start = self.SOURCE.index('add(1')
+        nodes = self.program.nodes_in_range(start, start + 5)
+        kinds = [type(n).__name__ for n in nodes]
+        self.assertEqual(kinds, ['Program', 'Assignment', 'FunctionCall', 'Identifier', 'Literal'])
+
+    def test_matches_linear_scan(self):
+        """Тест: индекс совпадает с полным перебором диапазонов"""
+        index = self.program.span_index()
+        spans = [(index.span(n), n) for n in index._nodes]
+        for offset in range(len(self.SOURCE)):
+            covering = [(s, e, n) for (s, e), n in spans if s <= offset < e]
+            expected = covering[-1][2] if covering else None
+            self.assertIs(self.program.node_at(offset), expected, offset)
+
+    def test_incremental_edit_inside_leaf(self):
+        """Тест: правка внутри листа обновляет индекс без перестроения"""
+        index = self.program.span_index()
+        offset = self.SOURCE.index('22') + 1
+        self.assertTrue(self.program.apply_edit(offset, offset, '3'))
+        self.assertIs(self.program.span_index(), index)
+
+        literal = self.program.node_at(offset)
+        self.assertEqual(self.program.source[slice(*index.span(literal))], '232')
+        print_call = self.program.node_at(self.program.source.index('print'))
+        self.assertIsInstance(print_call, Identifier)
+        self.assertEqual(print_call.name, 'print')
+
+    def test_edit_across_boundaries_invalidates(self):
+        """Тест: правка на границе узлов требует повторного разбора"""
+        self.program.span_index()
+        start = self.SOURCE.index('x = ')
+        self.assertFalse(self.program.apply_edit(start, start + 4, 'y = '))
+        self.assertIsNone(self.program._span_index)
+
+
+if __name__ == '__main__':
+    unittest.main()
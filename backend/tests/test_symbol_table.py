@@ -0,0 +1,73 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import Identifier
+from backend.src.parser.walker import walk
+from backend.src.semantic.analyzer import SemanticAnalyzer
+from backend.src.semantic.symbol_table import SymbolTable, FlatSymbolTable, SymbolType, DataType
+
+
+class TestFlatSymbolTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = FlatSymbolTable()
+
+    def test_lookup_through_scopes(self):
+        """Тест поиска во внешних областях и перекрытия имён"""
+        self.table.define('x', SymbolType.VARIABLE, DataType.INT, 1, 1)
+        self.table.enter_scope()
+        self.assertEqual(self.table.lookup('x').data_type, DataType.INT)
+        self.assertIsNone(self.table.lookup_local('x'))
+
+        self.table.define('x', SymbolType.VARIABLE, DataType.STRING, 2, 1)
+        self.assertEqual(self.table.lookup('x').data_type, DataType.STRING)
+        self.assertEqual(self.table.lookup_local('x').data_type, DataType.STRING)
+
+        self.table.exit_scope()
+        self.assertEqual(self.table.lookup('x').data_type, DataType.INT)
+
+    def test_exit_scope_removes_local_names(self):
+        """Тест: выход из области удаляет её имена"""
+        self.table.enter_scope()
+        self.table.define('tmp', SymbolType.VARIABLE, DataType.ANY, 1, 1)
+        self.table.define('tmp', SymbolType.VARIABLE, DataType.INT, 2, 1)
+        self.table.exit_scope()
+        self.assertIsNone(self.table.lookup('tmp'))
+        self.assertEqual(self.table.depth, 0)
+
+    def test_global_scope_is_never_popped(self):
+        """Тест: глобальная область не удаляется"""
+        self.table.define('g', SymbolType.VARIABLE, DataType.INT, 1, 1)
+        self.table.exit_scope()
+        self.assertIsNotNone(self.table.lookup('g'))
+
+    def test_drop_in_for_analyzer(self):
+        """Тест: анализатор выдаёт одинаковые ошибки с обеими таблицами"""
+        codes = [
+            "x = 5\ny = x + 1",
+            "x = y + 5",
+            "def f(a):\n    b = a + 1\n    return b\nz = b",
+            "def outer():\n    x = 10\n    def inner():\n        return x + 5\n    return inner()",
+            "def test(): return 1\ndef test(): return 2",
+            "for i in range(3):\n    t = i\nprint(t)",
+        ]
+        for code in codes:
+            results = []
+            for table_class in (SymbolTable, FlatSymbolTable):
+                analyzer = SemanticAnalyzer(symbol_table_class=table_class)
+                ast = Parser(Lexer(code)).parse()
+                ok = analyzer.analyze(ast)
+                bindings = [(n.name, n.binding.key if n.binding else None,
+                             n.binding.is_definition if n.binding else None)
+                            for n in walk(ast) if isinstance(n, Identifier)]
+                results.append((ok, [str(e) for e in analyzer.errors], bindings))
+            self.assertEqual(results[0], results[1], code)
+
+
+if __name__ == '__main__':
+    unittest.main()
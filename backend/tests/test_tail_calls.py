@@ -0,0 +1,155 @@
+import unittest
+import sys
+import os
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk
+from backend.src.optimizer import TailCallEliminator
+from backend.src.transpiler import ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.tests.helpers import quiet, transpile, run_node
+
+
+def eliminate(source):
+    with quiet():
+        program = Parser(Lexer(source)).parse()
+    eliminator = TailCallEliminator()
+    eliminator.eliminate(program)
+    return program, eliminator
+
+
+def tail_returns(program):
+    return [n for n in walk(program) if isinstance(n, ReturnStatement) and n.tail_call]
+
+
+class TestTailCallDetection(unittest.TestCase):
+    """Тесты поиска хвостовых самовызовов"""
+
+    NESTED = '''def loop(n, acc):
+    if n == 0:
+        return acc
+    else:
+        if n % 2 == 0:
+            return loop(n - 1, acc + n)
+        elif n % 3 == 0:
+            return loop(n - 1, acc)
+        else:
+            for i in range(2):
+                if i == 1:
+                    return loop(n - 1, acc - i)
+                else:
+                    acc = acc + 2
+    return loop(n - 1, acc)
+'''
+
+    def test_nested_if_else_tails(self):
+        program, eliminator = eliminate(self.NESTED)
+        self.assertTrue(program.statements[0].tail_recursive)
+        self.assertEqual(len(tail_returns(program)), 4)
+        self.assertEqual(eliminator.functions, ['loop'])
+        self.assertEqual(eliminator.tail_calls, 4)
+
+    def test_non_tail_recursion_left_alone(self):
+        source = ("def fact(n):\n    if n <= 1:\n        return 1\n    return n * fact(n - 1)\n"
+                  "def count(n):\n    x = count(n - 1)\n    return x\n"
+                  "def both(n):\n    if n < 0:\n        return both(n + 1) + 1\n    return both(n - 1)")
+        program, eliminator = eliminate(source)
+        fact, count, both = program.statements
+        self.assertFalse(fact.tail_recursive)
+        self.assertFalse(count.tail_recursive)
+        # Хвостовой вызов становится переходом, обычный остаётся рекурсией
+        self.assertTrue(both.tail_recursive)
+        self.assertEqual(len(tail_returns(program)), 1)
+        self.assertEqual(eliminator.functions, ['both'])
+
+    def test_unsafe_functions_skipped(self):
+        """Вызов другой функции, другое число аргументов и вложенные функции"""
+        source = ("def a(n):\n    return b(n)\ndef b(n):\n    return a(n)\n"
+                  "def c(n, m):\n    return c(n)\n"
+                  "def d(n):\n    def inner():\n        return n\n    return d(n - 1)")
+        program, eliminator = eliminate(source)
+        self.assertEqual(tail_returns(program), [])
+        self.assertEqual(eliminator.functions, [])
+
+
+class TestTailCallGeneration(unittest.TestCase):
+    """Тесты генерации цикла вместо хвостовой рекурсии"""
+
+    def test_loop_and_parameter_assignment(self):
+        code = transpile("def f(n, acc):\n    if n == 0:\n        return acc\n    return f(n - 1, acc)",
+                         optimize=True)
+        self.assertIn("tail: while (true) {", code)
+        self.assertIn("n = n - 1;\n", code)   # acc = acc не нужно
+        self.assertNotIn("acc = acc", code)
+        self.assertIn("continue tail;", code)
+        self.assertNotIn("return f(", code)
+        # Без optimize рекурсия остаётся
+        self.assertIn("return f(n - 1, acc);", transpile("def f(n, acc):\n    return f(n - 1, acc)"))
+
+    def test_simultaneous_assignment(self):
+        """Сначала вычисляются все аргументы, затем присваиваются параметры"""
+        code = transpile("def fib(n, a, b):\n    if n == 0:\n        return a\n    return fib(n - 1, b, a + b)",
+                         optimize=True)
+        self.assertIn("const n$next = n - 1;\n        const a$next = b;\n        const b$next = a + b;\n"
+                      "        n = n$next;\n        a = a$next;\n        b = b$next;\n", code)
+        self.assertNotIn("[n, a, b]", code)
+        code = transpile("def f(n, acc):\n    if n == 0:\n        return acc\n    return f(n - 1, acc)",
+                         optimize=True)
+        self.assertIn("n = n - 1;\n", code)  # один параметр -- без временной переменной
+        self.assertNotIn("$next", code)
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_fstring_reads_parameter(self):
+        """Аргумент читает предыдущий параметр через подстановку f-строки"""
+        source = ('def build(n, acc):\n    if n == 0:\n        return acc\n'
+                  '    return build(n - 1, acc + f"{n},")\n\nprint(build(3, ""))\n')
+        code = transpile(source, optimize=True)
+        self.assertIn("continue tail;", code)
+        returncode, stdout, stderr = run_node(code)
+        self.assertEqual(returncode, 0, stderr)
+        self.assertEqual(stdout, "3,2,1,\n")
+
+    def test_fall_through_returns(self):
+        """Без return в конце тела функция завершается, а не повторяет цикл"""
+        code = transpile("def f(n):\n    if n > 0:\n        print(n)\n        return f(n - 1)",
+                         optimize=True)
+        self.assertIn("        return;\n    }\n}", code)
+        code = transpile("def f(n):\n    if n > 0:\n        return f(n - 1)\n    else:\n        return 0",
+                         optimize=True)
+        self.assertNotIn("return;", code)
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_deep_recursion_runs(self):
+        """Глубина, на которой рекурсия переполнила бы стек JS"""
+        source = TestTailCallDetection.NESTED + '''
+def fib(n, a, b):
+    if n == 0:
+        return a
+    return fib(n - 1, b, a + b)
+
+def countdown(n):
+    if n > 0:
+        return countdown(n - 1)
+    n = 0
+
+def main():
+    print(loop(200000, 0), fib(70, 0, 1), countdown(300000))
+
+if __name__ == "__main__":
+    main()
+'''
+        for mode in (None, ANALYSIS_SEPARATE, ANALYSIS_FUSED):
+            for minify in (False, True):
+                with self.subTest(mode=mode, minify=minify):
+                    returncode, stdout, stderr = run_node(transpile(source, optimize=True, analysis=mode,
+                                                                               minify=minify))
+                    self.assertEqual(returncode, 0, stderr)
+                    self.assertEqual(stdout, "10000166667 190392490709135 undefined\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
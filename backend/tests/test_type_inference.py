@@ -0,0 +1,149 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk
+from backend.src.semantic.type_inference import TypeInferencer, join_types
+
+
+class TestTypeInference(unittest.TestCase):
+
+    def _infer(self, code):
+        ast = Parser(Lexer(code)).parse()
+        inferencer = TypeInferencer()
+        inferencer.infer(ast)
+        return ast, inferencer
+
+    def _function(self, ast, name):
+        return next(n for n in walk(ast) if isinstance(n, FunctionDeclaration) and n.name == name)
+
+    def test_join(self):
+        """Тест объединения типов"""
+        self.assertEqual(join_types(None, DataType.INT), DataType.INT)
+        self.assertEqual(join_types(DataType.INT, DataType.FLOAT), DataType.FLOAT)
+        self.assertEqual(join_types(DataType.INT, DataType.STRING), DataType.ANY)
+
+    def test_literals_through_assignments(self):
+        """Тест: типы литералов проходят через присваивания"""
+        ast, _ = self._infer('x = 1\ny = x * 2\nz = y / 2\ns = "a" + "b"\nb = x > y')
+        targets = {s.target.name: s.value.inferred_type for s in ast.statements}
+        self.assertEqual(targets, {'x': DataType.INT, 'y': DataType.INT, 'z': DataType.FLOAT,
+                                   's': DataType.STRING, 'b': DataType.BOOLEAN})
+
+    def test_flow_sensitive_reassignment(self):
+        """Тест: тип переменной зависит от точки программы"""
+        ast, _ = self._infer('x = 1\na = x\nx = "s"\nb = x')
+        self.assertEqual(ast.statements[1].value.inferred_type, DataType.INT)
+        self.assertEqual(ast.statements[3].value.inferred_type, DataType.STRING)
+
+    def test_branches_join(self):
+        """Тест: слияние типов после if/else"""
+        ast, _ = self._infer('c = True\nif c:\n    x = 1\nelse:\n    x = 2.5\ny = x')
+        self.assertEqual(ast.statements[-1].value.inferred_type, DataType.FLOAT)
+
+    def test_loop_fixpoint(self):
+        """Тест: состояние цикла доводится до неподвижной точки"""
+        ast, _ = self._infer('x = 1\ni = 0\nwhile i < 3:\n    y = x\n    x = x + 0.5\n    i = i + 1\nz = i')
+        loop = ast.statements[2]
+        self.assertEqual(loop.body.statements[0].value.inferred_type, DataType.FLOAT)
+        self.assertEqual(ast.statements[-1].value.inferred_type, DataType.INT)
+
+    def test_for_range_variable_is_int(self):
+        """Тест: переменная цикла по range() целая"""
+        ast, _ = self._infer('total = 0\nfor i in range(10):\n    total = total + i\nr = total')
+        self.assertEqual(ast.statements[1].variable.inferred_type, DataType.INT)
+        self.assertEqual(ast.statements[-1].value.inferred_type, DataType.INT)
+
+    def test_parameters_from_call_sites(self):
+        """Тест: типы параметров и результата по местам вызова"""
+        code = '''def add(a, b):
+    return a + b
+def half(n):
+    return n / 2
+x = add(1, 2)
+y = add(3, 4)
+z = half(x)
+w = add(1.5, 2)'''
+        ast, _ = self._infer(code)
+        add = self._function(ast, 'add')
+        self.assertEqual([p.inferred_type for p in add.parameters], [DataType.FLOAT, DataType.INT])
+        self.assertEqual(add.inferred_return_type, DataType.FLOAT)
+        self.assertEqual(self._function(ast, 'half').inferred_return_type, DataType.FLOAT)
+
+    def test_recursive_function(self):
+        """Тест: рекурсия сходится к типу базового случая"""
+        code = '''def fact(n):
+    if n <= 1:
+        return 1
+    return n * fact(n - 1)
+r = fact(5)'''
+        ast, _ = self._infer(code)
+        self.assertEqual(self._function(ast, 'fact').inferred_return_type, DataType.INT)
+        self.assertEqual(ast.statements[-1].value.inferred_type, DataType.INT)
+
+    def test_uncalled_function_parameters_are_any(self):
+        """Тест: без мест вызова о параметрах ничего не известно"""
+        ast, _ = self._infer('def f(a):\n    return a + 1')
+        func = self._function(ast, 'f')
+        self.assertEqual(func.parameters[0].inferred_type, DataType.ANY)
+        self.assertEqual(func.inferred_return_type, DataType.ANY)
+
+    def test_function_without_return_is_none(self):
+        """Тест: функция без return возвращает None"""
+        ast, _ = self._infer('def show(v):\n    print(v)\nshow(1)')
+        self.assertEqual(self._function(ast, 'show').inferred_return_type, DataType.NONE)
+
+    def test_shared_global_is_flow_insensitive(self):
+        """Тест: глобальная переменная, изменяемая функцией"""
+        code = '''count = 0
+def bump():
+    count = count + 0.5
+x = count
+bump()'''
+        ast, _ = self._infer(code)
+        self.assertEqual(ast.statements[2].value.inferred_type, DataType.FLOAT)
+
+    def test_list_element_types(self):
+        """Тест: типы элементов списков через присваивания, параметры и результаты"""
+        code = '''def total(xs):
+    s = 0
+    for x in xs:
+        s = s + x
+    return s
+def pair(a):
+    return [a, a]
+ints = [1, 2]
+mixed = [1, 2.5]
+print(total(ints), total([3]), total(mixed))
+names = list("ab")
+nums = list(range(3)) + ints
+p = pair(1)
+q = pair("x")
+print(names, nums, p, q)'''
+        ast, _ = self._infer(code)
+        values = {s.target.name: s.value for s in ast.statements if isinstance(s, Assignment)}
+        self.assertEqual({name: value.inferred_element_type for name, value in values.items()},
+                         {'ints': DataType.INT, 'mixed': DataType.FLOAT, 'names': DataType.STRING,
+                          'nums': DataType.INT, 'p': DataType.ANY, 'q': DataType.ANY})
+        # Параметр получает int и float списки со всех мест вызова
+        xs = self._function(ast, 'total').parameters[0]
+        self.assertEqual((xs.inferred_type, xs.inferred_element_type), (DataType.LIST, DataType.FLOAT))
+        self.assertIsNone(ast.statements[0].body.statements[0].value.inferred_element_type)  # s = 0
+
+    def test_every_expression_annotated(self):
+        """Тест: у каждого выражения есть выведенный тип"""
+        ast, _ = self._infer('def f(a):\n    return [a, 1]\nprint(f(2), -f(3), not True)')
+        expressions = [n for n in walk(ast)
+                       if isinstance(n, (Identifier, Literal, BinaryOperation, UnaryOperation, FunctionCall))]
+        self.assertTrue(expressions)
+        for node in expressions:
+            self.assertIsInstance(node.inferred_type, DataType)
+
+
+if __name__ == '__main__':
+    unittest.main()
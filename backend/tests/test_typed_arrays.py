@@ -0,0 +1,197 @@
+import unittest
+import sys
+import os
+import shutil
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk
+from backend.src.optimizer import TypedArrayMarker
+from backend.src.optimizer.typed_arrays import typed_array_kind
+from backend.src.transpiler import Transpiler, ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.tests.helpers import quiet, transpile, run_node, run_cli
+
+
+def mark(source):
+    with quiet():
+        program = Parser(Lexer(source)).parse()
+        marker = TypedArrayMarker()
+        marker.mark(program)
+    return program, marker
+
+
+def kinds(program):
+    return [n.typed_array for n in walk(program) if isinstance(n, Literal) and isinstance(n.value, list)]
+
+
+def kind(source):
+    with quiet():
+        return typed_array_kind(Parser(Lexer(source)).parse().statements[0].value)
+
+
+KERNELS = '''def total(values):
+    s = 0
+    for v in values:
+        s = s + v
+    return s
+
+def mean(xs):
+    return total(xs) / len(xs)
+
+def show(xs):
+    print(xs)
+
+'''
+
+
+class TestTypedArrayKind(unittest.TestCase):
+    """Тесты выбора конструктора по элементам"""
+
+    def test_kinds(self):
+        self.assertEqual(kind("a = [1, 2, -3]"), 'Int32Array')
+        self.assertEqual(kind("a = [1.5, 2, -3.0]"), 'Float64Array')
+        self.assertEqual(kind("a = [1, 2147483648]"), 'Float64Array')  # не влезает в int32
+        self.assertEqual(kind("a = [-2147483648]"), 'Int32Array')
+        for source in ("a = []", "a = [1, True]", "a = [1, \"2\"]", "a = [1, x]", "a = [[1], [2]]",
+                       "a = [1, 2 ** 60]"):
+            with self.subTest(source=source):
+                self.assertIsNone(kind(source))
+
+
+class TestTypedArraySelection(unittest.TestCase):
+    """Тесты анализа использования списков"""
+
+    def test_read_only_lists(self):
+        source = KERNELS + '''weights = [1.5, 2.5]
+counts = [1, 2, 3]
+print(mean(weights), total(counts), len(counts))
+for k in [10, 20]:
+    print(k)
+print(total([4, 5]))
+'''
+        program, marker = mark(source)
+        # weights, counts и [4, 5] попадают в один параметр total: один конструктор
+        self.assertEqual(kinds(program), ['Float64Array', 'Float64Array', 'Int32Array', 'Float64Array'])
+        self.assertEqual(marker.typed, 4)
+        self.assertEqual(marker.fallbacks, {})
+
+    def test_mixed_call_sites(self):
+        """Параметр получает и обычный список -- обычные массивы во всех местах вызова"""
+        source = KERNELS + '''counts = [1, 2]
+joined = [1] + [2]
+print(total(counts), total([3, 4]), total(joined), total(list(range(3))))
+only = [5, 6]
+print(len(only))
+'''
+        program, marker = mark(source)
+        self.assertEqual(kinds(program), [None, None, None, None, 'Int32Array'])
+        self.assertEqual(marker.fallbacks, {'counts': "passed to 'total'"})
+
+    def test_fallbacks(self):
+        source = KERNELS + '''shown = [1, 2]
+show(shown)
+mixed = [1, 2]
+mixed = "ab"
+alias = [1.5]
+other = alias
+joined = [1] + [2]
+printed = [3.5]
+print(printed, len(mixed), total(other), joined)
+print(f"{len([7])}")
+'''
+        program, marker = mark(source)
+        self.assertEqual(kinds(program), [None] * 6)
+        self.assertEqual(marker.fallbacks, {
+            'shown': "passed to 'show'",
+            'mixed': "assigned a value that is not a numeric list",
+            'alias': "assigned to 'other'",
+            'printed': "passed to 'print'",
+        })
+
+    def test_parameter_fixpoint(self):
+        """Параметр безопасен, только если безопасны все места, куда он передаётся"""
+        source = '''def a(xs, n):
+    return b(xs, n)
+
+def b(ys, n):
+    s = 0
+    for y in ys:
+        s = s + y
+    return s + n
+
+def c(zs):
+    return a(zs, 1) + d(zs)
+
+def d(ws):
+    ws = "x"
+    return len(ws)
+
+def e(vs):
+    vs = [0]
+    return len(vs)
+
+print(a([1, 2], 0), c([3, 4]), e([5]))
+'''
+        program, marker = mark(source)
+        # Присваивание параметру числового списка ничего не портит, а zs уходит
+        # и в a, и в d: xs получает обычный список, поэтому и [1, 2] обычный
+        self.assertEqual(kinds(program), ['Int32Array', None, None, 'Int32Array'])
+        self.assertEqual(marker.typed, 2)
+
+
+class TestTypedArrayGeneration(unittest.TestCase):
+    """Тесты генерации типизированных массивов"""
+
+    SOURCE = KERNELS + '''def main():
+    weights = [1.5, 2.5, 3.0, 4]
+    counts = [1, 2, 3, 4]
+    big = [1, 2, 3000000000]
+    shown = [1, 2]
+    print(mean(weights), total(counts), total(big), len(counts))
+    show(shown)
+    for k in [10, 20]:
+        print(k)
+
+if __name__ == "__main__":
+    main()
+'''
+
+    def test_generated_code(self):
+        code = transpile(self.SOURCE, typed_arrays=True)
+        self.assertIn("let weights = new Float64Array([1.5, 2.5, 3.0, 4]);", code)
+        self.assertIn("let counts = new Float64Array([1, 2, 3, 4]);", code)  # тоже в total
+        self.assertIn("let big = new Float64Array([1, 2, 3000000000]);", code)
+        self.assertIn("let shown = [1, 2];", code)
+        self.assertIn("for (let k of new Int32Array([10, 20])) {", code)
+        self.assertNotIn("Array(", transpile(self.SOURCE))
+
+    def test_counts_reported(self):
+        transpiler = Transpiler(typed_arrays=True)
+        with quiet():
+            transpiler.transpile(self.SOURCE)
+        self.assertEqual(transpiler.typed_array_literals, 4)
+        self.assertEqual(transpiler.plain_arrays, {'shown': "passed to 'show'"})
+        report = run_cli(self.SOURCE, "--typed-arrays", "--dump-analysis")
+        self.assertIn("== optimizations ==\ntyped arrays: 4\nplain array 'shown': passed to 'show'\n",
+                      report)
+
+    @unittest.skipUnless(shutil.which('node'), "node is not installed")
+    def test_same_output(self):
+        outputs = []
+        for options in ({}, {'typed_arrays': True}, {'typed_arrays': True, 'optimize': True},
+                        {'typed_arrays': True, 'analysis': ANALYSIS_FUSED},
+                        {'typed_arrays': True, 'optimize': True, 'minify': True,
+                         'analysis': ANALYSIS_SEPARATE}):
+            returncode, stdout, stderr = run_node(transpile(self.SOURCE, **options))
+            self.assertEqual(returncode, 0, stderr)
+            outputs.append(stdout)
+        self.assertEqual(outputs[0], "2.75 10 3000000003 4\n[ 1, 2 ]\n10\n20\n")
+        for output in outputs[1:]:
+            self.assertEqual(output, outputs[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
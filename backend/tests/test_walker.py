@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.parser.ast_nodes import *
+from backend.src.parser.walker import walk, iter_child_nodes, PRE_ORDER, POST_ORDER
+from backend.src.codegen.generator import CodeGenerator
+
+
+class TestWalker(unittest.TestCase):
+
+    def _parse(self, code):
+        return Parser(Lexer(code)).parse()
+
+    def _deep_chain(self, depth):
+        """Строит левоглубокую цепочку a + a + ... + range(1)"""
+        node = FunctionCall(Identifier('range', 1, 1), [Literal(1, DataType.INT, 1, 1)], 1, 1)
+        for _ in range(depth):
+            node = BinaryOperation(node, '+', Identifier('a', 1, 1), 1, 1)
+        return Program([ExpressionStatement(node, 1, 1)], 1, 1)
+
+    def test_children_follow_field_metadata(self):
+        """Тест порядка потомков по метаданным узла"""
+        node = IfStatement(Identifier('c', 1, 1), Block([], 1, 1), Block([], 1, 1), 1, 1)
+        children = list(iter_child_nodes(node))
+        self.assertEqual(children, [node.condition, node.then_branch, node.else_branch])
+
+    def test_nested_list_literal_children(self):
+        """Тест: узлы внутри вложенных литералов списков тоже являются потомками"""
+        ast = self._parse("m = [[a, 1], [2, b]]")
+        names = [n.name for n in walk(ast) if isinstance(n, Identifier)]
+        self.assertEqual(names, ['m', 'a', 'b'])
+
+    def test_pre_and_post_order(self):
+        """Тест порядка обхода pre/post"""
+        ast = self._parse("x = a + b")
+        pre = [type(n).__name__ for n in walk(ast, PRE_ORDER)]
+        post = [type(n).__name__ for n in walk(ast, POST_ORDER)]
+        self.assertEqual(pre, ['Program', 'Assignment', 'Identifier', 'BinaryOperation',
+                               'Identifier', 'Identifier'])
+        self.assertEqual(post, ['Identifier', 'Identifier', 'Identifier', 'BinaryOperation',
+                                'Assignment', 'Program'])
+
+    def test_pruning(self):
+        """Тест отсечения поддеревьев"""
+        ast = self._parse("def f(a):\n    return a\nx = 1")
+        for order in (PRE_ORDER, POST_ORDER):
+            seen = list(walk(ast, order, prune=lambda n: isinstance(n, FunctionDeclaration)))
+            self.assertTrue(any(isinstance(n, FunctionDeclaration) for n in seen))
+            self.assertFalse(any(isinstance(n, ReturnStatement) for n in seen))
+
+    def test_deep_tree_beyond_recursion_limit(self):
+        """Тест: глубина дерева больше лимита рекурсии Python"""
+        depth = sys.getrecursionlimit() * 5
+        ast = self._deep_chain(depth)
+        self.assertEqual(sum(1 for _ in walk(ast)), depth * 2 + 5)
+        self.assertEqual(sum(1 for _ in walk(ast, POST_ORDER)), depth * 2 + 5)
+
+        helpers = CodeGenerator()._scan_runtime_needs(ast)
+        self.assertIn('range', helpers)
+        self.assertNotIn('str', helpers)
+
+
+if __name__ == '__main__':
+    unittest.main()
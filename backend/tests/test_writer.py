@@ -0,0 +1,135 @@
+import unittest
+import sys
+import os
+import io
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+from backend.src.codegen.generator import CodeGenerator
+from backend.src.codegen.writer import CodeWriter
+from backend.src.transpiler import Transpiler, ANALYSIS_SEPARATE, ANALYSIS_FUSED
+from backend.tests.helpers import quiet
+
+
+class CountingStream(io.StringIO):
+    """Текстовый поток, считающий вызовы write"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestCodeWriter(unittest.TestCase):
+    """Тесты буферизованного вывода кода"""
+
+    def test_lines_and_indents(self):
+        stream = io.StringIO()
+        writer = CodeWriter(stream)
+        writer.write_line("a", 0)
+        writer.write_line("b", 2)
+        writer.write_line("", 1)
+        writer.close()
+        self.assertEqual(stream.getvalue(), "a\n        b\n    ")
+        self.assertEqual(writer.line_count, 3)
+        self.assertIs(writer.prefix(2), writer.prefix(2))
+
+    def test_periodic_flush(self):
+        """Буфер сбрасывается порциями, а не одной строкой в конце"""
+        stream = CountingStream()
+        writer = CodeWriter(stream, chunk_size=100)
+        for i in range(100):
+            writer.write_line(f"line {i};", 1)
+            self.assertLess(writer._buffered, 100)
+        writer.close()
+        self.assertGreater(stream.writes, 5)
+        self.assertEqual(stream.getvalue(), "\n".join(f"    line {i};" for i in range(100)))
+
+    def test_binary_stream(self):
+        stream = io.BytesIO()
+        writer = CodeWriter(stream)
+        writer.write_line('console.log("привет");')
+        writer.close()
+        self.assertTrue(writer.binary)
+        self.assertEqual(stream.getvalue().decode('utf-8'), 'console.log("привет");')
+
+
+class TestStreamingGeneration(unittest.TestCase):
+    """Тесты generate_to и Transpiler.transpile_file"""
+
+    SOURCE = '''def classify(n):
+    if n < 0:
+        return "negative"
+    elif n == 0:
+        return "zero"
+    elif n < 10:
+        return "small"
+    else:
+        return "large"
+
+def main():
+    for i in range(3):
+        print(classify(i - 1))
+
+if __name__ == "__main__":
+    main()
+'''
+
+    def _ast(self, source):
+        with quiet():
+            return Parser(Lexer(source)).parse()
+
+    def test_generate_to_matches_generate(self):
+        with quiet():
+            expected = CodeGenerator().generate(self._ast(self.SOURCE))
+            stream = io.StringIO()
+            CodeGenerator().generate_to(self._ast(self.SOURCE), stream)
+        self.assertEqual(stream.getvalue(), expected)
+
+    def test_elif_chain(self):
+        """Цепочка elif разбирается и генерируется как else if"""
+        with quiet():
+            code = Transpiler().transpile(self.SOURCE)
+        self.assertIn("} else if (n == 0) {", code)
+        self.assertIn("} else if (n < 10) {", code)
+        self.assertIn("} else {", code)
+
+    def test_elif_fused_analysis(self):
+        """Условия elif анализируются так же, как отдельным проходом"""
+        source = "x = 1\nif x > 1:\n    y = 1\nelif missing:\n    y = 2"
+        with quiet():
+            fused = Transpiler(analysis=ANALYSIS_FUSED).compile(source)
+            separate = Transpiler(analysis=ANALYSIS_SEPARATE).compile(source)
+        self.assertEqual([str(e) for e in fused.errors], [str(e) for e in separate.errors])
+        self.assertIn("Undefined variable: 'missing'", str(fused.errors[0]))
+
+    def test_transpile_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, "program.py")
+            destination = os.path.join(directory, "program.js")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write(self.SOURCE)
+            with quiet():
+                result = Transpiler().transpile_file(source, destination)
+                expected = Transpiler().transpile(self.SOURCE)
+            self.assertTrue(result.ok)
+            self.assertIsNone(result.code)
+            with open(destination, encoding="utf-8") as f:
+                self.assertEqual(f.read(), expected + "\n")
+
+    def test_transpile_file_binary_stream(self):
+        output = io.BytesIO()
+        with quiet():
+            Transpiler().transpile_file(io.StringIO(self.SOURCE), output)
+            expected = Transpiler().transpile(self.SOURCE)
+        self.assertEqual(output.getvalue().decode("utf-8"), expected + "\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+"""Отдельный проход анализатора + генерация против анализа во время генерации"""
+import contextlib
+import io
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.codegen.generator import CodeGenerator
+from backend.src.semantic.analyzer import SemanticAnalyzer
+from benchmarks.corpus import many_functions, parse_quietly
+
+
+def codegen_only(ast):
+    CodeGenerator().generate(ast)
+
+
+def separate(ast):
+    SemanticAnalyzer().analyze(ast)
+    CodeGenerator().generate(ast)
+
+
+def fused(ast):
+    CodeGenerator(fused_analysis=True).generate(ast)
+
+
+def main():
+    print("Semantic analysis: separate pass vs fused into code generation")
+    print(f"{'functions':>10} {'codegen only':>14} {'separate':>12} {'fused':>12} {'saved':>8}")
+    for count in (50, 200, 800):
+        ast = parse_quietly(many_functions(count))
+        with contextlib.redirect_stdout(io.StringIO()):
+            times = [min(timeit.repeat(lambda: run(ast), number=5, repeat=5)) / 5
+                     for run in (codegen_only, separate, fused)]
+        base, two_pass, one_pass = times
+        print(f"{count:>10} {base * 1000:>12.2f}ms {two_pass * 1000:>10.2f}ms "
+              f"{one_pass * 1000:>10.2f}ms {(1 - one_pass / two_pass) * 100:>7.1f}%")
+
+
+if __name__ == '__main__':
+    main()
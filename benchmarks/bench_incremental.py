@@ -0,0 +1,48 @@
+"""Задержка после правки: полный семантический анализ против AnalysisState.update"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.semantic.analyzer import SemanticAnalyzer
+from backend.src.semantic.incremental import AnalysisState
+from benchmarks.corpus import many_functions, parse_quietly
+
+
+def main():
+    print("Edit latency: one function body changed per edit (analysis only, parse excluded)")
+    print(f"{'functions':>10} {'parse':>10} {'full':>10} {'incremental':>12} {'rechecked':>10}")
+    for count in (200, 1000, 4000):
+        source = many_functions(count)
+        state = AnalysisState()
+        state.analyze(parse_quietly(source))
+
+        edits = 10
+        parse_time = full_time = incremental_time = 0.0
+        rechecked = 0
+        for edit in range(edits):
+            # Меняем константу в теле одной из функций
+            target = f"    return total + {edit * (count // edits)}\n"
+            source = source.replace(target, target.replace("return total", "return total - 1"), 1)
+
+            started = time.perf_counter()
+            program = parse_quietly(source)
+            parse_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            SemanticAnalyzer().analyze(program)
+            full_time += time.perf_counter() - started
+
+            program = parse_quietly(source)
+            started = time.perf_counter()
+            state.update(program)
+            incremental_time += time.perf_counter() - started
+            rechecked += len(state.reanalyzed)
+
+        print(f"{count:>10} {parse_time / edits * 1000:>8.1f}ms {full_time / edits * 1000:>8.2f}ms "
+              f"{incremental_time / edits * 1000:>10.2f}ms {rechecked / edits:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Размер минифицированного кода по сравнению с обычным выводом"""
+import contextlib
+import glob
+import gzip
+import io
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.transpiler import Transpiler
+from benchmarks.corpus import many_functions, nested_functions
+
+EXAMPLES = os.path.join(os.path.dirname(__file__), '..', 'examples')
+
+
+def programs():
+    for path in sorted(glob.glob(os.path.join(EXAMPLES, '*', '*.py'))):
+        with open(path, encoding='utf-8') as source:
+            yield os.path.relpath(path, EXAMPLES), source.read()
+    for count in (50, 200):
+        yield f"many_functions({count})", many_functions(count)
+    yield "nested_functions(30)", nested_functions(30)
+
+
+def sizes(code: str):
+    data = code.encode('utf-8')
+    return len(data), len(gzip.compress(data, mtime=0))
+
+
+def main():
+    print("Output size, normal vs --minify (bytes; gzip in parentheses)")
+    print(f"{'program':<26} {'normal':>16} {'minified':>16} {'saved':>7} {'saved gz':>9}")
+    totals = [0, 0, 0, 0]
+    for name, source in programs():
+        with contextlib.redirect_stdout(io.StringIO()):
+            normal = sizes(Transpiler().transpile(source))
+            minified = sizes(Transpiler(minify=True).transpile(source))
+        for i, value in enumerate(normal + minified):
+            totals[i] += value
+        print(f"{name:<26} {normal[0]:>7} ({normal[1]:>6}) {minified[0]:>7} ({minified[1]:>6}) "
+              f"{(1 - minified[0] / normal[0]) * 100:>6.1f}% {(1 - minified[1] / normal[1]) * 100:>8.1f}%")
+    print(f"{'total':<26} {totals[0]:>7} ({totals[1]:>6}) {totals[2]:>7} ({totals[3]:>6}) "
+          f"{(1 - totals[2] / totals[0]) * 100:>6.1f}% {(1 - totals[3] / totals[1]) * 100:>8.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""Последовательный SemanticAnalyzer против двухфазного параллельного анализа"""
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.semantic.analyzer import SemanticAnalyzer
+from backend.src.semantic.parallel import ParallelSemanticAnalyzer
+from benchmarks.corpus import many_functions, parse_quietly
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, cpus})
+    print(f"Semantic analysis of a module with many functions ({cpus} CPUs)")
+    header = ''.join(f"{f'{w} workers':>12}" for w in worker_counts)
+    print(f"{'functions':>10} {'sequential':>12}{header}")
+    for count in (500, 2000, 5000):
+        ast = parse_quietly(many_functions(count))
+        sequential = min(timeit.repeat(lambda: SemanticAnalyzer().analyze(ast), number=1, repeat=3))
+        row = f"{count:>10} {sequential * 1000:>10.1f}ms"
+        for workers in worker_counts:
+            analyzer = ParallelSemanticAnalyzer(workers=workers, min_functions=0)
+            elapsed = min(timeit.repeat(lambda: analyzer.analyze(ast), number=1, repeat=3))
+            row += f"{elapsed * 1000:>10.1f}ms"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
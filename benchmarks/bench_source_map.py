@@ -0,0 +1,43 @@
+"""Накладные расходы построения Source Map v3 во время генерации"""
+import contextlib
+import io
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.codegen.generator import CodeGenerator
+from benchmarks.corpus import many_functions, parse_quietly
+
+
+def without_map(ast):
+    CodeGenerator().generate(ast)
+
+
+def with_map(ast):
+    generator = CodeGenerator(source_map=True)
+    generator.generate(ast)
+    generator.source_map.to_json()
+
+
+def main():
+    print("Code generation with and without a source map")
+    print(f"{'functions':>10} {'plain':>12} {'source map':>12} {'overhead':>9} {'segments':>9}")
+    for count in (50, 200, 800):
+        ast = parse_quietly(many_functions(count))
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Замеры чередуются, чтобы фоновая нагрузка влияла на оба варианта
+            samples = {without_map: [], with_map: []}
+            for _ in range(15):
+                for run in samples:
+                    samples[run].append(timeit.timeit(lambda: run(ast), number=3) / 3)
+            plain, mapped = min(samples[without_map]), min(samples[with_map])
+            generator = CodeGenerator(source_map=True)
+            generator.generate(ast)
+        print(f"{count:>10} {plain * 1000:>10.2f}ms {mapped * 1000:>10.2f}ms "
+              f"{(mapped / plain - 1) * 100:>8.1f}% {generator.source_map.segment_count:>9}")
+
+
+if __name__ == '__main__':
+    main()
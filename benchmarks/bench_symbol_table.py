@@ -0,0 +1,50 @@
+"""Сравнение SymbolTable (цепочка Scope) и FlatSymbolTable (name -> стек)"""
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.semantic.analyzer import SemanticAnalyzer
+from backend.src.semantic.symbol_table import SymbolTable, FlatSymbolTable, SymbolType, DataType
+from benchmarks.corpus import nested_functions, parse_quietly
+
+
+def lookup_storm(table_class, depth: int, lookups: int):
+    """depth вложенных областей, затем поиск глобального имени из самой внутренней"""
+    table = table_class()
+    table.define('g', SymbolType.VARIABLE, DataType.INT, 0, 0)
+    for level in range(depth):
+        table.enter_scope()
+        table.define(f'v{level}', SymbolType.VARIABLE, DataType.INT, 0, 0)
+    for _ in range(lookups):
+        table.lookup('g')
+    for _ in range(depth):
+        table.exit_scope()
+
+
+def main():
+    print("Symbol table: lookup of a global from the innermost scope")
+    print(f"{'depth':>6} {'SymbolTable':>14} {'FlatSymbolTable':>16} {'speedup':>8}")
+    for depth in (1, 10, 50, 200):
+        chain = min(timeit.repeat(lambda: lookup_storm(SymbolTable, depth, 10000), number=1, repeat=5))
+        flat = min(timeit.repeat(lambda: lookup_storm(FlatSymbolTable, depth, 10000), number=1, repeat=5))
+        print(f"{depth:>6} {chain * 1000:>12.2f}ms {flat * 1000:>14.2f}ms {chain / flat:>7.1f}x")
+
+    print()
+    print("SemanticAnalyzer on deeply nested functions")
+    print(f"{'depth':>6} {'SymbolTable':>14} {'FlatSymbolTable':>16} {'speedup':>8}")
+    for depth in (10, 40, 80):
+        ast = parse_quietly(nested_functions(depth))
+
+        def run(table_class):
+            analyzer = SemanticAnalyzer(symbol_table_class=table_class)
+            assert analyzer.analyze(ast), analyzer.errors
+
+        chain = min(timeit.repeat(lambda: run(SymbolTable), number=20, repeat=5)) / 20
+        flat = min(timeit.repeat(lambda: run(FlatSymbolTable), number=20, repeat=5)) / 20
+        print(f"{depth:>6} {chain * 1000:>12.3f}ms {flat * 1000:>14.3f}ms {chain / flat:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
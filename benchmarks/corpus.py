@@ -0,0 +1,57 @@
+"""Синтетические программы для бенчмарков транслятора"""
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from backend.src.lexer.lexer import Lexer
+from backend.src.parser.parser import Parser
+
+
+def nested_functions(depth: int) -> str:
+    """Функции, вложенные друг в друга на depth уровней.
+
+    На каждом уровне читаются глобальная переменная и переменные внешних
+    функций, поэтому разрешение имён проходит всю цепочку областей.
+    """
+    lines = ["g0 = 1"]
+    for level in range(1, depth + 1):
+        pad = "    " * (level - 1)
+        lines.append(f"{pad}def f{level}(a{level}):")
+        outer = f" + v{level - 1}" if level > 1 else ""
+        lines.append(f"{pad}    v{level} = a{level} + g0{outer}")
+    for level in range(depth, 0, -1):
+        pad = "    " * level
+        if level == depth:
+            lines.append(f"{pad}return v{level} + g0")
+        else:
+            lines.append(f"{pad}return f{level + 1}(v{level})")
+    lines.append("x = f1(g0)")
+    return "\n".join(lines) + "\n"
+
+
+def many_functions(count: int) -> str:
+    """Модуль из count независимых функций верхнего уровня"""
+    lines = ["scale = 3", ""]
+    for i in range(count):
+        lines.append(f"def work{i}(a, b):")
+        lines.append(f"    total = a * scale + b")
+        lines.append(f"    while total > {i % 7 + 1}:")
+        lines.append(f"        total = total - 1")
+        lines.append(f"    return total + {i}")
+        lines.append("")
+    lines.append("def main():")
+    for i in range(0, count, max(1, count // 10)):
+        lines.append(f"    print(work{i}({i}, 2))")
+    lines.append("")
+    lines.append('if __name__ == "__main__":')
+    lines.append("    main()")
+    return "\n".join(lines) + "\n"
+
+
+def parse_quietly(source: str):
+    """Разбирает программу, подавляя отладочный вывод парсера"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return Parser(Lexer(source)).parse()
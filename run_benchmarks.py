@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+import importlib
+import os
+import sys
+
+
+def run_all_benchmarks():
+    """Запускает все бенчмарки из папки benchmarks (файлы bench_*.py)"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    bench_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks')
+    names = sorted(f[:-3] for f in os.listdir(bench_dir)
+                   if f.startswith('bench_') and f.endswith('.py'))
+
+    only = sys.argv[1:]
+    for name in names:
+        if only and not any(o in name for o in only):
+            continue
+        print("=" * 60)
+        print(name)
+        print("=" * 60)
+        module = importlib.import_module(f'benchmarks.{name}')
+        module.main()
+        print()
+
+
+if __name__ == '__main__':
+    run_all_benchmarks()